@@ -0,0 +1,188 @@
+"""
+Change-stream ingestion probe against a local single-node replica set.
+
+Runs app.services.change_ingestion.ChangeStreamIngestor against a scratch database,
+writes a probe fixture and prediction, and measures write-to-event latency on
+fixture_changes:{id} / prediction_changes:{id} and on the cache_invalidation channel,
+and checks that a prediction delete is relayed from its pre-image (MongoDB 6.0+).
+It then stops the ingestor, writes while it is down, restarts it and checks that every
+missed write is replayed from the stored resume token.
+
+    mongod --replSet rs0 --port 27017 --dbpath /tmp/rs0 &
+    mongosh --eval 'rs.initiate()'
+    python -m benchmarks.change_stream_probe --mongo-url "mongodb://localhost:27017/?replicaSet=rs0"
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Any, Dict, List
+
+from benchmarks.load_harness import summarize_latencies
+
+# Fixture ID used by the probe (far from real and seeded IDs)
+PROBE_FIXTURE_ID = 99_000_001
+
+
+class _Listener:
+    """Collects pub/sub messages per channel with their receive time."""
+
+    def __init__(self) -> None:
+        self.received: Dict[str, List[Any]] = {}
+
+    async def run(self, pubsub: Any) -> None:
+        async for message in pubsub.listen():
+            if message["type"] != "message":
+                continue
+            channel = message["channel"]
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            self.received.setdefault(channel, []).append((time.time(), json.loads(message["data"])))
+
+    def count(self, channel: str) -> int:
+        return len(self.received.get(channel, []))
+
+
+def install_clients(mongo_client: Any, redis_client: Any, database: str) -> Any:
+    """Point the ingestion and invalidation modules at the probe clients."""
+    from app.services import change_ingestion
+
+    for module_name, module in list(sys.modules.items()):
+        if not module_name.startswith("app.") or module is None:
+            continue
+        if hasattr(module, "get_database"):
+            setattr(module, "get_database", lambda: mongo_client[database])
+        if hasattr(module, "get_redis_pubsub"):
+            setattr(module, "get_redis_pubsub", lambda: redis_client)
+    change_ingestion.CHANGE_STREAM_DATABASE = database
+    return change_ingestion.ChangeStreamIngestor
+
+
+async def _wait_for(predicate: Any, timeout_seconds: float) -> bool:
+    deadline = time.monotonic() + timeout_seconds
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        await asyncio.sleep(0.01)
+    return predicate()
+
+
+async def run_probe(args: argparse.Namespace) -> Dict[str, Any]:
+    import redis.asyncio as redis_asyncio
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    mongo_client = AsyncIOMotorClient(args.mongo_url)
+    redis_client = redis_asyncio.from_url(args.redis_url)
+    ingestor = install_clients(mongo_client, redis_client, args.database)
+    database = mongo_client[args.database]
+
+    from app.core.invalidation import INVALIDATION_CHANNEL
+    from app.services.change_ingestion import FIXTURE_CHANGE_CHANNEL, PREDICTION_CHANGE_CHANNEL
+
+    fixture_channel = f"{FIXTURE_CHANGE_CHANNEL}:{PROBE_FIXTURE_ID}"
+    prediction_channel = f"{PREDICTION_CHANGE_CHANNEL}:{PROBE_FIXTURE_ID}"
+    listener = _Listener()
+    pubsub = redis_client.pubsub()
+    await pubsub.subscribe(fixture_channel, prediction_channel, INVALIDATION_CHANNEL)
+    listen_task = asyncio.create_task(listener.run(pubsub))
+
+    await database.drop_collection("fixtures_refactor")
+    await database.drop_collection("fixture_predictions")
+    await database.create_collection("fixture_predictions")
+    try:
+        await database.command({"collMod": "fixture_predictions", "changeStreamPreAndPostImages": {"enabled": True}})
+        pre_images = True
+    except Exception:
+        # Before MongoDB 6.0: deletes of predictions are not relayed
+        pre_images = False
+    await ingestor.clear_resume_token()
+    await database["fixtures_refactor"].insert_one({"_id": PROBE_FIXTURE_ID, "home_team_score": 0, "away_team_score": 0})
+
+    await ingestor.start()
+    # The stream starts at "now" without a token: give it time to open
+    await asyncio.sleep(args.open_wait)
+
+    fixture_latencies: List[float] = []
+    invalidation_latencies: List[float] = []
+    for sequence in range(args.updates):
+        before_fixture = listener.count(fixture_channel)
+        before_invalidation = listener.count(INVALIDATION_CHANNEL)
+        written_at = time.time()
+        await database["fixtures_refactor"].update_one(
+            {"_id": PROBE_FIXTURE_ID}, {"$set": {"home_team_score": sequence, "minutes_elapsed": sequence}}
+        )
+        if await _wait_for(lambda: listener.count(fixture_channel) > before_fixture, args.timeout):
+            fixture_latencies.append((listener.received[fixture_channel][-1][0] - written_at) * 1000)
+        if await _wait_for(lambda: listener.count(INVALIDATION_CHANNEL) > before_invalidation, args.timeout):
+            invalidation_latencies.append((listener.received[INVALIDATION_CHANNEL][-1][0] - written_at) * 1000)
+        await asyncio.sleep(args.interval)
+
+    await database["fixture_predictions"].insert_one(
+        {"fixture_id": PROBE_FIXTURE_ID, "prediction_id": 101, "prediction_type": "fixture"}
+    )
+    prediction_received = await _wait_for(lambda: listener.count(prediction_channel) > 0, args.timeout)
+    delete_received = None
+    if pre_images:
+        before_delete = listener.count(prediction_channel)
+        await database["fixture_predictions"].delete_one({"fixture_id": PROBE_FIXTURE_ID, "prediction_id": 101})
+        delete_received = await _wait_for(lambda: listener.count(prediction_channel) > before_delete, args.timeout)
+
+    # Resume: writes made while no consumer runs must be replayed after the restart
+    await ingestor.stop()
+    before_resume = listener.count(fixture_channel)
+    for sequence in range(args.missed):
+        await database["fixtures_refactor"].update_one(
+            {"_id": PROBE_FIXTURE_ID}, {"$set": {"away_team_score": sequence}}
+        )
+    await ingestor.start()
+    await _wait_for(lambda: listener.count(fixture_channel) - before_resume >= args.missed, args.timeout + args.open_wait)
+    replayed = listener.count(fixture_channel) - before_resume
+
+    await ingestor.stop()
+    listen_task.cancel()
+    await asyncio.gather(listen_task, return_exceptions=True)
+    await pubsub.unsubscribe()
+    await pubsub.close()
+    if not args.keep:
+        await mongo_client.drop_database(args.database)
+    await redis_client.close()
+    mongo_client.close()
+
+    return {
+        "updates": args.updates,
+        "fixture_events": {"received": len(fixture_latencies), **summarize_latencies(fixture_latencies)},
+        "invalidations": {"received": len(invalidation_latencies), **summarize_latencies(invalidation_latencies)},
+        "prediction_event_received": prediction_received,
+        "prediction_delete_received": delete_received,
+        "resume": {"missed_writes": args.missed, "replayed": replayed, "ok": replayed >= args.missed},
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Change-stream ingestion probe")
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017/?replicaSet=rs0", help="Replica set URL.")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    parser.add_argument("--database", default="fourthofficial_change_stream_probe", help="Scratch database (dropped afterwards).")
+    parser.add_argument("--updates", type=int, default=50, help="Fixture updates measured.")
+    parser.add_argument("--interval", type=float, default=0.05, help="Seconds between updates.")
+    parser.add_argument("--missed", type=int, default=10, help="Writes made while the ingestor is stopped.")
+    parser.add_argument("--open-wait", type=float, default=2.0, help="Seconds allowed for the stream to open.")
+    parser.add_argument("--timeout", type=float, default=5.0, help="Seconds to wait for each event.")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch database.")
+    parser.add_argument("--json", dest="json_path", help="Write the report as JSON to this path.")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    report = asyncio.run(run_probe(args))
+    print(json.dumps(report, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as handle:
+            json.dump(report, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
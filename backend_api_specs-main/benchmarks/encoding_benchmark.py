@@ -0,0 +1,222 @@
+"""
+Size / CPU benchmark for response encodings and compression settings.
+
+Builds representative payloads from benchmarks.seed_data (fixtures list with embedded
+predictions, a 500-item prediction list in full and columnar form, a commentary feed and
+a sequence of SSE events)
+and measures, for each payload:
+
+- JSON vs MessagePack body size and encode time
+- gzip levels and brotli qualities: compressed size and compress time
+- SSE: independent per-event gzip vs one per-stream compressor with Z_SYNC_FLUSH
+
+It then prints the cheapest setting whose output is within --tolerance of the smallest,
+which is how the defaults in app.core.compression.COMPRESSION_ROUTE_POLICIES were chosen.
+
+    python -m benchmarks.encoding_benchmark
+    python -m benchmarks.encoding_benchmark --repeat 50 --json encoding.json
+"""
+
+import argparse
+import json
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.seed_data import FIXTURE_PREDICTIONS_COLLECTION, REFACTOR_DB, SeedConfig, build_seed_data
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+GZIP_LEVELS = (1, 4, 6, 9)
+BROTLI_QUALITIES = (1, 4, 5, 6, 9, 11)
+# Matches app.core.compression SSE settings (4KB window, memLevel 5)
+SSE_GZIP_WBITS = 16 + 12
+SSE_GZIP_MEM_LEVEL = 5
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+def _columnar(predictions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Same layout as app.core.columnar.build_prediction_columns (format=columnar)."""
+    return {
+        "count": len(predictions),
+        "prediction_id": [p["prediction_id"] for p in predictions],
+        "fixture_id": [p["fixture_id"] for p in predictions],
+        "pre_game_prediction": [p["pre_game_prediction"] for p in predictions],
+        "prediction": [p.get("prediction") for p in predictions],
+        "pct_change_value": [p.get("pct_change_value") for p in predictions],
+    }
+
+
+def build_payloads(seed_value: int) -> Dict[str, Any]:
+    seed = build_seed_data(SeedConfig(seed=seed_value))
+    refactor = seed.collections[REFACTOR_DB]
+    predictions_by_fixture: Dict[int, List[Dict[str, Any]]] = {}
+    for prediction in refactor[FIXTURE_PREDICTIONS_COLLECTION]:
+        predictions_by_fixture.setdefault(prediction["fixture_id"], []).append(prediction)
+
+    fixtures = []
+    for fixture in refactor["fixtures_refactor"][:60]:
+        item = dict(fixture)
+        item["fixture_id"] = item.pop("_id")
+        item["predictions"] = predictions_by_fixture.get(item["fixture_id"], [])[:3]
+        fixtures.append(item)
+
+    commentary = refactor["commentaries_refactor"][0] if refactor["commentaries_refactor"] else {}
+    sse_events = [
+        json.dumps(_jsonable({"fixture_id": fixture["_id"], **{k: fixture[k] for k in (
+            "home_team_score", "away_team_score", "minutes_elapsed", "is_live", "updated_at",
+        )}, "predictions": predictions_by_fixture.get(fixture["_id"], [])[:3]}))
+        for fixture in refactor["fixtures_refactor"][:100]
+    ]
+
+    return {
+        "fixtures_list": _jsonable({"success": True, "data": {"fixtures": fixtures}, "errors": []}),
+        "fixture_predictions_500": _jsonable(
+            {"success": True, "data": {"predictions": refactor[FIXTURE_PREDICTIONS_COLLECTION][:500]}, "errors": []}
+        ),
+        "fixture_predictions_500_columnar": {"success": True, "data": _columnar(refactor[FIXTURE_PREDICTIONS_COLLECTION][:500]), "errors": []},
+        "commentary": _jsonable({"success": True, "data": commentary, "errors": []}),
+        "sse_events": sse_events,
+    }
+
+
+def _timed(function: Callable[[], bytes], repeat: int) -> Tuple[bytes, float]:
+    result = function()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return result, (time.perf_counter() - started) / repeat * 1000
+
+
+def _gzip(body: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+def benchmark_body(payload: Any, repeat: int) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    bodies: Dict[str, bytes] = {}
+
+    json_body, json_ms = _timed(lambda: json.dumps(payload, separators=(",", ":")).encode(), repeat)
+    bodies["json"] = json_body
+    rows.append({"encoding": "json", "compression": "identity", "bytes": len(json_body), "cpu_ms": round(json_ms, 3)})
+    if msgpack is not None:
+        packed, packed_ms = _timed(lambda: msgpack.packb(payload, use_bin_type=True), repeat)
+        bodies["msgpack"] = packed
+        rows.append({"encoding": "msgpack", "compression": "identity", "bytes": len(packed), "cpu_ms": round(packed_ms, 3)})
+
+    for encoding, body in bodies.items():
+        for level in GZIP_LEVELS:
+            compressed, compress_ms = _timed(lambda: _gzip(body, level), repeat)
+            rows.append(
+                {"encoding": encoding, "compression": f"gzip-{level}", "bytes": len(compressed), "cpu_ms": round(compress_ms, 3)}
+            )
+        if brotli is not None:
+            for quality in BROTLI_QUALITIES:
+                compressed, compress_ms = _timed(lambda: brotli.compress(body, quality=quality), repeat)
+                rows.append(
+                    {"encoding": encoding, "compression": f"br-{quality}", "bytes": len(compressed), "cpu_ms": round(compress_ms, 3)}
+                )
+    return rows
+
+
+def benchmark_sse(events: List[str], repeat: int) -> List[Dict[str, Any]]:
+    frames = [f"event: fixture_update\r\ndata: {event}\r\n\r\n".encode() for event in events]
+
+    def identity() -> bytes:
+        return b"".join(frames)
+
+    def per_event() -> bytes:
+        return b"".join(_gzip(frame, 6) for frame in frames)
+
+    def per_stream() -> bytes:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, SSE_GZIP_WBITS, SSE_GZIP_MEM_LEVEL)
+        return b"".join(compressor.compress(frame) + compressor.flush(zlib.Z_SYNC_FLUSH) for frame in frames)
+
+    def per_stream_full_window() -> bytes:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return b"".join(compressor.compress(frame) + compressor.flush(zlib.Z_SYNC_FLUSH) for frame in frames)
+
+    rows = []
+    for name, function in (
+        ("identity", identity),
+        ("gzip per event", per_event),
+        ("gzip per stream, 4KB window", per_stream),
+        ("gzip per stream, 32KB window", per_stream_full_window),
+    ):
+        body, cpu_ms = _timed(function, repeat)
+        rows.append(
+            {
+                "encoding": "sse",
+                "compression": name,
+                "bytes": len(body),
+                "bytes_per_event": round(len(body) / len(frames), 1),
+                "cpu_ms": round(cpu_ms / len(frames), 4),
+            }
+        )
+    return rows
+
+
+def recommend(rows: List[Dict[str, Any]], tolerance: float) -> Dict[str, Any]:
+    """Cheapest compressed JSON setting whose size is within tolerance of the smallest."""
+    candidates = [row for row in rows if row["encoding"] == "json" and row["compression"] != "identity"]
+    if not candidates:
+        return {}
+    smallest = min(row["bytes"] for row in candidates)
+    acceptable = [row for row in candidates if row["bytes"] <= smallest * (1 + tolerance)]
+    return min(acceptable, key=lambda row: row["cpu_ms"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Response encoding / compression benchmark")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed repetitions per measurement.")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Size tolerance for the recommendation.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="Write results as JSON to this path.")
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("brotli not installed: brotli rows skipped")
+    if msgpack is None:
+        print("msgpack not installed: MessagePack rows skipped")
+
+    payloads = build_payloads(args.seed)
+    report: Dict[str, Any] = {}
+    for name in ("fixtures_list", "fixture_predictions_500", "fixture_predictions_500_columnar", "commentary"):
+        rows = benchmark_body(payloads[name], args.repeat)
+        report[name] = {"rows": rows, "recommended": recommend(rows, args.tolerance)}
+    report["sse_events"] = {"rows": benchmark_sse(payloads["sse_events"], args.repeat)}
+
+    for name, section in report.items():
+        print(f"\n{name}")
+        print(f"  {'encoding':<9} {'compression':<30} {'bytes':>9} {'cpu_ms':>9}")
+        for row in section["rows"]:
+            print(f"  {row['encoding']:<9} {row['compression']:<30} {row['bytes']:>9} {row['cpu_ms']:>9}")
+        if section.get("recommended"):
+            print(f"  recommended: {section['recommended']['compression']}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as handle:
+            json.dump(report, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,437 @@
+"""
+Synthetic load harness for the FourthOfficial API.
+
+Seeds an in-memory MongoDB (mongomock-motor) and Redis (fakeredis) with the data from
+benchmarks.seed_data, serves app.main:app with uvicorn on a local port, then drives the
+key routes and the SSE streams at a configurable concurrency and reports p50/p95/p99
+latency and throughput per route.
+
+Pass --base-url (and --redis-url for the SSE probe) to run the same scenarios against a
+locally running stack instead of the in-memory stand-ins.
+
+    python -m benchmarks.load_harness --concurrency 20 --requests 2000
+    python -m benchmarks.load_harness --base-url http://localhost:8000 --redis-url redis://localhost:6379/0
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from bson import ObjectId
+
+from benchmarks.seed_data import PRIMARY_DB, SeedConfig, SeedData, build_seed_data
+
+# Authenticated user injected through dependency_overrides in stand-in mode
+LOAD_TEST_USER = {
+    "_id": "load-test-user",
+    "uid": "load-test-user",
+    "email": "premium@fourthofficial.ai",
+    "subscription_tier": "premium",
+}
+# Seconds to wait for the in-process server to accept connections
+SERVER_STARTUP_TIMEOUT_SECONDS = 10.0
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize_latencies(latencies_ms: List[float]) -> Dict[str, float]:
+    return {
+        "p50_ms": round(percentile(latencies_ms, 50), 2),
+        "p95_ms": round(percentile(latencies_ms, 95), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+        "max_ms": round(max(latencies_ms), 2) if latencies_ms else 0.0,
+    }
+
+
+@dataclass
+class RouteResult:
+    route: str
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    status_counts: Dict[int, int] = field(default_factory=dict)
+    response_bytes: int = 0
+
+    def as_dict(self, elapsed_seconds: float) -> Dict[str, Any]:
+        count = len(self.latencies_ms)
+        return {
+            "route": self.route,
+            "requests": count,
+            "errors": self.errors,
+            "statuses": {str(code): n for code, n in sorted(self.status_counts.items())},
+            "throughput_rps": round(count / elapsed_seconds, 1) if elapsed_seconds else 0.0,
+            "avg_bytes": int(self.response_bytes / count) if count else 0,
+            **summarize_latencies(self.latencies_ms),
+        }
+
+
+# A scenario is (route label, weight, URL builder)
+Scenario = Tuple[str, int, Callable[[random.Random, SeedData], str]]
+
+
+def default_scenarios() -> List[Scenario]:
+    """Routes hit by the load run, weighted roughly by production traffic."""
+
+    def league(rng: random.Random, seed: SeedData) -> Dict[str, int]:
+        return rng.choice(seed.league_seasons)
+
+    def fixture(rng: random.Random, seed: SeedData) -> int:
+        return rng.choice(seed.fixture_ids)
+
+    return [
+        ("/api/v1/fixtures", 20, lambda rng, seed: "/api/v1/fixtures?match_type=upcoming&limit=20"),
+        ("/api/v1/fixtures (live)", 10, lambda rng, seed: "/api/v1/fixtures?match_type=live&limit=20"),
+        (
+            "/api/v1/fixtures/{fixture_id}/predictions",
+            20,
+            lambda rng, seed: f"/api/v1/fixtures/{fixture(rng, seed)}/predictions",
+        ),
+        (
+            "/api/v1/fixtures/predictions/bulk",
+            10,
+            lambda rng, seed: "/api/v1/fixtures/predictions/bulk?fixture_ids="
+            + ",".join(str(fixture_id) for fixture_id in rng.sample(seed.fixture_ids, 12)),
+        ),
+        (
+            "/api/v1/fixtures/{fixture_id}/commentary",
+            8,
+            lambda rng, seed: f"/api/v1/fixtures/{rng.choice(seed.live_fixture_ids or seed.fixture_ids)}/commentary",
+        ),
+        (
+            "/api/v1/fixtures/{fixture_id}/statistics",
+            5,
+            lambda rng, seed: f"/api/v1/fixtures/{fixture(rng, seed)}/statistics",
+        ),
+        (
+            "/api/v1/fixtures/{fixture_id}/weather",
+            3,
+            lambda rng, seed: f"/api/v1/fixtures/{fixture(rng, seed)}/weather",
+        ),
+        (
+            "/api/v1/leagues/standings",
+            10,
+            lambda rng, seed: "/api/v1/leagues/standings?league_id={league_id}&season_id={season_id}".format(
+                **league(rng, seed)
+            ),
+        ),
+        (
+            "/api/v1/leagues/{league_id}/fixtures",
+            6,
+            lambda rng, seed: "/api/v1/leagues/{league_id}/fixtures?season_id={season_id}".format(
+                **league(rng, seed)
+            ),
+        ),
+        ("/api/v1/smart-combos/current", 8, lambda rng, seed: "/api/v1/smart-combos/current"),
+        ("/api/v1/predictions/smart-combos", 4, lambda rng, seed: "/api/v1/predictions/smart-combos"),
+        (
+            "/api/v1/players/bundle",
+            4,
+            lambda rng, seed: f"/api/v1/players/bundle?player_id={rng.choice(seed.player_ids)}",
+        ),
+        ("/api/v1/players/watchlist_tmp", 2, lambda rng, seed: "/api/v1/players/watchlist_tmp"),
+    ]
+
+
+# ---------------------------------------------------------------------------
+# In-memory stand-ins
+# ---------------------------------------------------------------------------
+
+
+async def seed_mongo(client: Any, seed: SeedData) -> None:
+    for database_name, collections in seed.collections.items():
+        database = client[database_name]
+        for collection_name, documents in collections.items():
+            if documents:
+                # String ids stand in for the string id codec, which mongomock cannot apply
+                await database[collection_name].insert_many(
+                    [{"_id": str(ObjectId()), **document} for document in documents]
+                )
+
+
+def install_stand_ins(mongo_client: Any, redis_client: Any) -> Any:
+    """
+    Point the app at the stand-in clients and return the FastAPI app.
+
+    Every loaded app.* module that imported get_database / get_redis_pubsub by name gets
+    its reference replaced, and both get_current_user and the optional-auth dependency
+    (get_current_user_optional()) resolve to LOAD_TEST_USER, so routes that vary by
+    tier are measured as a signed-in user rather than anonymously.
+    """
+    # mongomock does not implement $topN or custom type registries
+    os.environ.setdefault("MONGO_SUPPORTS_TOPN", "false")
+    os.environ.setdefault("MONGO_STRING_ID_CODEC", "false")
+    from app.main import app  # imported late so the stand-ins are chosen first
+
+    primary = mongo_client[PRIMARY_DB]
+    patched = 0
+    for module_name, module in list(sys.modules.items()):
+        if not module_name.startswith("app.") or module is None:
+            continue
+        if hasattr(module, "get_database"):
+            setattr(module, "get_database", lambda: primary)
+            patched += 1
+        if hasattr(module, "get_redis_pubsub"):
+            setattr(module, "get_redis_pubsub", lambda: redis_client)
+            patched += 1
+
+    from app.core.auth import get_current_user, get_current_user_optional
+
+    app.dependency_overrides[get_current_user] = lambda: dict(LOAD_TEST_USER)
+    # get_current_user_optional() wraps its callable in Depends; override that callable
+    app.dependency_overrides[get_current_user_optional().dependency] = lambda: dict(LOAD_TEST_USER)
+    print(f"Stand-ins installed ({patched} module references patched)")
+    return app
+
+
+async def start_local_server(app: Any, port: int) -> Tuple[Any, asyncio.Task]:
+    import uvicorn
+
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on")
+    server = uvicorn.Server(config)
+    task = asyncio.create_task(server.serve())
+    deadline = time.perf_counter() + SERVER_STARTUP_TIMEOUT_SECONDS
+    while not server.started:
+        if task.done() or time.perf_counter() > deadline:
+            raise RuntimeError("Local uvicorn server failed to start")
+        await asyncio.sleep(0.05)
+    return server, task
+
+
+async def stop_local_server(server: Any, task: asyncio.Task) -> None:
+    server.should_exit = True
+    await task
+
+
+# ---------------------------------------------------------------------------
+# Drivers
+# ---------------------------------------------------------------------------
+
+
+async def run_http_load(
+    client: httpx.AsyncClient,
+    seed: SeedData,
+    scenarios: List[Scenario],
+    total_requests: int,
+    concurrency: int,
+    rng: random.Random,
+) -> Tuple[Dict[str, RouteResult], float]:
+    """Issue total_requests weighted requests from `concurrency` workers."""
+    labels = [scenario[0] for scenario in scenarios]
+    weights = [scenario[1] for scenario in scenarios]
+    builders = {scenario[0]: scenario[2] for scenario in scenarios}
+
+    plan = [
+        (label, builders[label](rng, seed))
+        for label in rng.choices(labels, weights=weights, k=total_requests)
+    ]
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in plan:
+        queue.put_nowait(item)
+
+    results: Dict[str, RouteResult] = {label: RouteResult(label) for label in labels}
+
+    async def worker() -> None:
+        while True:
+            try:
+                label, url = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            result = results[label]
+            started = time.perf_counter()
+            try:
+                response = await client.get(url)
+                body = response.content
+            except httpx.HTTPError:
+                result.errors += 1
+                continue
+            result.latencies_ms.append((time.perf_counter() - started) * 1000)
+            result.status_counts[response.status_code] = result.status_counts.get(response.status_code, 0) + 1
+            result.response_bytes += len(body)
+            if response.status_code >= 500:
+                result.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results, time.perf_counter() - started
+
+
+async def read_sse_events(response: httpx.Response, on_event: Callable[[str, str], None]) -> None:
+    """Parse a text/event-stream body, calling on_event(event, data) per dispatched event."""
+    event_name, data_lines = "message", []
+    async for line in response.aiter_lines():
+        if line == "":
+            if data_lines:
+                on_event(event_name, "\n".join(data_lines))
+            event_name, data_lines = "message", []
+        elif line.startswith("event:"):
+            event_name = line[6:].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[5:].lstrip())
+
+
+async def run_sse_probe(
+    client: httpx.AsyncClient,
+    publisher: Any,
+    fixture_ids: List[int],
+    clients: int,
+    events: int,
+    interval_seconds: float,
+) -> Dict[str, Any]:
+    """
+    Open `clients` /fixtures/stream connections, publish `events` updates per fixture and
+    measure publish-to-receive latency from the timestamp embedded in each payload.
+    """
+    if not fixture_ids:
+        return {"skipped": "no live fixtures seeded"}
+
+    latencies_ms: List[float] = []
+    received = 0
+
+    def on_event(event: str, data: str) -> None:
+        nonlocal received
+        if event != "fixture_update":
+            return
+        try:
+            sent_at = json.loads(data)["sent_at"]
+        except (ValueError, KeyError, TypeError):
+            return
+        received += 1
+        latencies_ms.append((time.time() - sent_at) * 1000)
+
+    async def listen(fixture_id: int) -> None:
+        async with client.stream("GET", f"/api/v1/fixtures/stream?fixture_ids={fixture_id}", timeout=None) as response:
+            await read_sse_events(response, on_event)
+
+    assignments = [fixture_ids[index % len(fixture_ids)] for index in range(clients)]
+    listeners = [asyncio.create_task(listen(fixture_id)) for fixture_id in assignments]
+    # Give the subscriptions time to register before publishing
+    await asyncio.sleep(0.5)
+
+    for sequence in range(events):
+        for fixture_id in set(assignments):
+            payload = {"fixture_id": fixture_id, "sequence": sequence, "sent_at": time.time()}
+            await publisher.publish(f"fixture_updates:{fixture_id}", json.dumps(payload))
+        await asyncio.sleep(interval_seconds)
+
+    await asyncio.sleep(0.5)
+    for listener in listeners:
+        listener.cancel()
+    await asyncio.gather(*listeners, return_exceptions=True)
+
+    return {
+        "clients": clients,
+        "events_expected": events * clients,
+        "events_received": received,
+        **summarize_latencies(latencies_ms),
+    }
+
+
+def print_report(rows: List[Dict[str, Any]], sse: Optional[Dict[str, Any]], elapsed: float) -> None:
+    header = f"{'route':<46} {'reqs':>6} {'err':>4} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'bytes':>8}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['route']:<46} {row['requests']:>6} {row['errors']:>4} {row['throughput_rps']:>8} "
+            f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8} {row['avg_bytes']:>8}"
+        )
+    total = sum(row["requests"] for row in rows)
+    print(f"\n{total} requests in {elapsed:.2f}s ({total / elapsed:.1f} req/s)" if elapsed else "")
+    if sse:
+        print(f"SSE probe: {json.dumps(sse)}")
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    seed = build_seed_data(SeedConfig(seed=args.seed))
+
+    server = server_task = None
+    publisher = None
+    if args.base_url:
+        base_url = args.base_url
+        if args.redis_url:
+            import redis.asyncio as redis_asyncio
+
+            publisher = redis_asyncio.from_url(args.redis_url)
+    else:
+        from fakeredis import aioredis as fake_aioredis
+        from mongomock_motor import AsyncMongoMockClient
+
+        mongo_client = AsyncMongoMockClient()
+        await seed_mongo(mongo_client, seed)
+        publisher = fake_aioredis.FakeRedis(decode_responses=True)
+        app = install_stand_ins(mongo_client, publisher)
+        server, server_task = await start_local_server(app, args.port)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    limits = httpx.Limits(max_connections=args.concurrency + args.sse_clients + 10)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=30.0) as client:
+            # Warm-up pass so startup caches do not skew the first percentiles
+            await run_http_load(client, seed, default_scenarios(), args.warmup, args.concurrency, rng)
+            results, elapsed = await run_http_load(
+                client, seed, default_scenarios(), args.requests, args.concurrency, rng
+            )
+            sse = None
+            if publisher is not None and args.sse_clients:
+                sse = await run_sse_probe(
+                    client, publisher, seed.live_fixture_ids, args.sse_clients, args.sse_events, args.sse_interval
+                )
+    finally:
+        if server is not None:
+            await stop_local_server(server, server_task)
+
+    rows = [result.as_dict(elapsed) for result in results.values() if result.latencies_ms or result.errors]
+    rows.sort(key=lambda row: row["p95_ms"], reverse=True)
+    print_report(rows, sse, elapsed)
+    return {
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "elapsed_seconds": round(elapsed, 3),
+        "routes": rows,
+        "sse": sse,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="FourthOfficial API load harness")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent HTTP workers.")
+    parser.add_argument("--requests", type=int, default=2000, help="Measured requests.")
+    parser.add_argument("--warmup", type=int, default=200, help="Unmeasured warm-up requests.")
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed for data and request mix.")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the in-process server.")
+    parser.add_argument("--base-url", help="Run against an existing server instead of the stand-ins.")
+    parser.add_argument("--redis-url", help="Redis used to publish SSE probe events with --base-url.")
+    parser.add_argument("--token", help="Bearer token for --base-url runs.")
+    parser.add_argument("--sse-clients", type=int, default=50, help="SSE connections in the probe (0 disables).")
+    parser.add_argument("--sse-events", type=int, default=20, help="Events published per fixture channel.")
+    parser.add_argument("--sse-interval", type=float, default=0.1, help="Seconds between publish rounds.")
+    parser.add_argument("--json", dest="json_path", help="Write the report as JSON to this path.")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    report = asyncio.run(main_async(args))
+    if args.json_path:
+        with open(args.json_path, "w") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"Report written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
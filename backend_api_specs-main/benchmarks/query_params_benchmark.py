@@ -0,0 +1,119 @@
+"""
+Microbenchmark for the shared query-parameter layer (app.core.query_params).
+
+Compares the per-request work the routers used to do inline with the shared helpers:
+
+- fixture_ids parsing: split/strip/int on every request vs parse_id_list (cached per raw string)
+- sort resolution: building the allowed-field dict per request vs PREDICTION_SORT.resolve
+- filter building: if-chains vs SMART_COMBO_PREDICTION_FILTER.build
+
+The ID lists repeat the way listing pages do (a handful of distinct sets, requested many
+times), so the cached path is measured at its expected hit rate.
+
+    python -m benchmarks.query_params_benchmark
+    python -m benchmarks.query_params_benchmark --number 200000 --distinct 64
+"""
+
+import argparse
+import json
+import random
+import timeit
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.query_params import PREDICTION_SORT, SMART_COMBO_PREDICTION_FILTER, parse_id_list
+
+
+def _inline_parse_ids(raw: str) -> List[int]:
+    """The comma-splitting previously repeated in get_fixtures / stream_fixtures."""
+    return [int(part.strip()) for part in raw.split(",") if part.strip()]
+
+
+def _inline_resolve_sort(sort_by: str, sort_order: str) -> Tuple[str, int]:
+    """The per-request dict + lookup previously done by the prediction routers."""
+    allowed_fields = {
+        "pct_change": "pct_change_value",
+        "prediction_pre_game": "pre_game_prediction",
+        "prediction": "prediction",
+        "created_at": "created_at",
+    }
+    field = allowed_fields.get(sort_by, "pct_change_value")
+    direction = 1 if sort_order.lower() == "asc" else -1
+    return field, direction
+
+
+def _inline_filter(fixture_id: Optional[int], combo_id: Optional[int]) -> Dict[str, Any]:
+    filters: Dict[str, Any] = {}
+    if fixture_id is not None:
+        filters["fixture_id"] = fixture_id
+    if combo_id is not None:
+        filters["combo_id"] = combo_id
+    return filters
+
+
+def _template_filter(fixture_id: Optional[int], combo_id: Optional[int]) -> Dict[str, Any]:
+    return SMART_COMBO_PREDICTION_FILTER.build(fixture_id=fixture_id, combo_id=combo_id)
+
+
+def build_id_lists(distinct: int, ids_per_list: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    return [
+        ",".join(str(rng.randint(18_000_000, 19_000_000)) for _ in range(ids_per_list))
+        for _ in range(distinct)
+    ]
+
+
+def _per_call_ns(func: Callable[[], Any], number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e9
+
+
+def run(number: int, distinct: int, ids_per_list: int, seed: int) -> List[Dict[str, Any]]:
+    id_lists = build_id_lists(distinct, ids_per_list, seed)
+    sorts = [("pct_change", "desc"), ("prediction", "asc"), ("created_at", "desc"), ("unknown", "DESC")]
+    filters = [(1, None), (None, 7), (3, 9), (None, None)]
+
+    def cycle(values):
+        state = {"index": 0}
+
+        def next_value():
+            state["index"] = (state["index"] + 1) % len(values)
+            return values[state["index"]]
+
+        return next_value
+
+    next_ids, next_sort, next_filter = cycle(id_lists), cycle(sorts), cycle(filters)
+
+    cases = [
+        ("fixture_ids", "inline", lambda: _inline_parse_ids(next_ids())),
+        ("fixture_ids", "parse_id_list", lambda: parse_id_list(next_ids())),
+        ("sort", "inline", lambda: _inline_resolve_sort(*next_sort())),
+        ("sort", "SortResolver", lambda: PREDICTION_SORT.resolve(*next_sort())),
+        ("filter", "inline", lambda: _inline_filter(*next_filter())),
+        ("filter", "FilterTemplate", lambda: _template_filter(*next_filter())),
+    ]
+    return [
+        {"step": step, "variant": variant, "ns_per_call": round(_per_call_ns(func, number), 1)}
+        for step, variant, func in cases
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query-parameter parsing microbenchmark")
+    parser.add_argument("--number", type=int, default=100_000, help="Calls per timed repetition.")
+    parser.add_argument("--distinct", type=int, default=32, help="Distinct fixture_ids strings in rotation.")
+    parser.add_argument("--ids-per-list", type=int, default=20, help="IDs per fixture_ids string.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="Write results as JSON to this path.")
+    args = parser.parse_args()
+
+    rows = run(args.number, args.distinct, args.ids_per_list, args.seed)
+    print(f"{'step':<12} {'variant':<16} {'ns/call':>10}")
+    for row in rows:
+        print(f"{row['step']:<12} {row['variant']:<16} {row['ns_per_call']:>10}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as handle:
+            json.dump(rows, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
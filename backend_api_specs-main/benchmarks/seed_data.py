@@ -0,0 +1,364 @@
+"""
+Deterministic synthetic data for the load and SSE benchmarks.
+
+Document shapes follow the schemas in app.schemas and the fields the match, league
+and player pages read (see temp_lineups.txt / MatchDetailPage for the match page).
+Everything is generated from a seeded RNG so two runs seed identical data.
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+# Database names used by app.core.database.get_database() and the refactor client
+PRIMARY_DB = "fourthofficial"
+REFACTOR_DB = "fourthofficial_refactor"
+
+# Prediction collections read by FixturesService / PlayersService
+FIXTURE_PREDICTIONS_COLLECTION = "fixture_predictions"
+PLAYER_PREDICTIONS_COLLECTION = "player_predictions"
+
+PREDICTION_DEFINITIONS = [
+    (101, "Over 1.5 Goals"),
+    (102, "Over 2.5 Goals"),
+    (103, "Both Teams to Score"),
+    (104, "Home Team to Win"),
+    (105, "Away Team to Win"),
+    (106, "Draw"),
+    (107, "Over 1.5 Goals First Half"),
+    (108, "Over 9.5 Corners"),
+    (109, "Over 3.5 Cards"),
+    (110, "Home Team Clean Sheet"),
+    (111, "Away Team Clean Sheet"),
+    (112, "Penalty Awarded"),
+]
+
+PLAYER_PREDICTION_DEFINITIONS = [
+    (201, "Player to Score Anytime"),
+    (202, "Player 1+ Shots on Target"),
+    (203, "Player 2+ Shots on Target"),
+    (204, "Player to Assist"),
+    (205, "Player to be Booked"),
+]
+
+COMMENTARY_TEMPLATES = [
+    ("general", "Ball possession: {home} {pct}%, {away} {rest}%."),
+    ("corner", "Corner, {team}. Conceded by a defender."),
+    ("chance", "Attempt saved. Shot from outside the box for {team}."),
+    ("yellow_card", "A player of {team} is shown the yellow card for a bad foul."),
+    ("substitution", "Substitution, {team}. Fresh legs come on."),
+    ("goal", "Goal! {team} find the net with a shot from the centre of the box."),
+]
+
+FORM_RESULTS = ["W", "D", "L"]
+
+
+@dataclass
+class SeedConfig:
+    leagues: int = 5
+    teams_per_league: int = 20
+    fixtures_per_league: int = 60
+    live_fixtures: int = 8
+    predictions_per_fixture: int = 12
+    commentaries_per_fixture: int = 90
+    players_per_team: int = 18
+    watchlist_days: int = 30
+    seed: int = 42
+    now: datetime = field(default_factory=lambda: datetime.utcnow().replace(microsecond=0))
+
+
+@dataclass
+class SeedData:
+    """Documents keyed by database and collection, plus IDs the load scenarios pick from."""
+
+    collections: Dict[str, Dict[str, List[Dict[str, Any]]]]
+    fixture_ids: List[int]
+    live_fixture_ids: List[int]
+    league_seasons: List[Dict[str, int]]
+    player_ids: List[int]
+    combo_id: int
+
+
+def _prediction_doc(rng: random.Random, base: Dict[str, Any], prediction_id: int, name: str, now: datetime) -> Dict[str, Any]:
+    pre_game = round(rng.uniform(5, 95), 2)
+    live = round(min(99.0, max(1.0, pre_game + rng.uniform(-20, 20))), 2)
+    return {
+        **base,
+        "created_at": now - timedelta(days=2),
+        "updated_at": now - timedelta(minutes=rng.randint(0, 90)),
+        "prediction_id": prediction_id,
+        "prediction_display_name": name,
+        "pre_game_prediction": pre_game,
+        "pre_game_prediction_reasons": [
+            f"{name} landed in {rng.randint(4, 9)} of the last 10 home games",
+            f"Model confidence {rng.choice(['high', 'medium'])} based on recent form",
+        ],
+        "prediction": live,
+        "prediction_reasons": [f"Live momentum shifted by {round(live - pre_game, 1)} points"],
+        "pct_change_value": round((live - pre_game) / pre_game * 100, 2),
+        "pct_change_interval": 5.0,
+    }
+
+
+def build_seed_data(config: SeedConfig = SeedConfig()) -> SeedData:
+    rng = random.Random(config.seed)
+    now = config.now
+    refactor: Dict[str, List[Dict[str, Any]]] = {
+        "fixtures_refactor": [],
+        "standings_refactor": [],
+        "league_season_lookup": [],
+        "commentaries_refactor": [],
+        "fixture_weather": [],
+        "fixture_statistics": [],
+        "smart_combos": [],
+        "smart_combo_predictions": [],
+        "players_watchlist_temp": [],
+        "players_refactor": [],
+        FIXTURE_PREDICTIONS_COLLECTION: [],
+        PLAYER_PREDICTIONS_COLLECTION: [],
+    }
+    primary: Dict[str, List[Dict[str, Any]]] = {
+        "temp_players_watchlist": [],
+        "temp_players": [],
+        "temp_player_statistics": [],
+        "temp_smart_combo_predictions": [],
+    }
+
+    fixture_ids: List[int] = []
+    live_fixture_ids: List[int] = []
+    league_seasons: List[Dict[str, int]] = []
+    player_ids: List[int] = []
+    next_fixture_id = 19_400_000
+    next_player_id = 37_000_000
+
+    for league_index in range(config.leagues):
+        league_id = 8 + league_index * 100
+        season_id = 23_000 + league_index
+        league_seasons.append({"league_id": league_id, "season_id": season_id})
+        refactor["league_season_lookup"].append({
+            "league_id": league_id,
+            "league_name": f"League {league_index + 1}",
+            "season_id": season_id,
+            "season_name": f"{now.year}/{now.year + 1}",
+            "season_is_current": True,
+            "season_starting_at": (now - timedelta(days=90)).strftime("%Y-%m-%d"),
+            "season_ending_at": (now + timedelta(days=200)).strftime("%Y-%m-%d"),
+        })
+        refactor["league_season_lookup"].append({
+            "league_id": league_id,
+            "league_name": f"League {league_index + 1}",
+            "season_id": season_id - 100,
+            "season_name": f"{now.year - 1}/{now.year}",
+            "season_is_current": False,
+            "season_starting_at": (now - timedelta(days=455)).strftime("%Y-%m-%d"),
+            "season_ending_at": (now - timedelta(days=165)).strftime("%Y-%m-%d"),
+        })
+
+        team_ids = [league_id * 1000 + team for team in range(config.teams_per_league)]
+        for position, team_id in enumerate(team_ids, start=1):
+            wins, draws = rng.randint(0, 15), rng.randint(0, 8)
+            losses = rng.randint(0, 10)
+            refactor["standings_refactor"].append({
+                "league_id": league_id,
+                "season_id": season_id,
+                "team_id": team_id,
+                "team_name": f"Team {team_id}",
+                "team_logo": f"https://cdn.example.com/teams/{team_id}.png",
+                "position": position,
+                "points": wins * 3 + draws,
+                "goal_difference": rng.randint(-20, 30),
+                "wins": wins,
+                "draws": draws,
+                "losses": losses,
+                "matches_played": wins + draws + losses,
+                "form": [rng.choice(FORM_RESULTS) for _ in range(5)],
+                "updated_at": now - timedelta(hours=1),
+            })
+
+            for _ in range(config.players_per_team):
+                player_id = next_player_id
+                next_player_id += 1
+                player_ids.append(player_id)
+                refactor["players_refactor"].append({
+                    "_id": player_id,
+                    "player_id": player_id,
+                    "display_name": f"Player {player_id}",
+                    "common_name": f"P. {player_id}",
+                    "position_id": rng.choice([24, 25, 26, 27]),
+                    "nationality_id": rng.choice([462, 17, 11, 32]),
+                    "image_path": f"https://cdn.example.com/players/{player_id}.png",
+                    "current_team": {"team_id": team_id, "jersey_number": rng.randint(1, 40)},
+                })
+                primary["temp_players"].append({
+                    "player_id": player_id,
+                    "display_name": f"Player {player_id}",
+                    "position_id": rng.choice([24, 25, 26, 27]),
+                    "nationality_id": rng.choice([462, 17, 11, 32]),
+                    "head_shot_location": f"https://cdn.example.com/players/{player_id}.png",
+                })
+                primary["temp_player_statistics"].append({
+                    "player_id": player_id,
+                    "basic": {
+                        "minutes_played": rng.randint(0, 3000),
+                        "games": rng.randint(0, 34),
+                        "goals": rng.randint(0, 20),
+                        "assists": rng.randint(0, 12),
+                    },
+                })
+
+        for fixture_index in range(config.fixtures_per_league):
+            fixture_id = next_fixture_id
+            next_fixture_id += 1
+            fixture_ids.append(fixture_id)
+            home, away = rng.sample(team_ids, 2)
+            # Spread fixtures from two weeks ago to three weeks ahead; some are live now
+            is_live = len(live_fixture_ids) < config.live_fixtures and fixture_index % 7 == 0
+            starting_at = now - timedelta(minutes=rng.randint(5, 85)) if is_live else now + timedelta(
+                hours=rng.randint(-14 * 24, 21 * 24)
+            )
+            if is_live:
+                live_fixture_ids.append(fixture_id)
+            finished = not is_live and starting_at < now
+
+            refactor["fixtures_refactor"].append({
+                "_id": fixture_id,
+                "league_id": league_id,
+                "league_name": f"League {league_index + 1}",
+                "season_id": season_id,
+                "starting_at": starting_at,
+                "home_team_id": home,
+                "away_team_id": away,
+                "home_team_name": f"Team {home}",
+                "away_team_name": f"Team {away}",
+                "home_team_short_code": f"H{home % 1000:02d}",
+                "away_team_short_code": f"A{away % 1000:02d}",
+                "home_team_image_path": f"https://cdn.example.com/teams/{home}.png",
+                "away_team_image_path": f"https://cdn.example.com/teams/{away}.png",
+                "home_team_score": rng.randint(0, 4) if (is_live or finished) else None,
+                "away_team_score": rng.randint(0, 4) if (is_live or finished) else None,
+                "minutes_elapsed": rng.randint(1, 90) if is_live else None,
+                "is_live": is_live,
+                "is_finished": finished,
+                "number_of_predictions": config.predictions_per_fixture,
+                "created_at": now - timedelta(days=30),
+                "updated_at": now - timedelta(minutes=rng.randint(0, 60)),
+            })
+
+            for prediction_id, name in rng.sample(PREDICTION_DEFINITIONS, min(config.predictions_per_fixture, len(PREDICTION_DEFINITIONS))):
+                refactor[FIXTURE_PREDICTIONS_COLLECTION].append(
+                    _prediction_doc(rng, {"fixture_id": fixture_id, "prediction_type": "fixture"}, prediction_id, name, now)
+                )
+
+            if is_live or finished:
+                commentaries = []
+                for minute in range(1, config.commentaries_per_fixture + 1):
+                    kind, template = rng.choice(COMMENTARY_TEMPLATES)
+                    pct = rng.randint(35, 65)
+                    commentaries.append({
+                        "minute": minute,
+                        "comment": template.format(
+                            home=f"Team {home}", away=f"Team {away}",
+                            team=f"Team {rng.choice([home, away])}", pct=pct, rest=100 - pct,
+                        ),
+                        "type": kind,
+                        "is_goal": kind == "goal",
+                        "team_id": rng.choice([home, away]),
+                    })
+                refactor["commentaries_refactor"].append({
+                    "_id": fixture_id,
+                    "league_id": league_id,
+                    "starting_at": starting_at,
+                    "commentaries": commentaries,
+                })
+
+            refactor["fixture_weather"].append({
+                "fixture_id": fixture_id,
+                "venue_id": home,
+                "created_at": now - timedelta(days=1),
+                "updated_at": now - timedelta(hours=1),
+                "weather_by_hour": {
+                    str(hour): {
+                        "temperature": round(rng.uniform(2, 28), 1),
+                        "humidity": rng.randint(30, 95),
+                        "wind_speed": round(rng.uniform(0, 12), 1),
+                        "conditions": rng.choice(["clear", "clouds", "rain"]),
+                    }
+                    for hour in range(-2, 4)
+                },
+                "fixture_window_start_at": starting_at - timedelta(hours=2),
+                "fixture_window_end_at": starting_at + timedelta(hours=3),
+            })
+            refactor["fixture_statistics"].append({
+                "fixture_id": fixture_id,
+                "created_at": now - timedelta(days=1),
+                "updated_at": now - timedelta(minutes=5),
+                "basic": {
+                    "possession": {"home": rng.randint(35, 65)},
+                    "shots_total": {"home": rng.randint(0, 20), "away": rng.randint(0, 20)},
+                    "corners": {"home": rng.randint(0, 10), "away": rng.randint(0, 10)},
+                },
+                "advanced": {"xg": {"home": round(rng.uniform(0, 3), 2), "away": round(rng.uniform(0, 3), 2)}},
+            })
+
+    # Player predictions for a sample of players
+    for player_id in player_ids[: min(len(player_ids), 500)]:
+        for prediction_id, name in PLAYER_PREDICTION_DEFINITIONS:
+            refactor[PLAYER_PREDICTIONS_COLLECTION].append(
+                _prediction_doc(
+                    rng,
+                    {"player_id": player_id, "fixture_id": rng.choice(fixture_ids), "prediction_type": "player_match"},
+                    prediction_id,
+                    name,
+                    now,
+                )
+            )
+
+    # Smart combo: four upcoming fixtures, three predictions each
+    combo_id = 1
+    upcoming = [doc["_id"] for doc in refactor["fixtures_refactor"] if doc["starting_at"] > now][:4]
+    refactor["smart_combos"].append({
+        "combo_id": combo_id,
+        "name": "Weekend Combo",
+        "description": "Four-leg combo for the weekend",
+        "starts_at": now - timedelta(hours=1),
+        "expires_at": now + timedelta(days=3),
+        "confidence": 71.5,
+        "total_odds": 6.4,
+        "fixture_ids": upcoming,
+        "is_active": True,
+        "previous_week_combo_accuracy": 66.7,
+    })
+    for fixture_id in upcoming:
+        for prediction_id, name in rng.sample(PREDICTION_DEFINITIONS, 3):
+            doc = _prediction_doc(rng, {"fixture_id": fixture_id, "combo_id": combo_id, "prediction_type": "smart_combo"}, prediction_id, name, now)
+            refactor["smart_combo_predictions"].append(doc)
+            primary["temp_smart_combo_predictions"].append(dict(doc))
+
+    # Watchlist: one document per day, last day deliberately missing to exercise the fallback
+    for offset in range(1, config.watchlist_days + 1):
+        day_date = now - timedelta(days=offset)
+        entry = {
+            "year": day_date.year,
+            "day": day_date.timetuple().tm_yday,
+            "created_at": day_date,
+            "updated_at": day_date,
+            "player_ids": rng.sample(player_ids, 20),
+        }
+        refactor["players_watchlist_temp"].append(entry)
+    primary["temp_players_watchlist"].append({
+        "year": 2024,
+        "day": 16,
+        "created_at": now,
+        "updated_at": now,
+        "player_ids": rng.sample(player_ids, 20),
+    })
+
+    return SeedData(
+        collections={REFACTOR_DB: refactor, PRIMARY_DB: primary},
+        fixture_ids=fixture_ids,
+        live_fixture_ids=live_fixture_ids,
+        league_seasons=league_seasons,
+        player_ids=player_ids,
+        combo_id=combo_id,
+    )
@@ -0,0 +1,323 @@
+"""
+SSE connection scale benchmark.
+
+Runs one API worker (app.main:app on uvicorn, with the mongomock-motor / fakeredis
+stand-ins from benchmarks.load_harness) in a child process together with simulated
+publishers. The parent opens thousands of /fixtures/stream and
+/fixtures/{fixture_id}/predictions/stream clients, then the child publishes
+fixture_updates:{id} and prediction_updates:{id} at live-match rates.
+
+Reported per run:
+- fan-out latency (publish to client receive) p50/p95/p99, per stream
+- worker RSS before and after connecting, and RSS per connection
+- worker CPU seconds and CPU utilisation during the publish phase
+- delivered vs expected events
+
+The worker is measured in isolation because client-side memory would otherwise be
+counted against it.
+
+    python -m benchmarks.sse_benchmark --clients 2000 --duration 30
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import resource
+import sys
+import time
+from typing import Any, Dict, List
+
+import httpx
+
+from benchmarks.load_harness import (
+    install_stand_ins,
+    read_sse_events,
+    seed_mongo,
+    start_local_server,
+    stop_local_server,
+    summarize_latencies,
+)
+from benchmarks.seed_data import SeedConfig, build_seed_data
+
+# Clients opened per ramp step, and pause between steps
+RAMP_BATCH_SIZE = 200
+RAMP_PAUSE_SECONDS = 0.2
+# Seconds to wait for every subscription to register before publishing
+SUBSCRIBE_TIMEOUT_SECONDS = 60.0
+
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process (Linux /proc, falling back to peak RSS)."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def raise_file_limit() -> None:
+    """Thousands of sockets need more than the default 1024 descriptors."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+# ---------------------------------------------------------------------------
+# Worker process: API server plus simulated publishers
+# ---------------------------------------------------------------------------
+
+
+async def _count_subscribers(redis_client: Any, channels: List[str]) -> int:
+    counts = await redis_client.pubsub_numsub(*channels)
+    return sum(count for _, count in counts)
+
+
+async def _publish(
+    redis_client: Any,
+    fixture_ids: List[int],
+    duration_seconds: float,
+    fixture_rate: float,
+    prediction_rate: float,
+    payload_bytes: int,
+) -> Dict[str, int]:
+    """Publish to every fixture's channels at the given per-channel rates for duration_seconds."""
+    padding = "x" * max(0, payload_bytes - 80)
+    published = {"fixtures": 0, "predictions": 0}
+
+    async def publisher(channel_prefix: str, stream: str, fixture_id: int, rate: float) -> None:
+        if rate <= 0:
+            return
+        interval = 1.0 / rate
+        # Stagger channels so publishes do not all land on the same tick
+        await asyncio.sleep((fixture_id % 97) / 97 * interval)
+        deadline = time.perf_counter() + duration_seconds
+        sequence = 0
+        while time.perf_counter() < deadline:
+            payload = json.dumps(
+                {"fixture_id": fixture_id, "sequence": sequence, "sent_at": time.time(), "padding": padding}
+            )
+            await redis_client.publish(f"{channel_prefix}:{fixture_id}", payload)
+            published[stream] += 1
+            sequence += 1
+            await asyncio.sleep(interval)
+
+    await asyncio.gather(
+        *(publisher("fixture_updates", "fixtures", fixture_id, fixture_rate) for fixture_id in fixture_ids),
+        *(publisher("prediction_updates", "predictions", fixture_id, prediction_rate) for fixture_id in fixture_ids),
+    )
+    return published
+
+
+async def _worker_main(connection: Any, options: Dict[str, Any]) -> None:
+    from fakeredis import aioredis as fake_aioredis
+    from mongomock_motor import AsyncMongoMockClient
+
+    raise_file_limit()
+    seed = build_seed_data(SeedConfig(seed=options["seed"], live_fixtures=options["fixtures"]))
+    mongo_client = AsyncMongoMockClient()
+    await seed_mongo(mongo_client, seed)
+    redis_client = fake_aioredis.FakeRedis(decode_responses=True)
+    app = install_stand_ins(mongo_client, redis_client)
+    server, server_task = await start_local_server(app, options["port"])
+
+    loop = asyncio.get_running_loop()
+    fixture_ids = seed.live_fixture_ids
+    channels = [f"fixture_updates:{fid}" for fid in fixture_ids] + [
+        f"prediction_updates:{fid}" for fid in fixture_ids
+    ]
+    connection.send({"ready": True, "fixture_ids": fixture_ids, "rss_bytes": current_rss_bytes()})
+
+    try:
+        while True:
+            command = await loop.run_in_executor(None, connection.recv)
+            if command["op"] == "wait_subscribers":
+                deadline = time.perf_counter() + SUBSCRIBE_TIMEOUT_SECONDS
+                subscribers = await _count_subscribers(redis_client, channels)
+                while subscribers < command["expected"] and time.perf_counter() < deadline:
+                    await asyncio.sleep(0.2)
+                    subscribers = await _count_subscribers(redis_client, channels)
+                connection.send({"subscribers": subscribers, "rss_bytes": current_rss_bytes()})
+            elif command["op"] == "publish":
+                cpu_started, wall_started = cpu_seconds(), time.perf_counter()
+                published = await _publish(
+                    redis_client,
+                    fixture_ids,
+                    command["duration"],
+                    command["fixture_rate"],
+                    command["prediction_rate"],
+                    command["payload_bytes"],
+                )
+                # Let in-flight events drain before sampling CPU
+                await asyncio.sleep(1.0)
+                connection.send(
+                    {
+                        "published": published,
+                        "cpu_seconds": cpu_seconds() - cpu_started,
+                        "wall_seconds": time.perf_counter() - wall_started,
+                        "rss_bytes": current_rss_bytes(),
+                    }
+                )
+            elif command["op"] == "stop":
+                break
+    finally:
+        await stop_local_server(server, server_task)
+
+
+def _worker_entry(connection: Any, options: Dict[str, Any]) -> None:
+    asyncio.run(_worker_main(connection, options))
+
+
+# ---------------------------------------------------------------------------
+# Client side
+# ---------------------------------------------------------------------------
+
+
+class _StreamStats:
+    def __init__(self) -> None:
+        self.latencies_ms: List[float] = []
+        self.connected = 0
+        self.failed = 0
+
+    def on_event(self, event: str, data: str) -> None:
+        try:
+            sent_at = json.loads(data)["sent_at"]
+        except (ValueError, KeyError, TypeError):
+            return
+        self.latencies_ms.append((time.time() - sent_at) * 1000)
+
+
+async def _open_client(client: httpx.AsyncClient, url: str, stats: _StreamStats) -> None:
+    try:
+        async with client.stream("GET", url, timeout=None) as response:
+            if response.status_code != 200:
+                stats.failed += 1
+                return
+            stats.connected += 1
+            await read_sse_events(response, stats.on_event)
+    except asyncio.CancelledError:
+        raise
+    except httpx.HTTPError:
+        stats.failed += 1
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    raise_file_limit()
+    parent, child = multiprocessing.Pipe()
+    options = {"seed": args.seed, "fixtures": args.fixtures, "port": args.port}
+    process = multiprocessing.get_context("spawn").Process(target=_worker_entry, args=(child, options), daemon=True)
+    process.start()
+    loop = asyncio.get_running_loop()
+
+    ready = await loop.run_in_executor(None, parent.recv)
+    fixture_ids: List[int] = ready["fixture_ids"]
+    baseline_rss = ready["rss_bytes"]
+
+    prediction_clients = int(args.clients * args.prediction_share)
+    fixture_clients = args.clients - prediction_clients
+    streams = {"fixtures": _StreamStats(), "predictions": _StreamStats()}
+    urls = [
+        ("fixtures", f"/api/v1/fixtures/stream?fixture_ids={fixture_ids[index % len(fixture_ids)]}")
+        for index in range(fixture_clients)
+    ] + [
+        ("predictions", f"/api/v1/fixtures/{fixture_ids[index % len(fixture_ids)]}/predictions/stream")
+        for index in range(prediction_clients)
+    ]
+
+    limits = httpx.Limits(max_connections=args.clients + 10, max_keepalive_connections=0)
+    tasks: List[asyncio.Task] = []
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits) as client:
+        ramp_started = time.perf_counter()
+        for offset in range(0, len(urls), RAMP_BATCH_SIZE):
+            for stream, url in urls[offset:offset + RAMP_BATCH_SIZE]:
+                tasks.append(asyncio.create_task(_open_client(client, url, streams[stream])))
+            await asyncio.sleep(RAMP_PAUSE_SECONDS)
+
+        parent.send({"op": "wait_subscribers", "expected": len(urls)})
+        subscribed = await loop.run_in_executor(None, parent.recv)
+        ramp_seconds = time.perf_counter() - ramp_started
+
+        parent.send(
+            {
+                "op": "publish",
+                "duration": args.duration,
+                "fixture_rate": args.fixture_rate,
+                "prediction_rate": args.prediction_rate,
+                "payload_bytes": args.payload_bytes,
+            }
+        )
+        published = await loop.run_in_executor(None, parent.recv)
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    parent.send({"op": "stop"})
+    process.join(timeout=10)
+
+    connected = subscribed["subscribers"]
+    connection_rss = subscribed["rss_bytes"] - baseline_rss
+    expected = {
+        "fixtures": published["published"]["fixtures"] * fixture_clients / max(1, len(fixture_ids)),
+        "predictions": published["published"]["predictions"] * prediction_clients / max(1, len(fixture_ids)),
+    }
+    report: Dict[str, Any] = {
+        "clients": args.clients,
+        "subscribed": connected,
+        "ramp_seconds": round(ramp_seconds, 2),
+        "live_fixtures": len(fixture_ids),
+        "worker_rss_baseline_mb": round(baseline_rss / 2**20, 1),
+        "worker_rss_connected_mb": round(subscribed["rss_bytes"] / 2**20, 1),
+        "worker_rss_per_connection_kb": round(connection_rss / max(1, connected) / 1024, 1),
+        "worker_cpu_seconds": round(published["cpu_seconds"], 2),
+        "worker_cpu_utilisation": round(published["cpu_seconds"] / published["wall_seconds"], 3),
+        "streams": {},
+    }
+    for stream, stats in streams.items():
+        report["streams"][stream] = {
+            "connected": stats.connected,
+            "failed": stats.failed,
+            "published": published["published"][stream],
+            "events_expected": int(expected[stream]),
+            "events_received": len(stats.latencies_ms),
+            **summarize_latencies(stats.latencies_ms),
+        }
+    return report
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="SSE connection scale benchmark")
+    parser.add_argument("--clients", type=int, default=2000, help="Total SSE connections.")
+    parser.add_argument("--prediction-share", type=float, default=0.5, help="Share of clients on the predictions stream.")
+    parser.add_argument("--fixtures", type=int, default=8, help="Live fixtures (one channel pair each).")
+    parser.add_argument("--fixture-rate", type=float, default=1.0, help="fixture_updates messages/s per fixture.")
+    parser.add_argument("--prediction-rate", type=float, default=0.2, help="prediction_updates messages/s per fixture.")
+    parser.add_argument("--payload-bytes", type=int, default=512, help="Approximate message size.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Publish phase length in seconds.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--port", type=int, default=8766, help="Port for the worker process.")
+    parser.add_argument("--json", dest="json_path", help="Write the report as JSON to this path.")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    report = asyncio.run(run_benchmark(args))
+    print(json.dumps(report, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as handle:
+            json.dump(report, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
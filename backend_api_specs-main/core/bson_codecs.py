@@ -0,0 +1,63 @@
+import os
+from typing import Any, Dict
+
+from bson import ObjectId
+from bson.codec_options import TypeDecoder, TypeRegistry
+
+from app.core.monitoring import get_logger
+
+logger = get_logger(__name__)
+
+
+class ObjectIdStringDecoder(TypeDecoder):
+    """Decode BSON ObjectId values straight to their 24-character hex string."""
+
+    bson_type = ObjectId
+
+    def transform_bson(self, value: ObjectId) -> str:
+        return str(value)
+
+
+# Registry applied to read-only handles: documents come off the wire with string ids, so
+# routers and schemas use them as-is instead of copying each document to stringify _id
+STRING_ID_TYPE_REGISTRY = TypeRegistry([ObjectIdStringDecoder()])
+
+# Set MONGO_STRING_ID_CODEC=false for drivers/mocks that cannot take a custom type registry
+STRING_ID_CODEC_ENABLED = os.getenv("MONGO_STRING_ID_CODEC", "true").lower() == "true"
+
+# Handles already configured, keyed by (client id, database name)
+_string_id_databases: Dict[Any, Any] = {}
+_unsupported_logged = False
+
+
+def string_id_database(database: Any) -> Any:
+    """
+    Return `database` with ObjectId values decoded as strings.
+
+    Only use the returned handle for reads whose documents are serialised to clients:
+    writing a fetched document back would store its _id as a string. Drivers that do not
+    support custom type registries (or MONGO_STRING_ID_CODEC=false) get the original
+    handle back.
+    """
+    global _unsupported_logged
+
+    if not STRING_ID_CODEC_ENABLED:
+        return database
+    key = (id(database.client), database.name)
+    configured = _string_id_databases.get(key)
+    if configured is not None:
+        return configured
+    try:
+        configured = database.with_options(
+            codec_options=database.codec_options.with_options(type_registry=STRING_ID_TYPE_REGISTRY)
+        )
+    except (NotImplementedError, TypeError, AttributeError) as exc:
+        if not _unsupported_logged:
+            _unsupported_logged = True
+            logger.warning(
+                "Database driver does not support the string id codec",
+                extra={"database": getattr(database, "name", None), "error": str(exc)},
+            )
+        return database
+    _string_id_databases[key] = configured
+    return configured
@@ -0,0 +1,64 @@
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.schemas.predictions_schemas import ColumnarPredictionList
+
+# Entity ID columns emitted when present on the documents
+_ID_COLUMNS = ("fixture_id", "player_id", "combo_id")
+_NAN = float("nan")
+
+
+def _nullable(column: array) -> List[Optional[float]]:
+    # NaN marks a missing value in the float buffers
+    return [value if value == value else None for value in column]
+
+
+def _float_or_nan(value: Any) -> float:
+    return _NAN if value is None else float(value)
+
+
+def build_prediction_columns(
+    documents: Iterable[Dict[str, Any]],
+    catalogue_version: Optional[str] = None,
+) -> ColumnarPredictionList:
+    """
+    Pack prediction documents into parallel typed arrays.
+
+    Columns are filled into array.array buffers (int64 / float64) straight from the raw
+    documents, so no per-item model is built or validated. The result is created with
+    model_construct for the same reason; values are already typed by the buffers.
+    """
+    prediction_ids = array("q")
+    pre_game = array("d")
+    live = array("d")
+    pct_change = array("d")
+    id_columns: Dict[str, array] = {name: array("q") for name in _ID_COLUMNS}
+    present = {name: True for name in _ID_COLUMNS}
+
+    for doc in documents:
+        prediction_ids.append(int(doc["prediction_id"]))
+        pre_game.append(_float_or_nan(doc.get("pre_game_prediction")))
+        live.append(_float_or_nan(doc.get("prediction")))
+        pct_change.append(_float_or_nan(doc.get("pct_change_value")))
+        for name in _ID_COLUMNS:
+            if not present[name]:
+                continue
+            value = doc.get(name)
+            if value is None:
+                # Only emit ID columns every document has
+                present[name] = False
+            else:
+                id_columns[name].append(int(value))
+
+    count = len(prediction_ids)
+    return ColumnarPredictionList.model_construct(
+        catalogue_version=catalogue_version,
+        count=count,
+        prediction_id=prediction_ids.tolist(),
+        fixture_id=id_columns["fixture_id"].tolist() if present["fixture_id"] and count else None,
+        player_id=id_columns["player_id"].tolist() if present["player_id"] and count else None,
+        combo_id=id_columns["combo_id"].tolist() if present["combo_id"] and count else None,
+        pre_game_prediction=_nullable(pre_game),
+        prediction=_nullable(live),
+        pct_change_value=_nullable(pct_change),
+    )
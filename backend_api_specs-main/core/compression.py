@@ -0,0 +1,231 @@
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Content types worth compressing
+COMPRESSIBLE_CONTENT_TYPES = (b"application/json", b"application/msgpack", b"text/")
+# SSE compressors live for the whole connection, so they use a 4KB window and a small
+# hash table (~32KB per stream instead of ~260KB with zlib defaults)
+SSE_GZIP_LEVEL = 6
+SSE_GZIP_WBITS = 16 + 12
+SSE_GZIP_MEM_LEVEL = 5
+# gzip container for REST bodies (16 + MAX_WBITS)
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    """Per-route compression settings. min_size is the body size below which nothing is compressed."""
+
+    min_size: int = 1024
+    gzip_level: int = 6
+    brotli_quality: int = 5
+
+
+DEFAULT_COMPRESSION_POLICY = CompressionPolicy()
+
+# List routes: large, repetitive bodies, so compress from 512 bytes at the default
+# levels. These are starting values, not per-route measurements; tune them with
+# benchmarks/encoding_benchmark.py against real payloads.
+LIST_COMPRESSION_POLICY = CompressionPolicy(min_size=512)
+
+COMPRESSION_ROUTE_POLICIES: Dict[str, CompressionPolicy] = {
+    "/api/v1/fixtures": LIST_COMPRESSION_POLICY,
+    "/api/v1/fixtures/{fixture_id}/predictions": LIST_COMPRESSION_POLICY,
+    "/api/v1/fixtures/predictions": LIST_COMPRESSION_POLICY,
+    "/api/v1/fixtures/predictions/bulk": LIST_COMPRESSION_POLICY,
+    "/api/v1/leagues/{league_id}/fixtures": LIST_COMPRESSION_POLICY,
+    "/api/v1/players/predictions": LIST_COMPRESSION_POLICY,
+    "/api/v1/predictions/smart-combos": LIST_COMPRESSION_POLICY,
+    # Commentary is long, append-only text: spend a little more CPU for bytes
+    "/api/v1/fixtures/{fixture_id}/commentary": CompressionPolicy(min_size=1024, gzip_level=6, brotli_quality=6),
+    # Small documents: not worth the CPU below a few KB
+    "/api/v1/fixtures/{fixture_id}/weather": CompressionPolicy(min_size=4096, gzip_level=4, brotli_quality=4),
+}
+
+
+def parse_quality_values(header: str) -> Dict[str, float]:
+    """Map each value of an Accept / Accept-Encoding style header to its q-value (default 1)."""
+    codings: Dict[str, float] = {}
+    for part in header.split(","):
+        pieces = [piece.strip() for piece in part.split(";")]
+        if not pieces[0]:
+            continue
+        quality = 1.0
+        for parameter in pieces[1:]:
+            if parameter.startswith("q="):
+                try:
+                    quality = float(parameter[2:])
+                except ValueError:
+                    quality = 0.0
+        codings[pieces[0].lower()] = quality
+    return codings
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its q-value."""
+    return parse_quality_values(header)
+
+
+def select_encoding(header: str, streaming: bool = False) -> Optional[str]:
+    """Pick br or gzip from Accept-Encoding. SSE streams always use gzip for its cheap sync flush."""
+    codings = parse_accept_encoding(header)
+    wildcard = codings.get("*", 0.0)
+    brotli_q = codings.get("br", wildcard) if brotli is not None and not streaming else 0.0
+    gzip_q = codings.get("gzip", wildcard)
+    if brotli_q <= 0 and gzip_q <= 0:
+        return None
+    return "br" if brotli_q >= gzip_q and brotli_q > 0 else "gzip"
+
+
+class _StreamCompressor:
+    """Incremental compressor that flushes after every chunk so each chunk is decodable on arrival."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int, sse: bool):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+            self._zlib = None
+        elif sse:
+            self._brotli = None
+            self._zlib = zlib.compressobj(SSE_GZIP_LEVEL, zlib.DEFLATED, SSE_GZIP_WBITS, SSE_GZIP_MEM_LEVEL)
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, _GZIP_WBITS)
+
+    def compress(self, chunk: bytes, final: bool) -> bytes:
+        if self._brotli is not None:
+            data = self._brotli.process(chunk)
+            return data + (self._brotli.finish() if final else self._brotli.flush())
+        data = self._zlib.compress(chunk)
+        return data + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def compress_body(body: bytes, encoding: str, policy: CompressionPolicy) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=policy.brotli_quality)
+    compressor = zlib.compressobj(policy.gzip_level, zlib.DEFLATED, _GZIP_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware negotiating gzip / brotli for REST responses and gzip for SSE streams.
+
+    - Buffered responses are compressed in one shot when the body is at least the route's
+      min_size (COMPRESSION_ROUTE_POLICIES, keyed by route template).
+    - text/event-stream responses get one compressor per connection, flushed with
+      Z_SYNC_FLUSH after every event, so events arrive immediately and repeated keys
+      across events are back-references into the shared window.
+    - Responses that already carry Content-Encoding, or non-compressible content types,
+      pass through untouched.
+    """
+
+    def __init__(self, app, policies: Optional[Dict[str, CompressionPolicy]] = None):
+        self.app = app
+        self.policies = COMPRESSION_ROUTE_POLICIES if policies is None else policies
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        if not accept_encoding:
+            await self.app(scope, receive, send)
+            return
+
+        state = {"start": None, "mode": None, "compressor": None, "policy": None, "encoding": None}
+
+        async def send_wrapper(message):
+            message_type = message["type"]
+            if message_type == "http.response.start":
+                headers = list(message.get("headers", []))
+                content_type = _header(headers, b"content-type") or b""
+                if _header(headers, b"content-encoding") is not None or not content_type.startswith(
+                    COMPRESSIBLE_CONTENT_TYPES
+                ):
+                    state["mode"] = "passthrough"
+                    await send(message)
+                    return
+
+                is_event_stream = content_type.startswith(b"text/event-stream")
+                encoding = select_encoding(accept_encoding, streaming=is_event_stream)
+                if encoding is None:
+                    state["mode"] = "passthrough"
+                    await send(message)
+                    return
+
+                route = scope.get("route")
+                state["policy"] = self.policies.get(getattr(route, "path", None), DEFAULT_COMPRESSION_POLICY)
+                state["encoding"] = encoding
+                state["mode"] = "sse" if is_event_stream else "pending"
+                state["start"] = message
+                if is_event_stream:
+                    state["compressor"] = _StreamCompressor(encoding, 0, 0, sse=True)
+                    await send(self._compressed_start(message, encoding, streaming=True))
+                return
+
+            if message_type != "http.response.body" or state["mode"] == "passthrough":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if state["mode"] == "pending":
+                if not more_body:
+                    # Buffered response: compress in one shot if large enough
+                    if len(body) < state["policy"].min_size:
+                        await send(state["start"])
+                        await send(message)
+                    else:
+                        compressed = compress_body(body, state["encoding"], state["policy"])
+                        await send(self._compressed_start(state["start"], state["encoding"], len(compressed)))
+                        await send({"type": "http.response.body", "body": compressed, "more_body": False})
+                    state["mode"] = "done"
+                    return
+                # Streaming (non-SSE) response
+                state["mode"] = "stream"
+                state["compressor"] = _StreamCompressor(
+                    state["encoding"], state["policy"].gzip_level, state["policy"].brotli_quality, sse=False
+                )
+                await send(self._compressed_start(state["start"], state["encoding"], streaming=True))
+
+            compressed = state["compressor"].compress(body, final=not more_body)
+            if compressed or not more_body:
+                await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _compressed_start(
+        message, encoding: str, content_length: Optional[int] = None, streaming: bool = False
+    ):
+        headers = [
+            (name, value)
+            for name, value in message.get("headers", [])
+            if name.lower() not in (b"content-length", b"vary")
+        ]
+        vary = _header(message.get("headers", []), b"vary")
+        headers.append((b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"))
+        headers.append((b"content-encoding", encoding.encode()))
+        if content_length is not None and not streaming:
+            headers.append((b"content-length", str(content_length).encode()))
+        return {**message, "headers": headers}
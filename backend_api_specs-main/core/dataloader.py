@@ -0,0 +1,109 @@
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Iterator, List, Optional
+
+# Upper bound on keys per batch call (e.g. the size of one $in)
+DATALOADER_MAX_BATCH_SIZE = 500
+
+BatchFunction = Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+
+# Loaders of the current scope by name; None outside loader_scope()
+_scope_loaders: ContextVar[Optional[Dict[str, "DataLoader"]]] = ContextVar("dataloader_scope", default=None)
+
+
+class DataLoader:
+    """
+    Batches and deduplicates key lookups issued in the same event loop tick.
+
+    load(key) queues the key and returns its value once the batch function has run. The
+    first load of a tick schedules the dispatch with loop.call_soon, so every coroutine
+    that is ready in that tick (typically the branches of one asyncio.gather) adds its
+    keys before batch_fn(keys) is called once. Results are memoised for the lifetime of
+    the loader: within a loader_scope(), a key is fetched at most once. Failed batches
+    are not memoised.
+
+    batch_fn returns a dict of the keys it found; absent keys resolve to None.
+    """
+
+    def __init__(self, batch_fn: BatchFunction, max_batch_size: int = DATALOADER_MAX_BATCH_SIZE):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.batch_count = 0
+        self._futures: Dict[Hashable, asyncio.Future] = {}
+        self._queue: List[Hashable] = []
+
+    def _dispatch(self) -> None:
+        queue, self._queue = self._queue, []
+        for start in range(0, len(queue), self.max_batch_size):
+            asyncio.ensure_future(self._run_batch(queue[start:start + self.max_batch_size]))
+
+    async def _run_batch(self, keys: List[Hashable]) -> None:
+        self.batch_count += 1
+        try:
+            results = await self.batch_fn(keys)
+        except Exception as exc:
+            for key in keys:
+                future = self._futures.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(exc)
+            return
+        for key in keys:
+            future = self._futures.get(key)
+            if future is not None and not future.done():
+                future.set_result(results.get(key))
+
+    async def load(self, key: Hashable) -> Optional[Any]:
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[key] = future
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                loop.call_soon(self._dispatch)
+        # A cancelled caller must not cancel the lookup other callers share
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """Values for the keys that were found, keyed as requested."""
+        keys = list(dict.fromkeys(keys))
+        values = await asyncio.gather(*(self.load(key) for key in keys))
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def prime(self, key: Hashable, value: Any) -> None:
+        """Record a value already at hand so later loads of key do not query for it."""
+        if key in self._futures or value is None:
+            return
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self._futures[key] = future
+
+
+@contextmanager
+def loader_scope() -> Iterator[None]:
+    """
+    Scope (usually one request or one response build) sharing loaders by name.
+
+    Nested scopes reuse the outer one. Tasks started inside the scope (asyncio.gather,
+    create_task) inherit it.
+    """
+    if _scope_loaders.get() is not None:
+        yield
+        return
+    token = _scope_loaders.set({})
+    try:
+        yield
+    finally:
+        _scope_loaders.reset(token)
+
+
+def get_loader(name: str, batch_fn: BatchFunction) -> DataLoader:
+    """The scope's loader called name, created on first use; outside a scope, a new loader."""
+    loaders = _scope_loaders.get()
+    if loaders is None:
+        return DataLoader(batch_fn)
+    loader = loaders.get(name)
+    if loader is None:
+        loader = loaders[name] = DataLoader(batch_fn)
+    return loader
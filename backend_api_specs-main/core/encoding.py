@@ -0,0 +1,73 @@
+from typing import Any, Union
+
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from app.core.compression import parse_quality_values
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; clients fall back to JSON
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+# Values accepted by ?format= on prediction list routes
+PREDICTION_FORMATS = ("full", "compact", "columnar")
+# Accept values treated as a request for MessagePack
+_MSGPACK_ACCEPT_TYPES = ("application/msgpack", "application/x-msgpack")
+
+
+def wants_msgpack(request: Request) -> bool:
+    """
+    True when msgpack is installed and the Accept header names a MessagePack type with a
+    q-value above 0 and at least that of JSON (wildcards only count towards JSON).
+    """
+    if msgpack is None:
+        return False
+    qualities = parse_quality_values(request.headers.get("accept", ""))
+    msgpack_q = max((qualities.get(media_type, 0.0) for media_type in _MSGPACK_ACCEPT_TYPES), default=0.0)
+    if msgpack_q <= 0:
+        return False
+    json_q = qualities.get("application/json", qualities.get("application/*", qualities.get("*/*", 0.0)))
+    return msgpack_q >= json_q
+
+
+def encode_msgpack(payload: BaseModel, exclude_none: bool = False) -> bytes:
+    """Serialise a response model the same way the JSON path does (aliases, ISO datetimes)."""
+    return msgpack.packb(
+        payload.model_dump(mode="json", by_alias=True, exclude_none=exclude_none),
+        use_bin_type=True,
+    )
+
+
+def negotiate_response(request: Request, payload: Any, exclude_none: bool = False) -> Union[Any, Response]:
+    """
+    Return a MessagePack Response if the client accepts it, otherwise the payload unchanged
+    (FastAPI then validates and renders it as JSON through the route's response_model).
+
+    exclude_none drops null fields from the rendered body; compact formats use it since
+    their omitted fields are meaningful (e.g. "same as the catalogue").
+    """
+    if not isinstance(payload, BaseModel):
+        return payload
+    if wants_msgpack(request):
+        return Response(
+            content=encode_msgpack(payload, exclude_none=exclude_none),
+            media_type=MSGPACK_MEDIA_TYPE,
+            headers={"Vary": "Accept"},
+        )
+    if exclude_none:
+        return JSONResponse(content=payload.model_dump(mode="json", by_alias=True, exclude_none=True))
+    return payload
+
+
+def resolve_prediction_format(value: str) -> str:
+    """Validate ?format= for prediction list routes."""
+    normalized = (value or "full").lower()
+    if normalized not in PREDICTION_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"format must be one of: {', '.join(PREDICTION_FORMATS)}.",
+        )
+    return normalized
@@ -0,0 +1,264 @@
+import inspect
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import bson
+
+from app.core.metrics import current_route, record_mongo_operation
+from app.core.query_observer import SLOW_QUERY_THRESHOLD_MS, QueryObserver
+
+# Share of queries whose result size is measured (re-encoding every document doubles the
+# serialisation work); slow queries whose documents are at hand are always measured
+QUERY_BYTES_SAMPLE_RATE = 0.01
+
+# Cursor methods that return the cursor itself and can be chained
+_CHAINABLE_CURSOR_METHODS = frozenset(
+    {"sort", "limit", "skip", "batch_size", "max_time_ms", "hint", "collation", "allow_disk_use"}
+)
+
+# Collection methods that issue a single awaited round trip
+_AWAITED_OPERATIONS = frozenset(
+    {
+        "find_one",
+        "count_documents",
+        "estimated_document_count",
+        "distinct",
+        "insert_one",
+        "insert_many",
+        "replace_one",
+        "update_one",
+        "update_many",
+        "delete_one",
+        "delete_many",
+        "find_one_and_update",
+        "find_one_and_replace",
+        "find_one_and_delete",
+        "bulk_write",
+    }
+)
+
+# Operations whose first positional argument is a filter document
+_FILTER_OPERATIONS = frozenset(
+    {
+        "find_one",
+        "count_documents",
+        "replace_one",
+        "update_one",
+        "update_many",
+        "delete_one",
+        "delete_many",
+        "find_one_and_update",
+        "find_one_and_replace",
+        "find_one_and_delete",
+    }
+)
+
+
+def _is_collection(value: Any) -> bool:
+    return hasattr(value, "find") and hasattr(value, "aggregate") and hasattr(value, "find_one")
+
+
+def _sample_bytes() -> bool:
+    return random.random() < QUERY_BYTES_SAMPLE_RATE
+
+
+def _document_size(document: Any) -> int:
+    if isinstance(document, dict):
+        try:
+            return len(bson.encode(document))
+        except Exception:
+            return 0
+    return 0
+
+
+def _normalize_sort(args: tuple, kwargs: Dict[str, Any]) -> Any:
+    """Turn cursor.sort(...) arguments into a list of (key, direction) pairs."""
+    key_or_list = args[0] if args else kwargs.get("key_or_list")
+    if isinstance(key_or_list, str):
+        direction = args[1] if len(args) > 1 else kwargs.get("direction", 1)
+        return [(key_or_list, direction)]
+    return key_or_list
+
+
+class InstrumentedCursor:
+    """
+    Wraps a find/aggregate cursor and reports time and documents fetched.
+
+    Bytes are measured for a QUERY_BYTES_SAMPLE_RATE sample of cursors, and for slow
+    to_list() calls.
+    """
+
+    def __init__(
+        self,
+        cursor: Any,
+        collection_name: str,
+        operation: str,
+        filter_doc: Optional[Dict[str, Any]] = None,
+        projection: Any = None,
+        sort: Any = None,
+        pipeline: Optional[List[Dict[str, Any]]] = None,
+    ):
+        self._cursor = cursor
+        self._collection_name = collection_name
+        self._operation = operation
+        self._filter = filter_doc
+        self._projection = projection
+        self._sort = sort
+        self._pipeline = pipeline
+        self._elapsed = 0.0
+        self._documents = 0
+        self._bytes: Optional[int] = 0 if _sample_bytes() else None
+        self._recorded = False
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._cursor, name)
+        if name in _CHAINABLE_CURSOR_METHODS:
+            def _chain(*args, **kwargs):
+                if name == "sort":
+                    self._sort = _normalize_sort(args, kwargs)
+                self._cursor = attr(*args, **kwargs)
+                return self
+            return _chain
+        return attr
+
+    def _record(self) -> None:
+        if self._recorded:
+            return
+        self._recorded = True
+        record_mongo_operation(self._collection_name, self._operation, self._elapsed)
+        QueryObserver.record(
+            collection=self._collection_name,
+            operation=self._operation,
+            duration_ms=self._elapsed * 1000,
+            documents=self._documents,
+            size_bytes=self._bytes,
+            filter_doc=self._filter,
+            sort=self._sort,
+            projection=self._projection,
+            pipeline=self._pipeline,
+            route=current_route(),
+        )
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        iterator = self._cursor.__aiter__()
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    document = await iterator.__anext__()
+                except StopAsyncIteration:
+                    self._elapsed += time.perf_counter() - started
+                    break
+                self._elapsed += time.perf_counter() - started
+                self._documents += 1
+                if self._bytes is not None:
+                    self._bytes += _document_size(document)
+                yield document
+        finally:
+            self._record()
+
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        started = time.perf_counter()
+        documents: List[Dict[str, Any]] = []
+        try:
+            documents = await self._cursor.to_list(length)
+            return documents
+        finally:
+            self._elapsed += time.perf_counter() - started
+            self._documents += len(documents)
+            if self._bytes is None and self._elapsed * 1000 >= SLOW_QUERY_THRESHOLD_MS:
+                self._bytes = 0
+            if self._bytes is not None:
+                self._bytes += sum(_document_size(document) for document in documents)
+            self._record()
+
+
+class InstrumentedCollection:
+    """
+    Thin wrapper around a collection handle.
+
+    Every operation is reported to app.core.metrics (per-request counters) and
+    app.core.query_observer (per-shape slow-query report).
+    """
+
+    def __init__(self, collection: Any):
+        self._collection = collection
+        self._name = getattr(collection, "name", "unknown")
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._collection, name)
+        if name in _AWAITED_OPERATIONS:
+            async def _timed(*args, **kwargs):
+                started = time.perf_counter()
+                result = None
+                try:
+                    result = await attr(*args, **kwargs)
+                    return result
+                finally:
+                    elapsed = time.perf_counter() - started
+                    record_mongo_operation(self._name, name, elapsed)
+                    filter_doc = None
+                    if name in _FILTER_OPERATIONS:
+                        filter_doc = args[0] if args else kwargs.get("filter")
+                    is_document = isinstance(result, dict)
+                    measured = is_document and (elapsed * 1000 >= SLOW_QUERY_THRESHOLD_MS or _sample_bytes())
+                    QueryObserver.record(
+                        collection=self._name,
+                        operation=name,
+                        duration_ms=elapsed * 1000,
+                        documents=1 if is_document else 0,
+                        size_bytes=_document_size(result) if measured else None,
+                        filter_doc=filter_doc,
+                        sort=kwargs.get("sort"),
+                        projection=args[1] if name == "find_one" and len(args) > 1 else kwargs.get("projection"),
+                        route=current_route(),
+                    )
+            return _timed
+        return attr
+
+    def find(self, *args, **kwargs) -> InstrumentedCursor:
+        return InstrumentedCursor(
+            self._collection.find(*args, **kwargs),
+            self._name,
+            "find",
+            filter_doc=args[0] if args else kwargs.get("filter"),
+            projection=args[1] if len(args) > 1 else kwargs.get("projection"),
+            sort=kwargs.get("sort"),
+        )
+
+    async def aggregate(self, pipeline: List[Dict[str, Any]], *args, **kwargs) -> InstrumentedCursor:
+        started = time.perf_counter()
+        cursor = self._collection.aggregate(pipeline, *args, **kwargs)
+        # PyMongo's async API returns a coroutine, Motor returns the cursor directly
+        if inspect.isawaitable(cursor):
+            cursor = await cursor
+        wrapped = InstrumentedCursor(cursor, self._name, "aggregate", pipeline=pipeline)
+        wrapped._elapsed += time.perf_counter() - started
+        return wrapped
+
+
+class InstrumentedDatabase:
+    """Database handle whose collections (db.name or db["name"]) are InstrumentedCollections."""
+
+    def __init__(self, database: Any):
+        self._database = database
+
+    def __getitem__(self, name: str) -> InstrumentedCollection:
+        return InstrumentedCollection(self._database[name])
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._database, name)
+        if _is_collection(attr):
+            return InstrumentedCollection(attr)
+        return attr
+
+
+def instrument_database(database: Any) -> Any:
+    """Wrap a database handle for metrics; already-wrapped handles are returned unchanged."""
+    if isinstance(database, InstrumentedDatabase):
+        return database
+    return InstrumentedDatabase(database)
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import os
+import uuid
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Set
+
+from app.core.metrics import record_cache_invalidation
+from app.core.monitoring import get_logger
+from app.core.redis_pubsub import get_redis_pubsub
+
+logger = get_logger(__name__)
+
+# Pub/sub channel carrying invalidated tags between workers
+INVALIDATION_CHANNEL = "cache_invalidation"
+# Tags published within this window go out as one message
+INVALIDATION_BATCH_SECONDS = 0.05
+# Wait before resubscribing after the pub/sub connection drops
+INVALIDATION_RECONNECT_SECONDS = 5
+# Kinds of tag accepted on the bus (the part before the first colon)
+INVALIDATION_TAG_KINDS = ("fixture", "league", "combo", "player")
+
+# handler(tags, local_only): drop the entries carrying any of the tags. local_only is
+# False in the publishing worker only, which also clears shared state (Redis L2)
+InvalidationHandler = Callable[[Set[str], bool], Awaitable[None]]
+
+
+def fixture_tag(fixture_id: Any) -> str:
+    return f"fixture:{fixture_id}"
+
+
+def league_season_tag(league_id: Any, season_id: Any) -> str:
+    return f"league:{league_id}:season:{season_id}"
+
+
+def combo_tag(combo_id: Any) -> str:
+    return f"combo:{combo_id}"
+
+
+def player_tag(player_id: Any) -> str:
+    return f"player:{player_id}"
+
+
+def tag_kind(tag: str) -> str:
+    return tag.split(":", 1)[0]
+
+
+def is_valid_tag(tag: str) -> bool:
+    kind, _, rest = tag.partition(":")
+    return kind in INVALIDATION_TAG_KINDS and bool(rest)
+
+
+class InvalidationBus:
+    """
+    Tag-based cache invalidation across workers over the Redis pub/sub connection.
+
+    Cache layers subscribe a handler; writers publish tags (fixture:{id},
+    league:{id}:season:{id}, combo:{id}, player:{id}). Tags published within
+    INVALIDATION_BATCH_SECONDS are deduplicated and flushed together:
+
+    - the publishing worker runs every handler with local_only=False, so its L1 entries
+      and the shared L2 entries are dropped (or expired, see TwoTierCache) once;
+    - one message lists the tags on INVALIDATION_CHANNEL, and every other worker runs
+      its handlers with local_only=True (L1 and in-process indexes only).
+
+    Without Redis the flush still invalidates this worker.
+    """
+
+    _handlers: List[InvalidationHandler] = []
+    _pending: Set[str] = set()
+    _flush_task: Optional[asyncio.Task] = None
+    _listen_task: Optional[asyncio.Task] = None
+    # Identifies this worker's own messages, which it has already applied
+    _origin = f"{os.getpid()}:{uuid.uuid4().hex}"
+
+    @classmethod
+    def subscribe(cls, handler: InvalidationHandler) -> None:
+        cls._handlers.append(handler)
+
+    @classmethod
+    def publish(cls, tags: Iterable[str]) -> None:
+        """Queue tags for the next flush (at most INVALIDATION_BATCH_SECONDS away)."""
+        tags = {tag for tag in tags if is_valid_tag(tag)}
+        if not tags:
+            return
+        cls._pending.update(tags)
+        if cls._flush_task is None or cls._flush_task.done():
+            cls._flush_task = asyncio.create_task(cls._flush_later())
+
+    @classmethod
+    async def _flush_later(cls) -> None:
+        await asyncio.sleep(INVALIDATION_BATCH_SECONDS)
+        await cls.flush()
+
+    @classmethod
+    async def flush(cls) -> Set[str]:
+        """Apply and broadcast the queued tags now. Returns the tags flushed."""
+        tags, cls._pending = cls._pending, set()
+        if not tags:
+            return tags
+        await cls._apply(tags, local_only=False, source="published")
+
+        redis_client = get_redis_pubsub()
+        if redis_client is None:
+            return tags
+        try:
+            await redis_client.publish(
+                INVALIDATION_CHANNEL,
+                json.dumps({"origin": cls._origin, "tags": sorted(tags)}),
+            )
+        except Exception as exc:
+            # Other workers' L1 entries expire on their own TTL
+            logger.warning(
+                "Cache invalidation publish failed",
+                extra={"tags": len(tags), "error": str(exc), "error_type": type(exc).__name__},
+            )
+        return tags
+
+    @classmethod
+    async def _apply(cls, tags: Set[str], local_only: bool, source: str) -> None:
+        for tag in tags:
+            record_cache_invalidation(tag_kind(tag), source)
+        for handler in list(cls._handlers):
+            try:
+                await handler(tags, local_only)
+            except Exception as exc:
+                logger.warning(
+                    "Cache invalidation handler failed",
+                    extra={"error": str(exc), "error_type": type(exc).__name__},
+                )
+
+    @classmethod
+    async def _handle_message(cls, data: Any) -> None:
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == cls._origin:
+            return
+        tags = {tag for tag in message.get("tags", []) if isinstance(tag, str) and is_valid_tag(tag)}
+        if tags:
+            await cls._apply(tags, local_only=True, source="received")
+
+    @classmethod
+    async def _listen(cls) -> None:
+        while True:
+            redis_client = get_redis_pubsub()
+            if redis_client is None:
+                await asyncio.sleep(INVALIDATION_RECONNECT_SECONDS)
+                continue
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        await cls._handle_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(
+                    "Cache invalidation subscription lost",
+                    extra={"error": str(exc), "error_type": type(exc).__name__},
+                )
+            finally:
+                try:
+                    await pubsub.unsubscribe(INVALIDATION_CHANNEL)
+                    await pubsub.close()
+                except Exception:
+                    pass
+            await asyncio.sleep(INVALIDATION_RECONNECT_SECONDS)
+
+    @classmethod
+    async def start(cls) -> None:
+        """Subscribe to invalidations from other workers. Call from app startup."""
+        if cls._listen_task is None or cls._listen_task.done():
+            cls._listen_task = asyncio.create_task(cls._listen())
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._flush_task is not None and not cls._flush_task.done():
+            cls._flush_task.cancel()
+        # Tags still queued are applied and broadcast before shutdown
+        await cls.flush()
+        if cls._listen_task is not None:
+            cls._listen_task.cancel()
+            try:
+                await cls._listen_task
+            except asyncio.CancelledError:
+                pass
+            cls._listen_task = None
@@ -0,0 +1,179 @@
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+# Latency buckets (seconds) tuned for API handlers: 5ms .. 10s
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Mongo operations issued by a single request
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route (SSE streams excluded).",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_MONGO_QUERIES = Histogram(
+    "http_request_mongo_queries",
+    "MongoDB operations issued per HTTP request.",
+    ["method", "route"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+REQUEST_MONGO_SECONDS = Histogram(
+    "http_request_mongo_seconds",
+    "Total time spent in MongoDB per HTTP request.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+MONGO_OPERATION_DURATION = Histogram(
+    "mongo_operation_duration_seconds",
+    "MongoDB operation latency by collection and operation.",
+    ["collection", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+REDIS_PUBSUB_MESSAGES = Counter(
+    "redis_pubsub_messages_total",
+    "Redis pub/sub messages relayed to SSE clients.",
+    ["channel"],
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Two-tier cache lookups by cache and tier that answered (l1, l2 or miss).",
+    ["cache", "result"],
+)
+CACHE_INVALIDATIONS = Counter(
+    "cache_invalidation_tags_total",
+    "Cache tags invalidated by tag kind and source (published here or received from another worker).",
+    ["kind", "source"],
+)
+SSE_CONNECTIONS = Gauge(
+    "sse_connections",
+    "Open SSE connections by stream.",
+    ["stream"],
+    multiprocess_mode="livesum",
+)
+
+
+@dataclass
+class RequestStats:
+    """Per-request MongoDB counters, filled in by the instrumented collection wrapper."""
+
+    mongo_queries: int = 0
+    mongo_seconds: float = 0.0
+    scope: Optional[Dict[str, Any]] = None
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def record_mongo_operation(collection: str, operation: str, duration_seconds: float) -> None:
+    """Record one MongoDB operation globally and against the current request, if any."""
+    MONGO_OPERATION_DURATION.labels(collection=collection, operation=operation).observe(duration_seconds)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.mongo_queries += 1
+        stats.mongo_seconds += duration_seconds
+
+
+def current_route() -> Optional[str]:
+    """Route template of the request being handled, if known."""
+    stats = _request_stats.get()
+    if stats is None or stats.scope is None:
+        return None
+    return getattr(stats.scope.get("route"), "path", None)
+
+
+def channel_label(channel: str) -> str:
+    """Collapse 'fixture_updates:123' to 'fixture_updates' to keep label cardinality bounded."""
+    if isinstance(channel, bytes):
+        channel = channel.decode()
+    return channel.split(":", 1)[0]
+
+
+def record_pubsub_message(channel: str) -> None:
+    REDIS_PUBSUB_MESSAGES.labels(channel=channel_label(channel)).inc()
+
+
+def record_cache_lookup(cache: str, result: str, count: int = 1) -> None:
+    if count:
+        CACHE_LOOKUPS.labels(cache=cache, result=result).inc(count)
+
+
+def record_cache_invalidation(kind: str, source: str, count: int = 1) -> None:
+    if count:
+        CACHE_INVALIDATIONS.labels(kind=kind, source=source).inc(count)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route latency and MongoDB usage.
+
+    The route label is the matched path template (e.g. /api/v1/fixtures/{fixture_id}/predictions),
+    never the raw URL. SSE responses are not recorded in the latency histogram since their
+    duration is the lifetime of the connection; they are tracked by SSE_CONNECTIONS instead.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope=scope)
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+        is_event_stream = False
+
+        async def send_wrapper(message):
+            nonlocal status_code, is_event_stream
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", []):
+                    if name.lower() == b"content-type" and value.startswith(b"text/event-stream"):
+                        is_event_stream = True
+                        break
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(token)
+            route = scope.get("route")
+            route_label = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "GET")
+
+            if not is_event_stream:
+                HTTP_REQUEST_DURATION.labels(
+                    method=method,
+                    route=route_label,
+                    status=str(status_code),
+                ).observe(time.perf_counter() - started)
+            REQUEST_MONGO_QUERIES.labels(method=method, route=route_label).observe(stats.mongo_queries)
+            REQUEST_MONGO_SECONDS.labels(method=method, route=route_label).observe(stats.mongo_seconds)
+
+
+def render_metrics() -> bytes:
+    """Render metrics in Prometheus text format, aggregating workers in multiprocess mode."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
+
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
@@ -0,0 +1,268 @@
+import hashlib
+import heapq
+import json
+import time
+from array import array
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.core.monitoring import get_logger
+
+logger = get_logger(__name__)
+
+# Queries slower than this are logged and kept in the slow-sample list
+SLOW_QUERY_THRESHOLD_MS = 100.0
+# Rolling window covered by the report
+QUERY_OBSERVER_WINDOW_SECONDS = 15 * 60
+# Number of query shapes / slow samples returned by the report
+QUERY_OBSERVER_TOP_N = 20
+# Upper bound on distinct shapes tracked (oldest shapes are dropped beyond this)
+QUERY_OBSERVER_MAX_SHAPES = 2000
+# Duration samples kept per shape for percentile estimates
+_SAMPLES_PER_SHAPE = 256
+# Per-shape count/time rings the window totals are summed from: minutes for the last
+# hour, quarter hours for the longest report window (24 hours)
+_FINE_BUCKET_SECONDS = 60
+_FINE_BUCKETS = 60
+_COARSE_BUCKET_SECONDS = 15 * 60
+_COARSE_BUCKETS = 24 * 60 * 60 // _COARSE_BUCKET_SECONDS
+
+
+def _shape_of(value: Any) -> Any:
+    """Replace literal values with type placeholders, keeping operators and field names."""
+    if isinstance(value, dict):
+        return {key: _shape_of(value[key]) for key in sorted(value)}
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(item, dict) for item in value):
+            # $or / $and branches and pipelines keep their structure
+            return [_shape_of(item) for item in value]
+        return "[...]"
+    return "?"
+
+
+def _sort_shape(sort: Any) -> Any:
+    if sort is None:
+        return None
+    if isinstance(sort, str):
+        return [[sort, 1]]
+    if isinstance(sort, dict):
+        return [[key, direction] for key, direction in sort.items()]
+    return [[key, direction] for key, direction in sort]
+
+
+def fingerprint_query(
+    collection: str,
+    operation: str,
+    filter_doc: Optional[Dict[str, Any]] = None,
+    sort: Any = None,
+    projection: Any = None,
+    pipeline: Optional[List[Dict[str, Any]]] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """Return (fingerprint, shape) for a query, independent of literal values."""
+    shape: Dict[str, Any] = {"collection": collection, "operation": operation}
+    if pipeline is not None:
+        shape["pipeline"] = [_shape_of(stage) for stage in pipeline]
+    else:
+        shape["filter"] = _shape_of(filter_doc or {})
+        shape["sort"] = _sort_shape(sort)
+        if projection is not None:
+            shape["projection"] = sorted(projection)
+    encoded = json.dumps(shape, sort_keys=True, default=str)
+    return hashlib.sha1(encoded.encode()).hexdigest()[:16], shape
+
+
+class _BucketRing:
+    """Fixed number of (count, total ms, max ms) buckets; a slot is reused once its bucket ages out."""
+
+    __slots__ = ("width", "starts", "counts", "totals", "maxes")
+
+    def __init__(self, width: int, size: int):
+        self.width = width
+        self.starts = array("d", [-1.0]) * size
+        self.counts = array("d", [0.0]) * size
+        self.totals = array("d", [0.0]) * size
+        self.maxes = array("d", [0.0]) * size
+
+    def add(self, now: float, duration_ms: float) -> None:
+        start = now - now % self.width
+        slot = int(start // self.width) % len(self.starts)
+        if self.starts[slot] != start:
+            self.starts[slot] = start
+            self.counts[slot] = self.totals[slot] = self.maxes[slot] = 0.0
+        self.counts[slot] += 1
+        self.totals[slot] += duration_ms
+        self.maxes[slot] = max(self.maxes[slot], duration_ms)
+
+    def window(self, cutoff: float) -> Tuple[int, float, float]:
+        """(count, total ms, max ms) of the buckets starting at or after cutoff's bucket."""
+        edge = cutoff - cutoff % self.width
+        count, total, slowest = 0.0, 0.0, 0.0
+        for slot, start in enumerate(self.starts):
+            if start >= edge:
+                count += self.counts[slot]
+                total += self.totals[slot]
+                slowest = max(slowest, self.maxes[slot])
+        return int(count), total, slowest
+
+
+class _ShapeStats:
+    __slots__ = (
+        "shape",
+        "count",
+        "total_ms",
+        "max_ms",
+        "documents",
+        "bytes",
+        "bytes_count",
+        "fine",
+        "coarse",
+        "samples",
+        "last_seen",
+    )
+
+    def __init__(self, shape: Dict[str, Any]):
+        self.shape = shape
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.documents = 0
+        self.bytes = 0
+        self.bytes_count = 0
+        # Exact window counts and totals however hot the shape is, in bounded memory
+        self.fine = _BucketRing(_FINE_BUCKET_SECONDS, _FINE_BUCKETS)
+        self.coarse = _BucketRing(_COARSE_BUCKET_SECONDS, _COARSE_BUCKETS)
+        # Latest durations only, for percentiles
+        self.samples: Deque[Tuple[float, float]] = deque(maxlen=_SAMPLES_PER_SHAPE)
+        self.last_seen = 0.0
+
+    def add(self, now: float, duration_ms: float) -> None:
+        self.fine.add(now, duration_ms)
+        self.coarse.add(now, duration_ms)
+        self.samples.append((now, duration_ms))
+
+    def window(self, cutoff: float, window_seconds: float) -> Tuple[int, float, float]:
+        if window_seconds <= _FINE_BUCKET_SECONDS * (_FINE_BUCKETS - 1):
+            return self.fine.window(cutoff)
+        return self.coarse.window(cutoff)
+
+
+class QueryObserver:
+    """
+    Rolling per-shape statistics for MongoDB queries.
+
+    Fed by app.core.instrumented_db for every find/aggregate/find_one issued through an
+    instrumented handle. Queries are grouped by fingerprint (collection + operation + filter
+    keys/operators + sort + projection), so `{"_id": {"$in": [...]}}` on fixtures_refactor is
+    one shape regardless of the IDs. The report lists the top shapes by total time in the
+    window, and the slowest individual samples above SLOW_QUERY_THRESHOLD_MS.
+    """
+
+    # Least recently seen shape first, so eviction is a popitem
+    _shapes: "OrderedDict[str, _ShapeStats]" = OrderedDict()
+    _slow_samples: Deque[Dict[str, Any]] = deque(maxlen=500)
+
+    @classmethod
+    def record(
+        cls,
+        collection: str,
+        operation: str,
+        duration_ms: float,
+        documents: int,
+        size_bytes: Optional[int],
+        filter_doc: Optional[Dict[str, Any]] = None,
+        sort: Any = None,
+        projection: Any = None,
+        pipeline: Optional[List[Dict[str, Any]]] = None,
+        route: Optional[str] = None,
+    ) -> None:
+        fingerprint, shape = fingerprint_query(collection, operation, filter_doc, sort, projection, pipeline)
+        now = time.time()
+
+        stats = cls._shapes.get(fingerprint)
+        if stats is None:
+            if len(cls._shapes) >= QUERY_OBSERVER_MAX_SHAPES:
+                cls._shapes.popitem(last=False)
+            stats = cls._shapes[fingerprint] = _ShapeStats(shape)
+        else:
+            cls._shapes.move_to_end(fingerprint)
+
+        stats.count += 1
+        stats.total_ms += duration_ms
+        stats.max_ms = max(stats.max_ms, duration_ms)
+        stats.documents += documents
+        if size_bytes is not None:
+            stats.bytes += size_bytes
+            stats.bytes_count += 1
+        stats.add(now, duration_ms)
+        stats.last_seen = now
+
+        if duration_ms >= SLOW_QUERY_THRESHOLD_MS:
+            sample = {
+                "fingerprint": fingerprint,
+                "collection": collection,
+                "operation": operation,
+                "duration_ms": round(duration_ms, 2),
+                "documents": documents,
+                "bytes": size_bytes,
+                "route": route,
+                "at": now,
+            }
+            cls._slow_samples.append(sample)
+            logger.warning("Slow MongoDB query", extra={**sample, "shape": shape})
+
+    @staticmethod
+    def _percentile(values: List[float], pct: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    @classmethod
+    def report(cls, top_n: int = QUERY_OBSERVER_TOP_N, window_seconds: float = QUERY_OBSERVER_WINDOW_SECONDS) -> Dict[str, Any]:
+        """Top-N query shapes by total time in the window, plus the slowest recent samples."""
+        cutoff = time.time() - window_seconds
+
+        rows: List[Dict[str, Any]] = []
+        for fingerprint, stats in cls._shapes.items():
+            # Totals come from whole buckets, so the window is rounded down to a bucket edge
+            window_count, window_total_ms, window_max_ms = stats.window(cutoff, window_seconds)
+            if not window_count:
+                continue
+            durations = [duration for at, duration in stats.samples if at >= cutoff]
+            rows.append(
+                {
+                    "fingerprint": fingerprint,
+                    "shape": stats.shape,
+                    "window_count": window_count,
+                    "window_total_ms": round(window_total_ms, 2),
+                    "window_p50_ms": round(cls._percentile(durations, 50), 2),
+                    "window_p95_ms": round(cls._percentile(durations, 95), 2),
+                    "window_max_ms": round(window_max_ms, 2),
+                    "lifetime_count": stats.count,
+                    "lifetime_avg_ms": round(stats.total_ms / stats.count, 2),
+                    "lifetime_max_ms": round(stats.max_ms, 2),
+                    "avg_documents": round(stats.documents / stats.count, 1),
+                    "avg_bytes": int(stats.bytes / stats.bytes_count) if stats.bytes_count else 0,
+                }
+            )
+
+        top_shapes = heapq.nlargest(top_n, rows, key=lambda row: row["window_total_ms"])
+        slowest = heapq.nlargest(
+            top_n,
+            (sample for sample in cls._slow_samples if sample["at"] >= cutoff),
+            key=lambda sample: sample["duration_ms"],
+        )
+
+        return {
+            "window_seconds": window_seconds,
+            "slow_threshold_ms": SLOW_QUERY_THRESHOLD_MS,
+            "shapes_tracked": len(cls._shapes),
+            "top_shapes": top_shapes,
+            "slowest_queries": slowest,
+        }
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._shapes.clear()
+        cls._slow_samples.clear()
@@ -0,0 +1,142 @@
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from fastapi import HTTPException
+
+# Distinct raw ID-list strings remembered by parse_id_list (list pages repeat the same sets)
+ID_LIST_CACHE_SIZE = 4096
+# Characters allowed per ID before a raw string bypasses the cache (ID plus separator)
+ID_LIST_CACHE_CHARS_PER_ID = 12
+# Longest raw string cached when the caller sets no max_ids
+ID_LIST_CACHE_MAX_CHARS = 1024
+
+_NULL_VALUES = frozenset({"", "null", "None"})
+
+
+def _parse_ids(raw: str) -> Optional[Tuple[int, ...]]:
+    """Parse "1, 2,3" into (1, 2, 3); None if any part is not an integer."""
+    try:
+        return tuple(int(part) for part in raw.split(",") if part.strip())
+    except ValueError:
+        return None
+
+
+_split_ids = lru_cache(maxsize=ID_LIST_CACHE_SIZE)(_parse_ids)
+
+
+def parse_id_list(
+    raw: Optional[str],
+    param_name: str = "fixture_ids",
+    max_ids: Optional[int] = None,
+    max_message: Optional[str] = None,
+    invalid_message: Optional[str] = None,
+    empty_message: Optional[str] = None,
+) -> Tuple[int, ...]:
+    """
+    Parse a comma-separated ID list, caching the result per raw string.
+
+    Strings longer than a valid list could be (max_ids * ID_LIST_CACHE_CHARS_PER_ID)
+    are parsed without the cache, so oversized client input cannot fill it. Returns
+    an immutable tuple (safe to share between requests). Raises 400 for non-integer
+    parts, an empty list, or more than max_ids IDs; the *_message arguments keep a
+    route's existing error text.
+    """
+    raw = raw or ""
+    max_chars = max_ids * ID_LIST_CACHE_CHARS_PER_ID if max_ids is not None else ID_LIST_CACHE_MAX_CHARS
+    ids = _split_ids(raw) if len(raw) <= max_chars else _parse_ids(raw)
+    if ids is None:
+        raise HTTPException(
+            status_code=400,
+            detail=invalid_message or f"{param_name} must be comma-separated integers.",
+        )
+    if not ids:
+        raise HTTPException(
+            status_code=400,
+            detail=empty_message or f"{param_name} cannot be empty.",
+        )
+    if max_ids is not None and len(ids) > max_ids:
+        raise HTTPException(
+            status_code=400,
+            detail=max_message or f"Maximum {max_ids} {param_name} allowed.",
+        )
+    return ids
+
+
+def parse_optional_int(value: Optional[str], param_name: str) -> Optional[int]:
+    """Parse an optional integer query string where "", "null" and "None" mean absent."""
+    if value is None or value in _NULL_VALUES:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Query parameter '{param_name}' must be an integer.",
+        )
+
+
+class SortResolver:
+    """
+    Maps public sort_by / sort_order values to a (field, direction) pair.
+
+    Every combination is resolved once when the resolver is built; resolve() is a
+    single dict lookup. Unknown sort_by values fall back to the default field, and any
+    sort_order other than "asc" sorts descending (same as the previous per-router helpers).
+    """
+
+    __slots__ = ("_resolved", "_default_field")
+
+    def __init__(self, allowed_fields: Mapping[str, str], default_field: str):
+        self._default_field = default_field
+        resolved: Dict[Tuple[str, str], Tuple[str, int]] = {}
+        for public_name, field in allowed_fields.items():
+            resolved[(public_name, "asc")] = (field, 1)
+            resolved[(public_name, "desc")] = (field, -1)
+        self._resolved = MappingProxyType(resolved)
+
+    def resolve(self, sort_by: str, sort_order: str) -> Tuple[str, int]:
+        order = "asc" if sort_order.lower() == "asc" else "desc"
+        resolved = self._resolved.get((sort_by, order))
+        if resolved is not None:
+            return resolved
+        return self._default_field, 1 if order == "asc" else -1
+
+
+class FilterTemplate:
+    """
+    Frozen MongoDB filter built from optional query parameters.
+
+    FilterTemplate({"fixture_id": "fixture_id", "combo_id": "combo_id"}) maps parameter
+    names to document fields; build(fixture_id=1, combo_id=None) returns {"fixture_id": 1}.
+    Static conditions are copied into every filter.
+    """
+
+    __slots__ = ("_fields", "_static")
+
+    def __init__(self, fields: Mapping[str, str], static: Optional[Mapping[str, Any]] = None):
+        self._fields = tuple(fields.items())
+        self._static = MappingProxyType(dict(static or {}))
+
+    def build(self, **values: Any) -> Dict[str, Any]:
+        filters = dict(self._static)
+        for param, field in self._fields:
+            value = values.get(param)
+            if value is not None:
+                filters[field] = value
+        return filters
+
+
+# Sort options shared by the fixture, player and smart combo prediction routes
+PREDICTION_SORT = SortResolver(
+    {
+        "pct_change": "pct_change_value",
+        "prediction_pre_game": "pre_game_prediction",
+        "prediction": "prediction",
+        "created_at": "created_at",
+    },
+    default_field="pct_change_value",
+)
+
+# Optional filters on the smart combo prediction collections
+SMART_COMBO_PREDICTION_FILTER = FilterTemplate({"fixture_id": "fixture_id", "combo_id": "combo_id"})
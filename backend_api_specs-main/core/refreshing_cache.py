@@ -0,0 +1,195 @@
+import asyncio
+import math
+import random
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional
+
+from app.core.metrics import record_cache_lookup
+from app.core.monitoring import get_logger
+from app.core.redis_pubsub import get_redis_pubsub
+from app.core.two_tier_cache import TwoTierCache
+
+logger = get_logger(__name__)
+
+# XFetch beta: >1 refreshes earlier, <1 later (1.0 is the value from the XFetch paper)
+XFETCH_BETA = 1.0
+# Upper bound on one background refresh; also the expiry of a refresh lock whose holder
+# died (a completed refresh releases it at once)
+REFRESH_LOCK_SECONDS = 30
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _is_not_none(value: Any) -> bool:
+    return value is not None
+
+
+def _expire_now(entry: Dict[str, Any]) -> Dict[str, Any]:
+    return {**entry, "expires_at": min(entry["expires_at"], time.time())}
+
+
+class RefreshingCache:
+    """
+    Stale-while-revalidate cache with probabilistic early refresh (XFetch).
+
+    Entries are stored in a TwoTierCache together with the time they took to compute
+    (delta) and their soft expiry. On each read:
+
+    - fresh entries are served, but with probability growing as expiry approaches
+      (now - delta * beta * ln(U) >= expiry) a background refresh is started, so popular
+      keys are recomputed before they expire and expensive ones earlier than cheap ones;
+    - entries past expiry but within stale_seconds are served stale while one
+      background refresh runs;
+    - missing or fully expired entries are loaded inline, with concurrent callers in
+      the worker sharing one load.
+
+    Background refreshes take a Redis SET NX lock, so one worker recomputes a key while
+    the others keep serving the previous value and then pick the new one up from L2. The
+    lock holds a per-refresh token and is released as soon as the refresh ends.
+
+    encode / decode convert loader results to and from the stored (JSON-friendly) form;
+    results for which cacheable() is false (errors, None) are returned but not stored.
+    tags(key, encoded_value) names the invalidation tags of an entry (see TwoTierCache).
+    Tag invalidation expires entries instead of dropping them: the next read serves the
+    stale value and starts the single background refresh, rather than every worker
+    loading inline at once. invalidate() still drops the key.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl_seconds: float,
+        stale_seconds: float,
+        l1_max_entries: int = 1000,
+        beta: float = XFETCH_BETA,
+        encode: Callable[[Any], Any] = _identity,
+        decode: Callable[[Any], Any] = _identity,
+        cacheable: Callable[[Any], bool] = _is_not_none,
+        tags: Optional[Callable[[Hashable, Any], Iterable[str]]] = None,
+    ):
+        self.namespace = namespace
+        self.encode = encode
+        self.decode = decode
+        self.cacheable = cacheable
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.beta = beta
+        self._store = TwoTierCache(
+            namespace,
+            l1_max_entries=l1_max_entries,
+            l1_ttl_seconds=ttl_seconds + stale_seconds,
+            l2_ttl_seconds=int(math.ceil(ttl_seconds + stale_seconds)),
+            tags=(lambda key, entry: tags(key, entry["value"])) if tags is not None else None,
+            expire=_expire_now,
+        )
+        self._loads: Dict[Hashable, asyncio.Future] = {}
+        self._refreshes: Dict[Hashable, asyncio.Task] = {}
+
+    def _refresh_early(self, entry: Dict[str, Any], now: float) -> bool:
+        # 1 - random() is in (0, 1], so the log is defined
+        return now - entry["delta"] * self.beta * math.log(1.0 - random.random()) >= entry["expires_at"]
+
+    async def _compute(self, key: Hashable, loader: Callable[[], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        started = time.monotonic()
+        value = await loader()
+        if self.cacheable(value):
+            await self._store.set(
+                key,
+                {
+                    "value": self.encode(value),
+                    "delta": time.monotonic() - started,
+                    "expires_at": time.time() + self.ttl_seconds,
+                },
+            )
+        return value
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        """Inline load shared by every concurrent caller for the key in this worker."""
+        pending = self._loads.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._compute(key, loader))
+            self._loads[key] = pending
+            pending.add_done_callback(lambda _: self._loads.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def _acquire_refresh_lock(self, key: Hashable) -> Optional[str]:
+        """Take the key's refresh lock. Returns its token, or None if another worker holds it."""
+        token = uuid.uuid4().hex
+        redis_client = get_redis_pubsub()
+        if redis_client is None:
+            return token
+        try:
+            acquired = await redis_client.set(
+                f"{self._store.redis_key(key)}:refresh", token, nx=True, ex=REFRESH_LOCK_SECONDS
+            )
+            return token if acquired else None
+        except Exception:
+            # Without Redis each worker refreshes on its own
+            return token
+
+    async def _release_refresh_lock(self, key: Hashable, token: str) -> None:
+        redis_client = get_redis_pubsub()
+        if redis_client is None:
+            return
+        lock_key = f"{self._store.redis_key(key)}:refresh"
+        try:
+            holder = await redis_client.get(lock_key)
+            if isinstance(holder, bytes):
+                holder = holder.decode()
+            if holder == token:
+                await redis_client.delete(lock_key)
+        except Exception:
+            pass
+
+    async def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[Optional[Any]]]) -> None:
+        token: Optional[str] = None
+        try:
+            token = await self._acquire_refresh_lock(key)
+            if token is None:
+                # Another worker is recomputing: read its result from L2 from now on
+                self._store.discard_local([key])
+                return
+            await asyncio.wait_for(self._load(key, loader), timeout=REFRESH_LOCK_SECONDS)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            # Keep serving the current value; the next read past expiry retries
+            logger.warning(
+                "Background cache refresh failed",
+                extra={"cache": self.namespace, "error": str(exc), "error_type": type(exc).__name__},
+            )
+        finally:
+            self._refreshes.pop(key, None)
+            if token is not None:
+                await self._release_refresh_lock(key, token)
+
+    def _schedule_refresh(self, key: Hashable, loader: Callable[[], Awaitable[Optional[Any]]]) -> None:
+        if key in self._refreshes or key in self._loads:
+            return
+        self._refreshes[key] = asyncio.create_task(self._refresh(key, loader))
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        """Value for key, computing it with loader() when missing or expired."""
+        entry = await self._store.get(key)
+        if entry is not None:
+            now = time.time()
+            if now < entry["expires_at"]:
+                if self._refresh_early(entry, now):
+                    record_cache_lookup(self.namespace, "early_refresh")
+                    self._schedule_refresh(key, loader)
+                return self.decode(entry["value"])
+            if now < entry["expires_at"] + self.stale_seconds:
+                record_cache_lookup(self.namespace, "stale")
+                self._schedule_refresh(key, loader)
+                return self.decode(entry["value"])
+        return await self._load(key, loader)
+
+    async def warm(self, key: Hashable, loader: Callable[[], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        """Recompute and store the value now, whatever the state of the current entry."""
+        return await self._load(key, loader)
+
+    async def invalidate(self, key: Hashable) -> None:
+        await self._store.invalidate([key])
@@ -0,0 +1,443 @@
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: a segment is freed with its last handle, nothing to track
+    fcntl = None
+
+from app.core.monitoring import get_logger
+
+logger = get_logger(__name__)
+
+# Segment layout version; readers ignore segments with another magic
+_SEGMENT_MAGIC = b"FOTBL\x00\x00\x01"
+# magic, table count
+_SEGMENT_HEADER = struct.Struct("<8sI")
+# table name, offset, length
+_DIRECTORY_ENTRY = struct.Struct("<32sII")
+# row count, string column count, int column count, column names length
+_TABLE_HEADER = struct.Struct("<IHHI")
+# Current generation, in the control segment
+_GENERATION = struct.Struct("<q")
+# PIDs of the processes attached to the store (0 = free slot), after the generation
+_ATTACHED = struct.Struct("<64i")
+_CONTROL_SIZE = _GENERATION.size + _ATTACHED.size
+# Where POSIX shared memory segments are listed (Linux); elsewhere only known names are unlinked
+_SHM_DIRECTORY = "/dev/shm"
+
+# (string columns, int columns, rows by int key); a missing or None value is stored as null
+TableData = Tuple[Sequence[str], Sequence[str], Dict[int, Dict[str, Any]]]
+
+
+def _pad8(length: int) -> bytes:
+    return b"\x00" * (-length % 8)
+
+
+def _pack_table(str_columns: Sequence[str], int_columns: Sequence[str], rows: Dict[int, Dict[str, Any]]) -> bytes:
+    keys = array("q", sorted(rows))
+    ints = array("q")
+    int_nulls = bytearray()
+    offsets = array("I", [0])
+    str_nulls = bytearray()
+    heap = bytearray()
+    for key in keys:
+        row = rows[key]
+        for column in int_columns:
+            value = row.get(column)
+            ints.append(0 if value is None else int(value))
+            int_nulls.append(value is None)
+        for column in str_columns:
+            value = row.get(column)
+            if value is not None:
+                heap += str(value).encode()
+            offsets.append(len(heap))
+            str_nulls.append(value is None)
+
+    names = "\x00".join((*str_columns, *int_columns)).encode()
+    header = _TABLE_HEADER.pack(len(keys), len(str_columns), len(int_columns), len(names))
+    prefix = header + names
+    return b"".join(
+        (
+            prefix,
+            _pad8(len(prefix)),
+            keys.tobytes(),
+            ints.tobytes(),
+            offsets.tobytes(),
+            bytes(int_nulls),
+            bytes(str_nulls),
+            bytes(heap),
+        )
+    )
+
+
+def pack_tables(tables: Dict[str, TableData]) -> bytes:
+    """Serialise named tables into one buffer readable by unpack_tables."""
+    bodies = [(name, _pack_table(*data)) for name, data in tables.items()]
+    offset = _SEGMENT_HEADER.size + _DIRECTORY_ENTRY.size * len(bodies)
+    directory = []
+    for name, body in bodies:
+        directory.append(_DIRECTORY_ENTRY.pack(name.encode(), offset, len(body)))
+        offset += len(body) + len(_pad8(len(body)))
+    parts = [_SEGMENT_HEADER.pack(_SEGMENT_MAGIC, len(bodies)), *directory]
+    for _, body in bodies:
+        parts.append(body)
+        parts.append(_pad8(len(body)))
+    return b"".join(parts)
+
+
+class SharedTable:
+    """
+    Read-only int-keyed table over a packed buffer (usually a shared memory segment).
+
+    Columns are stored as arrays: sorted int64 keys (binary search), int64 values with a
+    null byte per cell, and UTF-8 strings in one heap addressed by uint32 offsets. Nothing
+    is decoded up front; get() decodes the requested row only.
+    """
+
+    __slots__ = ("str_columns", "int_columns", "_rows", "_views")
+
+    def __init__(self, buffer: memoryview):
+        rows, str_count, int_count, names_length = _TABLE_HEADER.unpack_from(buffer, 0)
+        position = _TABLE_HEADER.size
+        names = bytes(buffer[position:position + names_length]).decode().split("\x00") if names_length else []
+        position += names_length
+        position += len(_pad8(position))
+        self.str_columns: Tuple[str, ...] = tuple(names[:str_count])
+        self.int_columns: Tuple[str, ...] = tuple(names[str_count:str_count + int_count])
+        self._rows = rows
+
+        def _take(length: int, fmt: Optional[str]) -> memoryview:
+            nonlocal position
+            view = buffer[position:position + length]
+            position += length
+            return view.cast(fmt) if fmt else view
+
+        keys = _take(8 * rows, "q")
+        ints = _take(8 * rows * int_count, "q")
+        offsets = _take(4 * (rows * str_count + 1), "I")
+        int_nulls = _take(rows * int_count, None)
+        str_nulls = _take(rows * str_count, None)
+        heap = _take(offsets[-1], None)
+        self._views = (keys, ints, offsets, int_nulls, str_nulls, heap)
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def _index(self, key: Any) -> int:
+        try:
+            key = int(key)
+        except (TypeError, ValueError):
+            return -1
+        keys = self._views[0]
+        index = bisect_left(keys, key)
+        if index < self._rows and keys[index] == key:
+            return index
+        return -1
+
+    def __contains__(self, key: Any) -> bool:
+        return self._index(key) >= 0
+
+    def _row(self, index: int) -> Dict[str, Any]:
+        _, ints, offsets, int_nulls, str_nulls, heap = self._views
+        row: Dict[str, Any] = {}
+        base = index * len(self.int_columns)
+        for column_index, column in enumerate(self.int_columns):
+            cell = base + column_index
+            row[column] = None if int_nulls[cell] else ints[cell]
+        base = index * len(self.str_columns)
+        for column_index, column in enumerate(self.str_columns):
+            cell = base + column_index
+            row[column] = None if str_nulls[cell] else bytes(heap[offsets[cell]:offsets[cell + 1]]).decode()
+        return row
+
+    def get(self, key: Any) -> Optional[Dict[str, Any]]:
+        index = self._index(key)
+        return self._row(index) if index >= 0 else None
+
+    def get_many(self, keys: Iterable[Any]) -> Dict[Any, Dict[str, Any]]:
+        """Rows for the keys present in the table, keyed as requested."""
+        found: Dict[Any, Dict[str, Any]] = {}
+        for key in keys:
+            if key in found:
+                continue
+            index = self._index(key)
+            if index >= 0:
+                found[key] = self._row(index)
+        return found
+
+    def release(self) -> None:
+        for view in self._views:
+            view.release()
+
+
+def unpack_tables(buffer: memoryview) -> Dict[str, SharedTable]:
+    """Tables of a buffer written by pack_tables (no data is copied)."""
+    magic, count = _SEGMENT_HEADER.unpack_from(buffer, 0)
+    if magic != _SEGMENT_MAGIC:
+        raise ValueError("not a table segment")
+    tables: Dict[str, SharedTable] = {}
+    for index in range(count):
+        raw_name, offset, length = _DIRECTORY_ENTRY.unpack_from(buffer, _SEGMENT_HEADER.size + index * _DIRECTORY_ENTRY.size)
+        tables[raw_name.rstrip(b"\x00").decode()] = SharedTable(buffer[offset:offset + length])
+    return tables
+
+
+def _open_segment(name: str, create: bool = False, size: int = 0) -> shared_memory.SharedMemory:
+    segment = shared_memory.SharedMemory(name=name, create=create, size=size)
+    # The resource tracker unlinks tracked segments when this process exits, while the
+    # other workers may still be reading them: lifetime is managed by the store instead
+    try:
+        resource_tracker.unregister(segment._name, "shared_memory")
+    except Exception:
+        pass
+    return segment
+
+
+def _unlink_segment(name: str) -> None:
+    try:
+        # Opened tracked, so unlink() leaves the resource tracker consistent
+        segment = shared_memory.SharedMemory(name=name)
+    except OSError:
+        return
+    segment.close()
+    segment.unlink()
+
+
+def _listed_segments(start: str) -> List[str]:
+    try:
+        return [name for name in os.listdir(_SHM_DIRECTORY) if name.startswith(start)]
+    except OSError:
+        return []
+
+
+def _unlink_generations(prefix: str, generation: int = 0) -> None:
+    """Unlink a store's generation segments: the last three by name, and any listed."""
+    names = {f"{prefix}_{generation - back}" for back in range(3) if generation - back > 0}
+    names.update(_listed_segments(f"{prefix}_"))
+    for name in names:
+        _unlink_segment(name)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+@contextmanager
+def _locked(segment: shared_memory.SharedMemory) -> Iterator[memoryview]:
+    """The segment's buffer under an exclusive flock (attach/detach bookkeeping only)."""
+    fcntl.flock(segment._fd, fcntl.LOCK_EX)
+    try:
+        yield segment.buf
+    finally:
+        fcntl.flock(segment._fd, fcntl.LOCK_UN)
+
+
+def _attached_pids(buffer: memoryview) -> List[int]:
+    """PIDs in the control segment whose process is still running."""
+    return [pid for pid in _ATTACHED.unpack_from(buffer, _GENERATION.size) if pid and _process_alive(pid)]
+
+
+def _write_attached(buffer: memoryview, pids: List[int]) -> None:
+    pids = pids[:_ATTACHED.size // 4]
+    _ATTACHED.pack_into(buffer, _GENERATION.size, *pids, *([0] * (_ATTACHED.size // 4 - len(pids))))
+
+
+class SharedTableStore:
+    """
+    Versioned table sets in shared memory, shared by every worker process on the host.
+
+    Segments are named after the namespace and an instance (the server's master PID):
+    publish() packs the tables into a new segment "{namespace}_{instance}_{generation}"
+    and then bumps the generation in the control segment "{namespace}_{instance}", so
+    the swap is atomic: readers (tables()) compare the generation on each call and
+    re-attach when it moved. The segment two generations back is unlinked; processes
+    still mapping it keep a valid mapping until they swap.
+
+    The control segment also lists the PIDs attached to the store. A process that finds
+    none of them running treats the published tables as a predecessor's (a restarted
+    server that got the same PID) and unlinks them; it also sweeps segments of other
+    instances whose processes have all exited. The last process to close() unlinks
+    everything. Where shared memory is unavailable the tables are kept in the publishing
+    process only.
+    """
+
+    def __init__(self, namespace: str, instance: Any):
+        self.namespace = namespace
+        self.prefix = f"{namespace}_{instance}"
+        self._control: Optional[shared_memory.SharedMemory] = None
+        self._segment: Optional[shared_memory.SharedMemory] = None
+        self._generation = 0
+        self._tables: Dict[str, SharedTable] = {}
+        # Previous segment and its tables, closed on the next swap
+        self._retired: List[Tuple[Optional[shared_memory.SharedMemory], Dict[str, SharedTable]]] = []
+        self._local_only = False
+
+    def _segment_name(self, generation: int) -> str:
+        return f"{self.prefix}_{generation}"
+
+    def _open_control(self) -> shared_memory.SharedMemory:
+        try:
+            return _open_segment(self.prefix, create=True, size=_CONTROL_SIZE)
+        except FileExistsError:
+            control = _open_segment(self.prefix)
+        if len(control.buf) >= _CONTROL_SIZE:
+            return control
+        # Written by an older layout: nobody can be attached to it through this code
+        control.close()
+        _unlink_generations(self.prefix)
+        _unlink_segment(self.prefix)
+        return _open_segment(self.prefix, create=True, size=_CONTROL_SIZE)
+
+    def _control_buffer(self) -> Optional[memoryview]:
+        if self._control is None and not self._local_only:
+            try:
+                self._control = self._open_control()
+                if fcntl is not None:
+                    self._attach()
+            except OSError as exc:
+                logger.warning(
+                    "Shared memory unavailable, reference tables stay per process",
+                    extra={"error": str(exc), "error_type": type(exc).__name__},
+                )
+                self._local_only = True
+        return self._control.buf if self._control is not None else None
+
+    def _attach(self) -> None:
+        with _locked(self._control) as buffer:
+            pids = _attached_pids(buffer)
+            if not pids:
+                # Nobody attached is running: what is published is a predecessor's. The
+                # generation keeps counting, so the next publish cannot collide
+                _unlink_generations(self.prefix, _GENERATION.unpack_from(buffer, 0)[0])
+            _write_attached(buffer, [*pids, os.getpid()])
+        self._sweep()
+
+    def _detach(self) -> bool:
+        """Remove this process from the control segment. True if it was the last one."""
+        with _locked(self._control) as buffer:
+            pids = [pid for pid in _attached_pids(buffer) if pid != os.getpid()]
+            _write_attached(buffer, pids)
+            if pids:
+                return False
+            generation = _GENERATION.unpack_from(buffer, 0)[0]
+        _unlink_generations(self.prefix, generation)
+        return True
+
+    def _sweep(self) -> None:
+        """Unlink the segments of other instances whose processes have all exited."""
+        instances = {
+            name[len(self.namespace) + 1:].split("_", 1)[0]
+            for name in _listed_segments(f"{self.namespace}_")
+        }
+        for instance in instances:
+            prefix = f"{self.namespace}_{instance}"
+            if prefix == self.prefix:
+                continue
+            try:
+                control = _open_segment(prefix)
+            except FileNotFoundError:
+                # Generations left without a control segment
+                _unlink_generations(prefix)
+                continue
+            except OSError:
+                continue
+            try:
+                if len(control.buf) < _CONTROL_SIZE:
+                    attached = False
+                else:
+                    with _locked(control) as buffer:
+                        attached = bool(_attached_pids(buffer))
+            finally:
+                control.close()
+            if not attached:
+                logger.info("Unlinking stale shared tables", extra={"prefix": prefix})
+                _unlink_generations(prefix)
+                _unlink_segment(prefix)
+
+    @property
+    def generation(self) -> int:
+        """Generation of the tables this process is attached to (0 before the first)."""
+        return self._generation
+
+    def published_generation(self) -> int:
+        buffer = self._control_buffer()
+        if buffer is None:
+            return self._generation
+        return _GENERATION.unpack_from(buffer, 0)[0]
+
+    def _install(
+        self,
+        generation: int,
+        segment: Optional[shared_memory.SharedMemory],
+        tables: Dict[str, SharedTable],
+    ) -> None:
+        for old_segment, old_tables in self._retired:
+            for table in old_tables.values():
+                table.release()
+            if old_segment is not None:
+                old_segment.close()
+        self._retired = [(self._segment, self._tables)] if self._tables or self._segment else []
+        self._segment = segment
+        self._tables = tables
+        self._generation = generation
+
+    def publish(self, tables: Dict[str, TableData]) -> int:
+        """Publish a new generation of tables. Returns the generation (0 if another process won)."""
+        payload = pack_tables(tables)
+        buffer = self._control_buffer()
+        if buffer is None:
+            self._install(self._generation + 1, None, unpack_tables(memoryview(payload)))
+            return self._generation
+
+        generation = _GENERATION.unpack_from(buffer, 0)[0] + 1
+        try:
+            segment = _open_segment(self._segment_name(generation), create=True, size=len(payload))
+        except FileExistsError:
+            # Another worker is publishing this generation
+            return 0
+        segment.buf[:len(payload)] = payload
+        _GENERATION.pack_into(buffer, 0, generation)
+        self._install(generation, segment, unpack_tables(segment.buf))
+        if generation > 2:
+            _unlink_segment(self._segment_name(generation - 2))
+        return generation
+
+    def close(self) -> None:
+        """
+        Detach from every segment. They stay published for the other workers; the last
+        attached process unlinks them.
+        """
+        last = self._control is not None and fcntl is not None and self._detach()
+        self._install(0, None, {})
+        self._install(0, None, {})
+        if self._control is not None:
+            self._control.close()
+            self._control = None
+        if last:
+            _unlink_segment(self.prefix)
+
+    def tables(self) -> Dict[str, SharedTable]:
+        """Tables of the current generation, attaching to a newer one if it was published."""
+        generation = self.published_generation()
+        if generation == self._generation or generation == 0:
+            return self._tables
+        try:
+            segment = _open_segment(self._segment_name(generation))
+            tables = unpack_tables(segment.buf)
+        except (FileNotFoundError, ValueError):
+            # Superseded while attaching; keep the current tables until the next call
+            return self._tables
+        self._install(generation, segment, tables)
+        return self._tables
@@ -0,0 +1,170 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+import bson
+
+from app.core.monitoring import get_logger
+
+logger = get_logger(__name__)
+
+# File magic; SNAPSHOT_FORMAT_VERSION is bumped when the container layout changes
+SNAPSHOT_MAGIC = b"FOSNAP\x00\x00"
+SNAPSHOT_FORMAT_VERSION = 2
+# magic, format version, producer schema version, index length
+_HEADER = struct.Struct("<8sHHI")
+
+
+class Snapshot:
+    """
+    Read-only view of a snapshot file.
+
+    The file is memory-mapped; opening it only parses the fixed header and the section
+    index. Sections are BSON documents checked against their CRC32 and decoded on first
+    access, so a reader pays only for the sections it uses. Close it (or use it as a
+    context manager) once done.
+    """
+
+    __slots__ = ("written_at", "digest", "_mmap", "_body_offset", "_sections")
+
+    def __init__(self, mapped: mmap.mmap, body_offset: int, index: Dict[str, Any]):
+        self._mmap = mapped
+        self._body_offset = body_offset
+        self._sections: Dict[str, Tuple[int, int, int]] = {
+            name: (offset, length, checksum) for name, (offset, length, checksum) in index["sections"].items()
+        }
+        self.written_at: float = index["written_at"]
+        self.digest: str = index["digest"]
+
+    def names(self) -> Tuple[str, ...]:
+        return tuple(self._sections)
+
+    def section(self, name: str) -> Optional[Any]:
+        """Decoded value of a section, or None if the snapshot does not have it or it is corrupt."""
+        location = self._sections.get(name)
+        if location is None:
+            return None
+        offset, length, checksum = location
+        start = self._body_offset + offset
+        body = self._mmap[start:start + length]
+        if len(body) != length or zlib.crc32(body) != checksum:
+            logger.warning("Ignoring corrupt snapshot section", extra={"section": name})
+            return None
+        return bson.decode(body)["value"]
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _digest(schema_version: int, bodies: Dict[str, bytes]) -> str:
+    digest = hashlib.sha1(str(schema_version).encode())
+    for name in sorted(bodies):
+        digest.update(name.encode())
+        digest.update(bodies[name])
+    return digest.hexdigest()
+
+
+def write_snapshot(
+    path: str,
+    sections: Dict[str, Any],
+    schema_version: int,
+    unless_digest: Optional[str] = None,
+) -> Tuple[str, bool]:
+    """
+    Write sections (BSON-encodable values) to path atomically.
+
+    The file is written next to path and renamed over it, so concurrent readers (other
+    workers booting) see either the previous or the new snapshot. Returns the content
+    digest and whether the file was written: nothing is written when the digest equals
+    unless_digest.
+    """
+    bodies = {name: bson.encode({"value": value}) for name, value in sections.items()}
+    digest = _digest(schema_version, bodies)
+    if digest == unless_digest:
+        return digest, False
+
+    index: Dict[str, Any] = {"written_at": time.time(), "digest": digest, "sections": {}}
+    offset = 0
+    for name in sorted(bodies):
+        index["sections"][name] = [offset, len(bodies[name]), zlib.crc32(bodies[name])]
+        offset += len(bodies[name])
+    encoded_index = bson.encode(index)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, schema_version, len(encoded_index)))
+            handle.write(encoded_index)
+            for name in sorted(bodies):
+                handle.write(bodies[name])
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return digest, True
+
+
+def read_snapshot(path: str, schema_version: int, max_age_seconds: Optional[float] = None) -> Optional[Snapshot]:
+    """
+    Open a snapshot written by write_snapshot.
+
+    Returns None when the file is missing, has another format or schema version, is older
+    than max_age_seconds or its index is unreadable; the caller then falls back to MongoDB.
+    Section bodies are not read here: each one is checked against its CRC32 when it is
+    first accessed (see Snapshot.section).
+    """
+    try:
+        with open(path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # Missing or empty file
+        return None
+
+    try:
+        magic, format_version, file_schema_version, index_length = _HEADER.unpack_from(mapped, 0)
+        if (
+            magic != SNAPSHOT_MAGIC
+            or format_version != SNAPSHOT_FORMAT_VERSION
+            or file_schema_version != schema_version
+        ):
+            logger.info(
+                "Ignoring snapshot with another version",
+                extra={"path": path, "format_version": format_version, "schema_version": file_schema_version},
+            )
+            mapped.close()
+            return None
+        body_offset = _HEADER.size + index_length
+        index = bson.decode(mapped[_HEADER.size:body_offset])
+        if max_age_seconds is not None and time.time() - index["written_at"] > max_age_seconds:
+            logger.info("Ignoring expired snapshot", extra={"path": path, "written_at": index["written_at"]})
+            mapped.close()
+            return None
+        body_length = max((offset + length for offset, length, _ in index["sections"].values()), default=0)
+        if body_offset + body_length > len(mapped):
+            raise ValueError("truncated file")
+    except Exception as exc:
+        logger.warning(
+            "Ignoring unreadable snapshot",
+            extra={"path": path, "error": str(exc), "error_type": type(exc).__name__},
+        )
+        mapped.close()
+        return None
+    return Snapshot(mapped, body_offset, index)
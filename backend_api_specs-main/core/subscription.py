@@ -0,0 +1,28 @@
+from typing import Any, Dict, Optional
+
+from app.schemas.schemas import SubscriptionTier
+
+
+def is_premium_user(current_user: Optional[Dict[str, Any]]) -> bool:
+    """True when the authenticated user is on the premium tier (anonymous users are free)."""
+    if not current_user:
+        return False
+    tier = current_user.get("subscription_tier")
+    return tier == SubscriptionTier.PREMIUM or tier == SubscriptionTier.PREMIUM.value
+
+
+def tier_label(current_user: Optional[Dict[str, Any]]) -> str:
+    """'premium' or 'free'; used to key tier-dependent caches and payloads."""
+    return "premium" if is_premium_user(current_user) else "free"
+
+
+def tier_user(current_user: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Canonical user for the caller's tier: None (anonymous) or a bare premium user.
+
+    Loaders of caches keyed by tier_label pass this instead of the real user, so the
+    cached payload depends on nothing the key does not capture.
+    """
+    if is_premium_user(current_user):
+        return {"subscription_tier": SubscriptionTier.PREMIUM.value}
+    return None
@@ -0,0 +1,349 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from bson import json_util
+
+from app.core.invalidation import InvalidationBus
+from app.core.metrics import record_cache_lookup
+from app.core.monitoring import get_logger
+from app.core.redis_pubsub import get_redis_pubsub
+
+logger = get_logger(__name__)
+
+# Prefix of every L2 key: cache:{namespace}:{key}
+CACHE_KEY_PREFIX = "cache"
+# Minimum lifetime of the L2 tag sets (cache:{namespace}:tag:{tag}); outlives the entries they list
+CACHE_TAG_TTL_SECONDS = 60 * 60
+# Extended JSON keeps datetimes and ObjectIds intact across the Redis round trip
+_JSON_OPTIONS = json_util.RELAXED_JSON_OPTIONS.with_options(tz_aware=False)
+
+Loader = Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+# tags(key, value): invalidation tags of an entry (see app.core.invalidation)
+Tagger = Callable[[Hashable, Any], Iterable[str]]
+# expire(value): the value to keep in place of an invalidated entry (see TwoTierCache)
+Expirer = Callable[[Any], Any]
+
+
+class TwoTierCache:
+    """
+    Read-through cache with an in-process L1 and the shared Redis as L2.
+
+    - L1 is a bounded LRU map with a short TTL, private to the worker.
+    - L2 is Redis (the pub/sub client), shared by every worker and surviving restarts.
+      Multi-key lookups read all L1 misses with one MGET and write loads back with one
+      pipelined SET ... EX.
+    - Values are encoded with bson.json_util, so Mongo documents (datetimes, ObjectIds)
+      come back unchanged.
+
+    - With a version function (e.g. a document's updated_at), writes never replace a
+      newer value this worker holds, so a slow load cannot overwrite a fresher one.
+    - With a tags function, entries are indexed by invalidation tag (in L1, and in L2 as
+      Redis sets listing the keys per tag) and dropped when the InvalidationBus flushes
+      one of their tags.
+    - With an expire function as well, invalidated entries are rewritten through it in
+      both tiers instead of dropped (e.g. RefreshingCache marks them soft-expired, so the
+      stale value is served while one refresh runs).
+
+    Values returned from L1 are shared between requests: callers must not mutate them.
+    Redis errors are logged and treated as misses; None is never cached.
+    """
+
+    _instances: Dict[str, "TwoTierCache"] = {}
+
+    def __init__(
+        self,
+        namespace: str,
+        l1_max_entries: int,
+        l1_ttl_seconds: float,
+        l2_ttl_seconds: int,
+        version: Optional[Callable[[Any], Any]] = None,
+        tags: Optional[Tagger] = None,
+        expire: Optional[Expirer] = None,
+    ):
+        self.namespace = namespace
+        self.l1_max_entries = l1_max_entries
+        self.l1_ttl_seconds = l1_ttl_seconds
+        self.l2_ttl_seconds = l2_ttl_seconds
+        self.version = version
+        self.tags = tags
+        self.expire = expire
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._key_tags: Dict[Hashable, Tuple[str, ...]] = {}
+        self._tag_keys: Dict[str, Set[Hashable]] = {}
+        self._counts = {"l1": 0, "l2": 0, "miss": 0}
+        TwoTierCache._instances[namespace] = self
+        if tags is not None:
+            InvalidationBus.subscribe(self.invalidate_tags)
+
+    def redis_key(self, key: Hashable) -> str:
+        return f"{CACHE_KEY_PREFIX}:{self.namespace}:{key}"
+
+    def tag_key(self, tag: str) -> str:
+        return f"{CACHE_KEY_PREFIX}:{self.namespace}:tag:{tag}"
+
+    def _tags_of(self, key: Hashable, value: Any) -> Tuple[str, ...]:
+        if self.tags is None:
+            return ()
+        try:
+            return tuple(dict.fromkeys(self.tags(key, value)))
+        except Exception:
+            # An untaggable value is still cached; it just expires on its TTL
+            return ()
+
+    @staticmethod
+    def encode(value: Any) -> str:
+        return json_util.dumps(value, json_options=_JSON_OPTIONS)
+
+    @staticmethod
+    def decode(raw: Any) -> Any:
+        return json_util.loads(raw, json_options=_JSON_OPTIONS)
+
+    # ------------------------------------------------------------------ L1
+
+    def _l1_get(self, key: Hashable, now: float) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry[0] <= now:
+            self._l1_pop(key)
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry[1]
+
+    def _l1_set(self, key: Hashable, value: Any, now: float) -> None:
+        self._entries[key] = (now + self.l1_ttl_seconds, value)
+        self._entries.move_to_end(key)
+        if self.tags is not None:
+            self._unindex(key)
+            self._key_tags[key] = self._tags_of(key, value)
+            for tag in self._key_tags[key]:
+                self._tag_keys.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.l1_max_entries:
+            self._l1_pop(next(iter(self._entries)))
+
+    def _unindex(self, key: Hashable) -> None:
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_keys[tag]
+
+    def _l1_pop(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+        self._unindex(key)
+
+    # ------------------------------------------------------------------ reads
+
+    def _count(self, result: str, count: int) -> None:
+        self._counts[result] += count
+        record_cache_lookup(self.namespace, result, count)
+
+    async def _l2_get_many(self, keys: List[Hashable]) -> List[Any]:
+        redis_client = get_redis_pubsub()
+        if redis_client is None:
+            return [None] * len(keys)
+        try:
+            return await redis_client.mget([self.redis_key(key) for key in keys])
+        except Exception as exc:
+            logger.warning(
+                "Cache L2 read failed",
+                extra={"cache": self.namespace, "error": str(exc), "error_type": type(exc).__name__},
+            )
+            return [None] * len(keys)
+
+    async def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """Cached values for the keys found in L1 or L2; L2 hits are promoted to L1."""
+        now = time.monotonic()
+        found: Dict[Hashable, Any] = {}
+        l1_misses: List[Hashable] = []
+        for key in dict.fromkeys(keys):
+            hit, value = self._l1_get(key, now)
+            if hit:
+                found[key] = value
+            else:
+                l1_misses.append(key)
+        self._count("l1", len(found))
+        if not l1_misses:
+            return found
+
+        l2_hits = 0
+        for key, raw in zip(l1_misses, await self._l2_get_many(l1_misses)):
+            if raw is None:
+                continue
+            try:
+                value = self.decode(raw)
+            except Exception:
+                continue
+            self._l1_set(key, value, now)
+            found[key] = value
+            l2_hits += 1
+        self._count("l2", l2_hits)
+        self._count("miss", len(l1_misses) - l2_hits)
+        return found
+
+    async def get(self, key: Hashable) -> Optional[Any]:
+        return (await self.get_many([key])).get(key)
+
+    # ------------------------------------------------------------------ writes
+
+    def _is_older(self, key: Hashable, value: Any, now: float) -> bool:
+        """Whether value is older than the live L1 entry for key (by the version function)."""
+        if self.version is None:
+            return False
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= now:
+            return False
+        current, incoming = self.version(entry[1]), self.version(value)
+        if current is None or incoming is None:
+            return False
+        try:
+            return incoming < current
+        except TypeError:
+            return False
+
+    async def set_many(self, values: Dict[Hashable, Any], l2_ttl_seconds: Optional[int] = None) -> None:
+        """
+        Store values in L1 and, with one pipelined round trip, in L2.
+
+        l2_ttl_seconds overrides the cache's L2 TTL for these values (e.g. prewarmed
+        entries that must survive until kickoff).
+        """
+        now = time.monotonic()
+        values = {
+            key: value
+            for key, value in values.items()
+            if value is not None and not self._is_older(key, value, now)
+        }
+        if not values:
+            return
+        for key, value in values.items():
+            self._l1_set(key, value, now)
+
+        redis_client = get_redis_pubsub()
+        if redis_client is None:
+            return
+        try:
+            ttl = l2_ttl_seconds or self.l2_ttl_seconds
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for key, value in values.items():
+                    pipe.set(self.redis_key(key), self.encode(value), ex=ttl)
+                    for tag in self._key_tags.get(key, ()):
+                        pipe.sadd(self.tag_key(tag), self.redis_key(key))
+                        pipe.expire(self.tag_key(tag), max(ttl, CACHE_TAG_TTL_SECONDS))
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning(
+                "Cache L2 write failed",
+                extra={"cache": self.namespace, "error": str(exc), "error_type": type(exc).__name__},
+            )
+
+    async def set(self, key: Hashable, value: Any) -> None:
+        await self.set_many({key: value})
+
+    async def get_or_load_many(self, keys: Iterable[Hashable], loader: Loader) -> Dict[Hashable, Any]:
+        """
+        Values for all keys, calling loader(missing_keys) once for the keys in neither tier.
+
+        The loader returns a dict of the keys it found; absent keys stay uncached.
+        """
+        keys = list(dict.fromkeys(keys))
+        found = await self.get_many(keys)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            loaded = await loader(missing)
+            await self.set_many(loaded)
+            found.update({key: value for key, value in loaded.items() if value is not None})
+        return found
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Optional[Any]:
+        async def _load_one(_keys: List[Hashable]) -> Dict[Hashable, Any]:
+            return {key: await loader()}
+
+        return (await self.get_or_load_many([key], _load_one)).get(key)
+
+    async def invalidate(self, keys: Iterable[Hashable]) -> None:
+        """Drop keys from this worker's L1 and from L2."""
+        keys = list(keys)
+        for key in keys:
+            self._l1_pop(key)
+        redis_client = get_redis_pubsub()
+        if redis_client is None or not keys:
+            return
+        try:
+            await redis_client.delete(*(self.redis_key(key) for key in keys))
+        except Exception as exc:
+            logger.warning(
+                "Cache L2 delete failed",
+                extra={"cache": self.namespace, "error": str(exc), "error_type": type(exc).__name__},
+            )
+
+    async def invalidate_tags(self, tags: Set[str], local_only: bool = False) -> None:
+        """
+        Drop the entries carrying any of the tags from this worker's L1 and, unless
+        local_only, from L2 (through the tag sets, which are deleted too). With an expire
+        function the entries are rewritten through it instead and stay indexed.
+        """
+        for tag in tags:
+            for key in list(self._tag_keys.get(tag, ())):
+                if self.expire is None:
+                    self._l1_pop(key)
+                else:
+                    deadline, value = self._entries[key]
+                    self._entries[key] = (deadline, self.expire(value))
+        redis_client = get_redis_pubsub()
+        if local_only or redis_client is None or not tags:
+            return
+        tag_keys = [self.tag_key(tag) for tag in tags]
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for tag_key in tag_keys:
+                    pipe.smembers(tag_key)
+                members = await pipe.execute()
+            redis_keys = list({key for keys in members for key in keys or ()})
+            if self.expire is None:
+                await redis_client.delete(*redis_keys, *tag_keys)
+            elif redis_keys:
+                await self._l2_expire(redis_client, redis_keys)
+        except Exception as exc:
+            logger.warning(
+                "Cache L2 tag invalidation failed",
+                extra={"cache": self.namespace, "error": str(exc), "error_type": type(exc).__name__},
+            )
+
+    async def _l2_expire(self, redis_client: Any, redis_keys: List[Any]) -> None:
+        """Rewrite L2 entries through the expire function, keeping their remaining TTL."""
+        raws = await redis_client.mget(redis_keys)
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for redis_key, raw in zip(redis_keys, raws):
+                if raw is None:
+                    continue
+                try:
+                    pipe.set(redis_key, self.encode(self.expire(self.decode(raw))), xx=True, keepttl=True)
+                except Exception:
+                    pipe.delete(redis_key)
+            await pipe.execute()
+
+    def discard_local(self, keys: Iterable[Hashable]) -> None:
+        """Drop keys from this worker's L1 only, so the next read goes to L2."""
+        for key in keys:
+            self._l1_pop(key)
+
+    def clear_local(self) -> None:
+        self._entries.clear()
+        self._key_tags.clear()
+        self._tag_keys.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "namespace": self.namespace,
+            "l1_entries": len(self._entries),
+            "l1_max_entries": self.l1_max_entries,
+            "l1_tags": len(self._tag_keys),
+            **{f"{result}_count": count for result, count in self._counts.items()},
+        }
+
+    @classmethod
+    def all_stats(cls) -> List[Dict[str, Any]]:
+        return [cache.stats() for cache in cls._instances.values()]
@@ -0,0 +1,83 @@
+import os
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.auth import get_current_user
+from app.core.invalidation import INVALIDATION_TAG_KINDS, InvalidationBus, is_valid_tag
+from app.core.query_observer import (
+    QUERY_OBSERVER_TOP_N,
+    QUERY_OBSERVER_WINDOW_SECONDS,
+    QueryObserver,
+)
+from app.schemas.admin_schemas import CacheInvalidationResult, SlowQueryReport
+from app.schemas.responses_schemas import ErrorObject, StandardResponse
+
+router = APIRouter()
+
+
+def _require_admin(current_user: Dict[str, Any]) -> None:
+    """Allow only users listed in the comma-separated ADMIN_EMAILS environment variable."""
+    admin_emails = {
+        email.strip().lower()
+        for email in os.environ.get("ADMIN_EMAILS", "").split(",")
+        if email.strip()
+    }
+    email = (current_user.get("email") or "").lower()
+    if not email or email not in admin_emails:
+        raise HTTPException(status_code=403, detail="Admin access required.")
+
+
+@router.get("/slow-queries", response_model=StandardResponse[SlowQueryReport])
+async def get_slow_queries(
+    top_n: int = Query(QUERY_OBSERVER_TOP_N, ge=1, le=200, description="Number of shapes and samples to return."),
+    window_seconds: int = Query(
+        QUERY_OBSERVER_WINDOW_SECONDS,
+        ge=60,
+        le=24 * 60 * 60,
+        description="Rolling window in seconds.",
+    ),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+) -> StandardResponse[SlowQueryReport]:
+    """
+    Return the slow-query report for this worker.
+
+    - top_shapes: query shapes (collection + filter keys + sort + projection) ranked by
+      total time spent in the window, with p50/p95/max, documents and bytes returned
+    - slowest_queries: individual queries above the slow threshold, slowest first
+    """
+    _require_admin(current_user)
+
+    report = SlowQueryReport(**QueryObserver.report(top_n=top_n, window_seconds=window_seconds))
+    return StandardResponse[SlowQueryReport].success_response(data=report)
+
+
+@router.post("/cache/invalidate", response_model=StandardResponse[CacheInvalidationResult])
+async def invalidate_cache(
+    tags: List[str] = Query(
+        ...,
+        description="Tags to invalidate: fixture:{id}, league:{id}:season:{id}, combo:{id} or player:{id}.",
+    ),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+) -> StandardResponse[CacheInvalidationResult]:
+    """
+    Invalidate cached entries by tag in every worker.
+
+    Use after manual data fixes; the tags are applied here (L1 and L2) and broadcast to
+    the other workers before the response is returned.
+    """
+    _require_admin(current_user)
+
+    invalid = [tag for tag in tags if not is_valid_tag(tag)]
+    if invalid:
+        error = ErrorObject(
+            code="INVALID_CACHE_TAG",
+            message=f"Unknown tags {invalid}; expected one of the kinds {list(INVALIDATION_TAG_KINDS)}.",
+        )
+        return StandardResponse.error_response(errors=[error])
+
+    InvalidationBus.publish(tags)
+    flushed = await InvalidationBus.flush()
+    return StandardResponse[CacheInvalidationResult].success_response(
+        data=CacheInvalidationResult(tags=sorted(flushed))
+    )
@@ -1,15 +1,21 @@
 import asyncio
 import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
-from bson import ObjectId
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from sse_starlette.sse import EventSourceResponse
 
 from app.core.auth import get_current_user_optional
+from app.core.columnar import build_prediction_columns
+from app.core.bson_codecs import string_id_database
 from app.core.redis_pubsub import get_redis_pubsub
 from app.core.database import get_database
+from app.core.encoding import negotiate_response, resolve_prediction_format
+from app.core.instrumented_db import instrument_database
+from app.core.metrics import SSE_CONNECTIONS, channel_label, record_pubsub_message
+from app.core.query_params import parse_id_list
+from app.core.subscription import is_premium_user, tier_label, tier_user
 from app.schemas.fixtures_schemas import (
     FixtureBasic,
     FixtureIdsResponse,
@@ -25,33 +31,46 @@ from app.schemas.fixtures_schemas import (
     FixtureWeatherResponse,
 )
 from app.schemas.predictions_schemas import (
+    BulkFixturePredictionsResponse,
+    ColumnarPredictionList,
+    CompactPredictionList,
     FixturePrediction,
     FixturePredictionList,
     FixturePredictionMinimal,
 )
 from app.schemas.responses_schemas import ErrorObject, StandardResponse
 from app.core.monitoring import get_logger
+from app.services.bulk_predictions import (
+    BULK_PREDICTIONS_MAX_FIXTURES,
+    BULK_PREDICTIONS_MAX_PER_FIXTURE,
+    BulkPredictionsService,
+)
+from app.services.change_ingestion import FIXTURE_CHANGE_CHANNEL, PREDICTION_CHANGE_CHANNEL
+from app.services.dimensions import enrich_fixture_documents
+from app.services.document_cache import (
+    get_fixture_documents,
+    get_fixture_weather_document,
+    put_fixture_documents,
+)
 from app.services.fixtures_service import FixturesService
+from app.services.prediction_catalogue import PredictionCatalogue
+from app.services.response_cache import FIXTURE_LIST_RESPONSE_CACHE, get_fixture_predictions
 
 logger = get_logger(__name__)
 
 router = APIRouter()
 
-def _serialize_document(document: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    """Convert MongoDB document into JSON-friendly dict."""
-    if document is None:
-        return None
-
-    serialized = dict(document)
 
-    if "_id" in serialized and isinstance(serialized["_id"], ObjectId):
-        serialized["_id"] = str(serialized["_id"])
-
-    return serialized
+def _stream_event(channel: Any, update_event: str, change_event: str) -> str:
+    """SSE event name of a pub/sub message: change stream channels get their own event."""
+    if channel_label(channel) in (FIXTURE_CHANGE_CHANNEL, PREDICTION_CHANGE_CHANNEL):
+        return change_event
+    return update_event
 
 
 @router.get("", response_model=StandardResponse[FixturesResponse])
 async def get_fixtures(
+    request: Request,
     fixture_ids: Optional[str] = Query(None, description="Comma-separated fixture IDs for specific fixtures"),
     leagues: Optional[str] = Query(None, description="Comma-separated league IDs. Omit or leave empty for all leagues."),
     match_type: Optional[str] = Query(None, description="Match type filter: 'live', 'upcoming', or 'finished'."),
@@ -73,19 +92,9 @@ async def get_fixtures(
         # Check if fixture_ids were provided
         if fixture_ids:
             # Parse comma-separated fixture IDs
-            try:
-                id_list = [int(id.strip()) for id in fixture_ids.split(",") if id.strip()]
-            except ValueError:
-                raise HTTPException(
-                    status_code=400,
-                    detail="fixture_ids must be comma-separated integers.",
-                )
-
-            if not id_list:
-                raise HTTPException(
-                    status_code=400,
-                    detail="fixture_ids cannot be empty when provided.",
-                )
+            id_list = list(
+                parse_id_list(fixture_ids, empty_message="fixture_ids cannot be empty when provided.")
+            )
 
             logger.debug(
                 "Fetching specific fixtures",
@@ -95,17 +104,11 @@ async def get_fixtures(
                 },
             )
 
-            # Fetch fixtures from fixtures_refactor collection (contains all fixtures including live)
-            db = get_database()
-            db_client = db.client
-            fixtures_db = db_client["fourthofficial_refactor"]
-
-            fixtures_documents: List[Dict[str, Any]] = []
-
-            # Search fixtures_refactor collection
-            cursor = fixtures_db["fixtures_refactor"].find({"_id": {"$in": id_list}})
-            async for doc in cursor:
-                fixtures_documents.append(doc)
+            # Fetch fixtures from fixtures_refactor (contains all fixtures including live);
+            # only IDs missing from the shared fixture cache are read
+            fixtures_documents = await get_fixture_documents(id_list)
+            # Team and league display fields from the dimension cache where not denormalised
+            await enrich_fixture_documents(fixtures_documents)
 
             # Sort by starting_at
             fixtures_documents.sort(key=lambda x: x.get("starting_at", datetime.min))
@@ -118,9 +121,9 @@ async def get_fixtures(
 
             # Return only fixtures (no fixture_ids list)
             data = FixturesResponse(fixtures=fixtures_with_predictions)
-            return StandardResponse[FixturesResponse].success_response(
-                data=data,
-
+            return negotiate_response(
+                request,
+                StandardResponse[FixturesResponse].success_response(data=data),
             )
 
         else:
@@ -144,14 +147,31 @@ async def get_fixtures(
                 },
             )
 
-            # Use new orchestration method
-            return await FixturesService.process_fixtures_with_filters(
-                league_ids=league_ids,
-                match_type=match_type,
-                sort_by=sort_by,
-                date_range=date_range,
-                current_user=_current_user
+            # Use new orchestration method, cached per tier and filter set (default date
+            # ranges are relative to today, so the day is part of the key)
+            cache_key = ":".join(
+                str(part)
+                for part in (
+                    tier_label(_current_user),
+                    ",".join(str(league_id) for league_id in sorted(league_ids or [])),
+                    match_type,
+                    sort_by,
+                    date_from,
+                    date_to,
+                    datetime.utcnow().date(),
+                )
+            )
+            response = await FIXTURE_LIST_RESPONSE_CACHE.get(
+                cache_key,
+                lambda: FixturesService.process_fixtures_with_filters(
+                    league_ids=league_ids,
+                    match_type=match_type,
+                    sort_by=sort_by,
+                    date_range=date_range,
+                    current_user=tier_user(_current_user)
+                ),
             )
+            return negotiate_response(request, response)
     except HTTPException:
         raise
     except Exception as exc:
@@ -175,29 +195,17 @@ async def stream_fixtures(
     2. Open this stream for subsequent updates
     3. Close stream on navigation away
 
-    Channel: fixture_updates:{fixture_id}
-    Event type: fixture_update
+    Channels: fixture_updates:{fixture_id} (event type fixture_update, the match card)
+    and fixture_changes:{fixture_id} (event type fixture_change, change stream events)
     """
     # Parse and validate fixture IDs
-    try:
-        id_list = [int(id.strip()) for id in fixture_ids.split(",") if id.strip()]
-    except ValueError:
-        raise HTTPException(
-            status_code=400,
-            detail="fixture_ids must be comma-separated integers"
-        )
-
-    if not id_list:
-        raise HTTPException(
-            status_code=400,
-            detail="fixture_ids cannot be empty"
-        )
-
-    if len(id_list) > 10:
-        raise HTTPException(
-            status_code=400,
-            detail="Maximum 10 fixture IDs allowed for streaming"
-        )
+    id_list = parse_id_list(
+        fixture_ids,
+        max_ids=10,
+        max_message="Maximum 10 fixture IDs allowed for streaming",
+        invalid_message="fixture_ids must be comma-separated integers",
+        empty_message="fixture_ids cannot be empty",
+    )
 
     logger.debug(
         "SSE stream requested for fixtures",
@@ -211,7 +219,10 @@ async def stream_fixtures(
             return
 
         pubsub = redis_client.pubsub()
-        channels = [f"fixture_updates:{fid}" for fid in id_list]
+        channels = [f"fixture_updates:{fid}" for fid in id_list] + [
+            f"{FIXTURE_CHANGE_CHANNEL}:{fid}" for fid in id_list
+        ]
+        SSE_CONNECTIONS.labels(stream="fixtures").inc()
 
         try:
             await pubsub.subscribe(*channels)
@@ -219,8 +230,9 @@ async def stream_fixtures(
 
             async for message in pubsub.listen():
                 if message["type"] == "message":
+                    record_pubsub_message(message["channel"])
                     yield {
-                        "event": "fixture_update",
+                        "event": _stream_event(message["channel"], "fixture_update", "fixture_change"),
                         "data": message["data"],
                     }
         except asyncio.CancelledError:
@@ -228,6 +240,7 @@ async def stream_fixtures(
         except Exception as e:
             logger.error(f"SSE stream error: {e}")
         finally:
+            SSE_CONNECTIONS.labels(stream="fixtures").dec()
             await pubsub.unsubscribe(*channels)
             await pubsub.close()
             logger.debug(f"Unsubscribed from channels: {channels}")
@@ -242,6 +255,7 @@ async def stream_fixtures(
     description="DEPRECATED: Use GET /fixtures/{fixture_id}/predictions instead.",
 )
 async def list_fixture_predictions(
+    request: Request,
     fixture_id: Optional[int] = Query(None, description="Filter by single fixture ID."),
     fixture_ids: Optional[List[int]] = Query(None, description="Filter by multiple fixture IDs."),
     sort_by: str = Query(
@@ -288,10 +302,71 @@ async def list_fixture_predictions(
             predictions.append(FixturePrediction(**doc))
 
         payload = FixturePredictionList(predictions=predictions)
-        return StandardResponse[FixturePredictionList].success_response(
-            data=payload,
+        return negotiate_response(
+            request,
+            StandardResponse[FixturePredictionList].success_response(
+                data=payload,
+                request_start_time=request_start,
+            ),
+        )
+    except Exception as exc:
+        error = ErrorObject(code="FIXTURE_PREDICTION_ERROR", message=str(exc))
+        return StandardResponse.error_response(
+            errors=[error],
             request_start_time=request_start,
         )
+
+
+@router.get(
+    "/predictions/bulk",
+    response_model=StandardResponse[BulkFixturePredictionsResponse],
+)
+async def get_bulk_fixture_predictions(
+    request: Request,
+    fixture_ids: str = Query(
+        ...,
+        description=f"Comma-separated fixture IDs (max {BULK_PREDICTIONS_MAX_FIXTURES}).",
+    ),
+    per_fixture: int = Query(
+        3,
+        ge=1,
+        le=BULK_PREDICTIONS_MAX_PER_FIXTURE,
+        description="Predictions returned per fixture.",
+    ),
+    sort_by: str = Query(
+        "pct_change",
+        description="Sort field: pct_change, prediction_pre_game, prediction, created_at.",
+    ),
+    sort_order: str = Query("desc", description="Sort direction: asc or desc."),
+    _current_user: Optional[Dict[str, Any]] = get_current_user_optional(),
+) -> StandardResponse[BulkFixturePredictionsResponse]:
+    """
+    Get the top predictions for each of several fixtures in one request.
+
+    Sorting and the per_fixture limit apply within each fixture (unlike the deprecated
+    /fixtures/predictions, which applies one global limit). Fixtures without predictions
+    are returned with an empty list. Non-premium users get each fixture's list masked
+    exactly as /fixtures/{fixture_id}/predictions masks it.
+    """
+    request_start = time.time()
+
+    id_list = list(parse_id_list(fixture_ids, max_ids=BULK_PREDICTIONS_MAX_FIXTURES))
+
+    try:
+        groups = await BulkPredictionsService.get_top_predictions(
+            fixture_ids=id_list,
+            per_fixture=per_fixture,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            current_user=_current_user,
+        )
+        return negotiate_response(
+            request,
+            StandardResponse[BulkFixturePredictionsResponse].success_response(
+                data=BulkFixturePredictionsResponse(fixtures=groups),
+                request_start_time=request_start,
+            ),
+        )
     except Exception as exc:
         error = ErrorObject(code="FIXTURE_PREDICTION_ERROR", message=str(exc))
         return StandardResponse.error_response(
@@ -333,6 +408,7 @@ async def get_all_fixtures_simao(
 
         # Query database for fixtures TODO: simao 
         db, fixtures_db = FixturesService.get_fixtures_database()
+        fixtures_db = instrument_database(fixtures_db)
         cursor = fixtures_db["fixtures_refactor"].find(filters)
 
         if sort_spec:
@@ -344,6 +420,9 @@ async def get_all_fixtures_simao(
         fixtures_documents: List[Dict[str, Any]] = []
         async for doc in cursor:
             fixtures_documents.append(doc)
+        # Later lookups by ID (cards, combos) hit the shared fixture cache
+        await put_fixture_documents(fixtures_documents)
+        await enrich_fixture_documents(fixtures_documents)
 
         # Build and return response using service
         return await FixturesService.build_fixtures_response(
@@ -390,6 +469,7 @@ async def get_fixture_ids_simao(
 
         # Query database for fixture IDs
         db, fixtures_db = FixturesService.get_fixtures_database()
+        fixtures_db = instrument_database(fixtures_db)
         cursor = fixtures_db["fixtures_refactor"].find(filters)
 
         if sort_spec:
@@ -436,21 +516,14 @@ async def list_fixtures_simao(
     request_start = time.time()
 
     try:
-        # Use service method to parse and validate fixture IDs
-        id_list = FixturesService.parse_fixture_ids(fixture_ids, max_ids=6)
+        # Parse and validate fixture IDs (shared, cached parser)
+        id_list = list(parse_id_list(fixture_ids, max_ids=6))
 
         logger.debug("Fetching featured fixtures", extra={"fixture_ids": id_list, "count": len(id_list)})
 
-        # Fetch fixtures from fourthofficial_refactor database
-        # Search both live and finished collections
-        db, fixtures_db = FixturesService.get_fixtures_database()
-
-        fixtures_documents: List[Dict[str, Any]] = []
-
-        # Search fixtures_refactor collection
-        cursor_finished = fixtures_db["fixtures_refactor"].find({"_id": {"$in": id_list}})
-        async for doc in cursor_finished:
-            fixtures_documents.append(doc)
+        # Fetch fixtures from fixtures_refactor (misses only, through the shared fixture cache)
+        fixtures_documents = await get_fixture_documents(id_list)
+        await enrich_fixture_documents(fixtures_documents)
 
         # Sort by starting_at
         fixtures_documents.sort(key=lambda x: x.get("starting_at", datetime.min))
@@ -473,9 +546,10 @@ async def list_fixtures_simao(
 
 @router.get(
     "/{fixture_id}/predictions",
-    response_model=StandardResponse[FixturePredictionList],
+    response_model=StandardResponse[Union[FixturePredictionList, CompactPredictionList, ColumnarPredictionList]],
 )
 async def get_fixture_predictions(
+    request: Request,
     fixture_id: int,
     sort_by: str = Query(
         "pct_change",
@@ -483,8 +557,13 @@ async def get_fixture_predictions(
     ),
     sort_order: str = Query("desc", description="Sort direction: asc or desc."),
     limit: int = Query(100, ge=1, le=500, description="Maximum number of predictions to return."),
+    response_format: str = Query(
+        "full",
+        alias="format",
+        description="Response format: full, compact (items reference GET /predictions/catalogue) or columnar (parallel arrays).",
+    ),
     _current_user: Optional[Dict[str, Any]] = get_current_user_optional(),
-) -> StandardResponse[FixturePredictionList]:
+) -> StandardResponse[Union[FixturePredictionList, CompactPredictionList, ColumnarPredictionList]]:
     """
     Get detailed predictions for a single fixture.
 
@@ -492,37 +571,51 @@ async def get_fixture_predictions(
     with full details, while other predictions have their values obfuscated.
     """
     request_start = time.time()
+    response_format = resolve_prediction_format(response_format)
 
     try:
-        # Use the FixturesService to get predictions with obfuscation applied
-        raw_predictions = await FixturesService.get_fixture_predictions_detailed(
+        # FixturesService predictions (obfuscated for free users, defaults applied),
+        # cached per tier and prewarmed around kickoff
+        predictions = await get_fixture_predictions(
             fixture_id=fixture_id,
-            fixture_ids=None,
             sort_by=sort_by,
             sort_order=sort_order,
             limit=limit,
             current_user=_current_user,
         )
 
-        # Convert to Pydantic models with defaults for optional fields
-        predictions = []
-        for doc in raw_predictions:
-            # Add defaults for optional fields if missing
-            if "created_at" not in doc:
-                doc["created_at"] = datetime.utcnow()
-            if "updated_at" not in doc:
-                doc["updated_at"] = datetime.utcnow()
-            if "prediction_type" not in doc:
-                doc["prediction_type"] = "fixture"
-            if doc.get("pct_change_interval") is None:
-                doc["pct_change_interval"] = 5.0
+        if response_format == "compact":
+            compact = await PredictionCatalogue.compact(predictions, premium=is_premium_user(_current_user))
+            return negotiate_response(
+                request,
+                StandardResponse[CompactPredictionList].success_response(
+                    data=compact,
+                    request_start_time=request_start,
+                ),
+                exclude_none=True,
+            )
 
-            predictions.append(FixturePrediction(**doc))
+        if response_format == "columnar":
+            columns = build_prediction_columns(
+                predictions,
+                catalogue_version=await PredictionCatalogue.get_version(premium=is_premium_user(_current_user)),
+            )
+            return negotiate_response(
+                request,
+                StandardResponse[ColumnarPredictionList].success_response(
+                    data=columns,
+                    request_start_time=request_start,
+                ),
+                exclude_none=True,
+            )
 
-        payload = FixturePredictionList(predictions=predictions)
-        return StandardResponse[FixturePredictionList].success_response(
-            data=payload,
-            request_start_time=request_start,
+        payload = FixturePredictionList(predictions=[FixturePrediction(**doc) for doc in predictions])
+        return negotiate_response(
+            request,
+            StandardResponse[FixturePredictionList].success_response(
+                data=payload,
+                request_start_time=request_start,
+            ),
         )
     except Exception as exc:
         error = ErrorObject(code="FIXTURE_PREDICTION_ERROR", message=str(exc))
@@ -545,8 +638,8 @@ async def stream_fixture_predictions(
     2. Open this stream for subsequent updates
     3. Close stream on navigation away
 
-    Channel: prediction_updates:{fixture_id}
-    Event type: prediction_update
+    Channels: prediction_updates:{fixture_id} (event type prediction_update) and
+    prediction_changes:{fixture_id} (event type prediction_change, change stream events)
     """
     logger.debug(
         "SSE prediction stream requested",
@@ -560,16 +653,18 @@ async def stream_fixture_predictions(
             return
 
         pubsub = redis_client.pubsub()
-        channel = f"prediction_updates:{fixture_id}"
+        channels = [f"prediction_updates:{fixture_id}", f"{PREDICTION_CHANGE_CHANNEL}:{fixture_id}"]
+        SSE_CONNECTIONS.labels(stream="predictions").inc()
 
         try:
-            await pubsub.subscribe(channel)
-            logger.debug(f"Subscribed to channel: {channel}")
+            await pubsub.subscribe(*channels)
+            logger.debug(f"Subscribed to channels: {channels}")
 
             async for message in pubsub.listen():
                 if message["type"] == "message":
+                    record_pubsub_message(message["channel"])
                     yield {
-                        "event": "prediction_update",
+                        "event": _stream_event(message["channel"], "prediction_update", "prediction_change"),
                         "data": message["data"],
                     }
         except asyncio.CancelledError:
@@ -577,9 +672,10 @@ async def stream_fixture_predictions(
         except Exception as e:
             logger.error(f"SSE prediction stream error: {e}")
         finally:
-            await pubsub.unsubscribe(channel)
+            SSE_CONNECTIONS.labels(stream="predictions").dec()
+            await pubsub.unsubscribe(*channels)
             await pubsub.close()
-            logger.debug(f"Unsubscribed from channel: {channel}")
+            logger.debug(f"Unsubscribed from channels: {channels}")
 
     return EventSourceResponse(event_generator())
 
@@ -599,7 +695,7 @@ async def get_fixture_commentary(
         # Get the refactor database for commentary
         db = get_database()
         db_client = db.client
-        fixtures_db = db_client["fourthofficial_refactor"]
+        fixtures_db = instrument_database(db_client["fourthofficial_refactor"])
 
         # Query the commentaries_refactor collection using fixture_id as _id
         document = await fixtures_db["commentaries_refactor"].find_one({"_id": fixture_id})
@@ -655,19 +751,13 @@ async def get_fixture_weather(
     request_start = time.time()
 
     try:
-        # Get the refactor database for weather
-        db = get_database()
-        db_client = db.client
-        fixtures_db = db_client["fourthofficial_refactor"]
-
-        # Query the fixture_weather collection in the refactor database
-        document = await fixtures_db["fixture_weather"].find_one({"fixture_id": fixture_id})
-        document = _serialize_document(document)
+        # fixture_weather document from the refactor database (through the shared cache)
+        document = await get_fixture_weather_document(fixture_id)
 
         if document is None:
             raise HTTPException(status_code=404, detail="Fixture weather not found.")
 
-        weather = FixtureWeather(**document)
+        weather = FixtureWeather.model_validate(document)
         data = FixtureWeatherResponse(weather=weather)
 
         return StandardResponse[FixtureWeatherResponse].success_response(
@@ -699,18 +789,17 @@ async def get_fixture_statistics(
         # Get the refactor database for statistics
         db = get_database()
         db_client = db.client
-        fixtures_db = db_client["fourthofficial_refactor"]
+        fixtures_db = instrument_database(string_id_database(db_client["fourthofficial_refactor"]))
 
         # Query the fixture_statistics collection in the refactor database
         document = await fixtures_db["fixture_statistics"].find_one({"fixture_id": fixture_id})
-        document = _serialize_document(document)
 
         if document is None:
             raise HTTPException(
                 status_code=404, detail="Fixture statistics not found."
             )
 
-        statistics = FixtureStatistics(**document)
+        statistics = FixtureStatistics.model_validate(document)
         data = FixtureStatisticsResponse(statistics=statistics)
 
         return StandardResponse[FixtureStatisticsResponse].success_response(
@@ -1,17 +1,22 @@
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
-from bson import ObjectId
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 
 from app.core.auth import get_current_user_optional
-from app.core.database import get_database
+from app.core.encoding import negotiate_response
+from app.core.instrumented_db import instrument_database
 from app.core.monitoring import get_logger
 from app.schemas.fixtures_schemas import FixtureItem, FixturesResponse
 from app.schemas.leagues_schemas import LeagueCurrentResponse, LeaguesListResponse, LeagueStandingsResponse
 from app.schemas.responses_schemas import ErrorObject, StandardResponse
+from app.services.dimensions import enrich_fixture_documents
+from app.services.document_cache import get_fixture_documents
 from app.services.fixtures_service import FixturesService
 from app.services.leagues_service import LeaguesService
+from app.services.reference_snapshot import ReferenceSnapshot
+from app.services.response_cache import get_standings_response
+from app.services.season_index import SeasonIndex
 
 logger = get_logger(__name__)
 
@@ -30,11 +35,8 @@ async def get_leagues() -> StandardResponse[LeaguesListResponse]:
     try:
         logger.debug("Fetching production leagues")
 
-        # Get database
-        db, leagues_db = LeaguesService.get_leagues_database()
-
-        # Get leagues
-        response = await LeaguesService.get_prod_leagues(leagues_db)
+        # Production leagues from memory (snapshot file at boot, reconciled with MongoDB)
+        response = await ReferenceSnapshot.get_prod_leagues()
 
         logger.info(
             "Successfully fetched production leagues",
@@ -84,6 +86,7 @@ async def get_league_current(
 
         # Get database
         db, leagues_db = LeaguesService.get_leagues_database()
+        leagues_db = instrument_database(leagues_db)
 
         # Build and return response
         response = await LeaguesService.build_current_league_response(
@@ -147,49 +150,15 @@ async def get_league_standings_by_season(
             },
         )
 
-        # Build query
-        query = LeaguesService.build_standings_query(league_id, season_id)
-
-        # Get database
-        db, leagues_db = LeaguesService.get_leagues_database()
-
-        # Fetch standings from standings_refactor collection
-        standings_documents: List[Dict[str, Any]] = []
-        cursor = leagues_db["standings_refactor"].find(query).sort([("position", 1)])
-
-        async for doc in cursor:
-            standings_documents.append(_serialize_document(doc))
-
-        if not standings_documents:
-            logger.info(
-                "No standings found",
-                extra={
-                    "league_id": league_id,
-                    "season_id": season_id,
-                },
-            )
-            # Return empty standings response instead of 404
-            data = LeagueStandingsResponse(
-                league_id=league_id,
-                season_id=season_id,
-                standings=[],
-            )
-            return StandardResponse[LeagueStandingsResponse].success_response(data=data)
-
-        # Build response with standings, form, and next fixtures
-        response = await LeaguesService.build_standings_response(
-            standings_documents=standings_documents,
-            league_id=league_id,
-            season_id=season_id,
-            leagues_db=leagues_db,
-        )
+        # Served from the standings response cache, refreshed ahead of expiry
+        response = await get_standings_response(league_id, season_id)
 
         logger.info(
             "Successfully fetched league standings by season",
             extra={
                 "league_id": league_id,
                 "season_id": season_id,
-                "standings_count": len(standings_documents),
+                "standings_count": len(getattr(response.data, "standings", None) or []),
                 "duration_ms": int((time.time() - request_start) * 1000),
             },
         )
@@ -217,6 +186,7 @@ async def get_league_standings_by_season(
 
 @router.get("/{league_id}/fixtures", response_model=StandardResponse[FixturesResponse])
 async def get_league_fixtures(
+    request: Request,
     league_id: int,
     season_id: int = Query(..., description="Season ID (required)"),
     _current_user: Optional[Dict[str, Any]] = get_current_user_optional(),
@@ -240,32 +210,15 @@ async def get_league_fixtures(
             },
         )
 
-        # Get database to check if season is current
-        db, leagues_db = LeaguesService.get_leagues_database()
-
-        # Look up season to determine if it's current
-        season_doc = await leagues_db["league_season_lookup"].find_one({
-            "league_id": league_id,
-            "season_id": season_id,
-        })
+        # Resolve current-season status from the in-memory season index
+        is_current_season = await SeasonIndex.is_current_season(league_id, season_id)
 
-        if not season_doc:
+        if is_current_season is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"Season {season_id} not found for league {league_id}.",
             )
 
-        is_current_season = season_doc.get("season_is_current", False)
-
-        # If not marked as current, also check by date
-        if not is_current_season:
-            from datetime import datetime
-            today = datetime.utcnow().strftime("%Y-%m-%d")
-            start = season_doc.get("season_starting_at", "")
-            end = season_doc.get("season_ending_at", "")
-            if start and end and start <= today <= end:
-                is_current_season = True
-
         # Get fixture IDs using the service
         fixture_ids = await FixturesService.get_league_fixture_ids(
             league_id=league_id,
@@ -279,19 +232,10 @@ async def get_league_fixtures(
             data = FixturesResponse(fixtures=[])
             return StandardResponse[FixturesResponse].success_response(data=data)
 
-        # Fetch full fixture documents (same pattern as fixtures.py)
-        db = get_database()
-        db_client = db.client
-        fixtures_db = db_client["fourthofficial_refactor"]
-
-        fixtures_documents = []
-        cursor = fixtures_db["fixtures_refactor"].find({"_id": {"$in": fixture_ids}})
-        async for doc in cursor:
-            fixtures_documents.append(doc)
-
-        # Sort fixtures to match the order of fixture_ids
-        fixtures_by_id = {doc["_id"]: doc for doc in fixtures_documents}
-        fixtures_documents = [fixtures_by_id[fid] for fid in fixture_ids if fid in fixtures_by_id]
+        # Fetch full fixture documents in fixture_ids order (misses only, through the
+        # shared fixture cache)
+        fixtures_documents = await get_fixture_documents(fixture_ids)
+        await enrich_fixture_documents(fixtures_documents)
 
         # Build fixtures with predictions (same pattern as fixtures.py - direct call)
         fixtures_with_predictions = await FixturesService.build_fixtures_with_predictions(
@@ -311,7 +255,7 @@ async def get_league_fixtures(
         )
 
         data = FixturesResponse(fixtures=fixtures_with_predictions)
-        return StandardResponse[FixturesResponse].success_response(data=data)
+        return negotiate_response(request, StandardResponse[FixturesResponse].success_response(data=data))
 
     except HTTPException:
         raise
@@ -332,19 +276,6 @@ async def get_league_fixtures(
         return StandardResponse.error_response(errors=[error])
 
 
-def _serialize_document(document: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    """Convert MongoDB document into JSON-friendly dict."""
-    if document is None:
-        return None
-
-    serialized = dict(document)
-
-    if "_id" in serialized and isinstance(serialized["_id"], ObjectId):
-        serialized["_id"] = str(serialized["_id"])
-
-    return serialized
-
-
 @router.get("/standings", response_model=StandardResponse[LeagueStandingsResponse])
 async def get_league_standings(
     league_id: Optional[int] = Query(None, description="League ID (required)"),
@@ -373,49 +304,15 @@ async def get_league_standings(
             },
         )
 
-        # Build query
-        query = LeaguesService.build_standings_query(league_id, season_id)
-
-        # Get database
-        db, leagues_db = LeaguesService.get_leagues_database()
-
-        # Fetch standings from standings_refactor collection
-        standings_documents: List[Dict[str, Any]] = []
-        cursor = leagues_db["standings_refactor"].find(query).sort([("position", 1)])
-
-        async for doc in cursor:
-            standings_documents.append(_serialize_document(doc))
-
-        if not standings_documents:
-            logger.info(
-                "No standings found",
-                extra={
-                    "league_id": league_id,
-                    "season_id": season_id,
-                },
-            )
-            # Return empty standings response instead of 404
-            data = LeagueStandingsResponse(
-                league_id=league_id,
-                season_id=season_id,
-                standings=[],
-            )
-            return StandardResponse[LeagueStandingsResponse].success_response(data=data)
-
-        # Build response with standings, form, and next fixtures
-        response = await LeaguesService.build_standings_response(
-            standings_documents=standings_documents,
-            league_id=league_id,
-            season_id=season_id,
-            leagues_db=leagues_db,
-        )
+        # Served from the standings response cache, refreshed ahead of expiry
+        response = await get_standings_response(league_id, season_id)
 
         logger.info(
             "Successfully fetched league standings",
             extra={
                 "league_id": league_id,
                 "season_id": season_id,
-                "standings_count": len(standings_documents),
+                "standings_count": len(getattr(response.data, "standings", None) or []),
             },
         )
 
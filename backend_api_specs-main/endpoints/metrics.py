@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.core.metrics import METRICS_CONTENT_TYPE, render_metrics
+
+router = APIRouter()
+
+
+@router.get("", include_in_schema=False)
+async def get_metrics() -> Response:
+    """
+    Prometheus scrape endpoint.
+
+    Exposes per-route latency, MongoDB operations and time per request,
+    Redis pub/sub message counts and open SSE connections.
+    """
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
@@ -1,67 +1,105 @@
+import asyncio
 import time
 from datetime import timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Union
 
-from bson import ObjectId
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 
 from app.core.auth import get_current_user_optional
-from app.core.database import get_database
+from app.core.columnar import build_prediction_columns
+from app.core.dataloader import loader_scope
+from app.core.encoding import negotiate_response, resolve_prediction_format
 from app.core.monitoring import get_logger
+from app.core.query_params import parse_optional_int
+from app.core.subscription import is_premium_user
 from app.schemas.players_schemas import (
+    PlayerBundleResponse,
     PlayerResponse,
     PlayerStatisticsGetResponse,
     PlayerSummary,
     PlayerWatchlistEntry,
     PlayerWatchlistResponse,
-    WatchlistPlayerDetail,
     WatchlistPlayerResponse,
 )
 from app.schemas.predictions_schemas import (
+    ColumnarPredictionList,
+    CompactPredictionList,
     PlayerPrediction,
     PlayerPredictionList,
 )
 from app.schemas.responses_schemas import ErrorObject, StandardResponse
+from app.services.loaders import player_season_statistics_loader
+from app.services.player_statistics_cache import PlayerStatisticsCache
 from app.services.players_service import PlayersService
+from app.services.prediction_catalogue import PredictionCatalogue
+from app.services.season_index import SeasonIndex
+from app.services.watchlist_cards import WatchlistCardsService
+from app.services.watchlist_index import WatchlistIndex
 
 logger = get_logger(__name__)
 
 router = APIRouter()
 
 
-def _parse_optional_int(value: Optional[str], param_name: str) -> Optional[int]:
-    if value in (None, "", "null", "None"):
-        return None
-    try:
-        return int(value)
-    except (TypeError, ValueError):
-        raise HTTPException(
-            status_code=400,
-            detail=f"Query parameter '{param_name}' must be an integer.",
-        )
+async def _load_player_statistics(
+    player_id: int,
+    season_id: Optional[int],
+) -> PlayerStatisticsGetResponse:
+    """Resolve the season (if needed) and build grouped statistics for a player.
 
+    Raises a 404 HTTPException when no season or statistics document exists.
+    """
+    # Determine season_id if not provided
+    season_source = "provided"
+    if season_id is None:
+        season_id = await SeasonIndex.get_current_season_id_for_player(player_id)
+        season_source = "current_season_lookup"
 
-def _normalize_id(document: Dict[str, Any]) -> Dict[str, Any]:
-    if "_id" in document and isinstance(document["_id"], ObjectId):
-        document["_id"] = str(document["_id"])
-    return document
+        if season_id is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No statistics found for player {player_id}. Player may not have any recorded seasons."
+            )
 
+        logger.debug(
+            "Season ID determined from lookup",
+            extra={"player_id": player_id, "season_id": season_id, "source": season_source}
+        )
 
-def _resolve_sort(
-    sort_by: Optional[str],
-    sort_order: str,
-    allowed_fields: Dict[str, str],
-    default_field: Optional[str] = None,
-) -> Optional[Tuple[str, int]]:
-    if sort_by is None and default_field is None:
-        return None
+    # Fetch statistics (batched with the other lookups of the request's loader scope)
+    document = await player_season_statistics_loader().load((player_id, season_id))
 
-    field = allowed_fields.get(sort_by, default_field)
-    if field is None:
-        return None
+    if document is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Statistics not found for player {player_id} in season {season_id}."
+        )
 
-    direction = 1 if sort_order.lower() == "asc" else -1
-    return field, direction
+    # Transform to grouped statistics (memoised per document version)
+    grouped_stats = PlayerStatisticsCache.get_grouped_statistics(player_id, season_id, document)
+
+    return PlayerStatisticsGetResponse(
+        player_id=player_id,
+        season_id=season_id,
+        team_id=document.get("team_id"),
+        jersey_number=document.get("jersey_number"),
+        position_id=document.get("position_id"),
+        statistics=grouped_stats,
+        season_source=season_source,
+    )
+
+
+async def _load_player_statistics_optional(
+    player_id: int,
+    season_id: Optional[int],
+) -> Optional[PlayerStatisticsGetResponse]:
+    """Same as _load_player_statistics, but returns None instead of raising 404."""
+    try:
+        return await _load_player_statistics(player_id, season_id)
+    except HTTPException as exc:
+        if exc.status_code != 404:
+            raise
+        return None
 
 
 @router.get("/player", response_model=StandardResponse[PlayerResponse])
@@ -145,8 +183,96 @@ async def get_player(
         )
 
 
-@router.get("/predictions", response_model=StandardResponse[PlayerPredictionList])
+@router.get("/bundle", response_model=StandardResponse[PlayerBundleResponse])
+async def get_player_bundle(
+    player_id: int = Query(..., description="Player ID to fetch."),
+    season_id: Optional[int] = Query(None, description="Season ID for statistics. If not provided, uses current/latest season."),
+    _current_user: Optional[Dict[str, Any]] = get_current_user_optional(),
+) -> StandardResponse[PlayerBundleResponse]:
+    """
+    Return everything the player page needs in a single request.
+
+    Combines the responses of /player and /statistics:
+    - Core player information (same as /player)
+    - Last 10 predictions for the player
+    - Grouped season statistics (null if the player has no recorded statistics)
+
+    The core, predictions and statistics reads are issued concurrently.
+    """
+    request_start = time.time()
+
+    try:
+        logger.debug(
+            "Player bundle endpoint called",
+            extra={"player_id": player_id, "season_id": season_id}
+        )
+
+        with loader_scope():
+            base_player, predictions, statistics = await asyncio.gather(
+                PlayersService.fetch_player_core_by_id(player_id),
+                PlayersService.fetch_recent_player_predictions(
+                    player_id=player_id,
+                    limit=10,
+                    current_user=_current_user,
+                ),
+                _load_player_statistics_optional(player_id, season_id),
+            )
+
+        if base_player is None:
+            logger.info(
+                "Player not found",
+                extra={"player_id": player_id}
+            )
+            raise HTTPException(
+                status_code=404,
+                detail=f"Player with ID {player_id} not found."
+            )
+
+        payload = PlayerBundleResponse(
+            player=PlayerResponse(player=base_player, predictions=predictions),
+            statistics=statistics,
+        )
+
+        logger.debug(
+            "Player bundle endpoint completed",
+            extra={
+                "player_id": player_id,
+                "season_id": statistics.season_id if statistics else None,
+                "predictions_count": len(predictions),
+                "has_statistics": statistics is not None,
+                "duration_ms": round((time.time() - request_start) * 1000, 2),
+            }
+        )
+
+        return StandardResponse[PlayerBundleResponse].success_response(
+            data=payload,
+            request_start_time=request_start,
+        )
+    except HTTPException:
+        raise
+    except Exception as exc:
+        logger.error(
+            "Player bundle endpoint failed",
+            extra={
+                "player_id": player_id,
+                "season_id": season_id,
+                "error": str(exc),
+                "error_type": type(exc).__name__,
+            }
+        )
+        error = ErrorObject(code="PLAYER_BUNDLE_ERROR", message=str(exc))
+        return StandardResponse.error_response(
+            errors=[error],
+            request_start_time=request_start,
+        )
+
+
+@router.get(
+    "/predictions",
+    response_model=StandardResponse[Union[PlayerPredictionList, CompactPredictionList, ColumnarPredictionList]],
+)
 async def list_player_predictions(
+    request: Request,
     player_id: int = Query(..., description="Player ID (required)"),
     sort_by: str = Query(
         "pct_change",
@@ -154,8 +280,13 @@ async def list_player_predictions(
     ),
     sort_order: str = Query("desc", description="Sort direction: asc or desc."),
     limit: int = Query(100, ge=1, le=500, description="Maximum number of predictions to return."),
+    response_format: str = Query(
+        "full",
+        alias="format",
+        description="Response format: full, compact (items reference GET /predictions/catalogue) or columnar (parallel arrays).",
+    ),
     _current_user: Optional[Dict[str, Any]] = get_current_user_optional(),
-) -> StandardResponse[PlayerPredictionList]:
+) -> StandardResponse[Union[PlayerPredictionList, CompactPredictionList, ColumnarPredictionList]]:
     """
     Get detailed player predictions from the last 3 fixtures.
 
@@ -163,6 +294,7 @@ async def list_player_predictions(
     but with obfuscated text (random prediction names, real numeric values).
     """
     request_start = time.time()
+    response_format = resolve_prediction_format(response_format)
 
     try:
         # Use the PlayersService to get predictions with text obfuscation applied
@@ -174,7 +306,7 @@ async def list_player_predictions(
             current_user=_current_user,
         )
 
-        # Convert to Pydantic models with defaults for optional fields
+        # Apply defaults for optional fields before building full or compact items
         from datetime import datetime
         predictions = []
         for doc in raw_predictions:
@@ -188,9 +320,34 @@ async def list_player_predictions(
             if doc.get("pct_change_interval") is None:
                 doc["pct_change_interval"] = 5.0
 
-            predictions.append(PlayerPrediction(**doc))
+            predictions.append(doc)
+
+        if response_format == "compact":
+            compact = await PredictionCatalogue.compact(predictions, premium=is_premium_user(_current_user))
+            return negotiate_response(
+                request,
+                StandardResponse[CompactPredictionList].success_response(
+                    data=compact,
+                    request_start_time=request_start,
+                ),
+                exclude_none=True,
+            )
 
-        payload = PlayerPredictionList(predictions=predictions)
+        if response_format == "columnar":
+            columns = build_prediction_columns(
+                predictions,
+                catalogue_version=await PredictionCatalogue.get_version(premium=is_premium_user(_current_user)),
+            )
+            return negotiate_response(
+                request,
+                StandardResponse[ColumnarPredictionList].success_response(
+                    data=columns,
+                    request_start_time=request_start,
+                ),
+                exclude_none=True,
+            )
+
+        payload = PlayerPredictionList(predictions=[PlayerPrediction(**doc) for doc in predictions])
         return StandardResponse[PlayerPredictionList].success_response(
             data=payload,
             request_start_time=request_start,
@@ -236,51 +393,14 @@ async def get_player_statistics(
             extra={"player_id": player_id, "season_id": season_id}
         )
 
-        # Determine season_id if not provided
-        season_source = "provided"
-        if season_id is None:
-            season_id = await PlayersService.get_current_season_id_for_player(player_id)
-            season_source = "current_season_lookup"
-
-            if season_id is None:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"No statistics found for player {player_id}. Player may not have any recorded seasons."
-                )
-
-            logger.debug(
-                "Season ID determined from lookup",
-                extra={"player_id": player_id, "season_id": season_id, "source": season_source}
-            )
-
-        # Fetch statistics
-        document = await PlayersService.fetch_player_season_statistics(player_id, season_id)
-
-        if document is None:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Statistics not found for player {player_id} in season {season_id}."
-            )
-
-        # Transform to grouped statistics
-        grouped_stats = PlayersService.transform_to_grouped_statistics(document)
-
-        payload = PlayerStatisticsGetResponse(
-            player_id=player_id,
-            season_id=season_id,
-            team_id=document.get("team_id"),
-            jersey_number=document.get("jersey_number"),
-            position_id=document.get("position_id"),
-            statistics=grouped_stats,
-            season_source=season_source,
-        )
+        payload = await _load_player_statistics(player_id, season_id)
 
         logger.debug(
             "Player statistics endpoint completed",
             extra={
                 "player_id": player_id,
-                "season_id": season_id,
-                "season_source": season_source,
+                "season_id": payload.season_id,
+                "season_source": payload.season_source,
                 "duration_ms": round((time.time() - request_start) * 1000, 2),
             }
         )
@@ -315,7 +435,7 @@ async def list_player_watchlist(
     day: Optional[int] = Query(None, description="Filter by day of year."),
     sort_by: Optional[str] = Query(
         "year",
-        description="Sort field: year or day.",
+        description="Sort field: year or day. Fallback entries are always newest first.",
     ),
     sort_order: str = Query("desc", description="Sort direction asc or desc."),
     limit: int = Query(100, ge=1, le=500, description="Maximum number of records to return."),
@@ -326,6 +446,9 @@ async def list_player_watchlist(
 
     If the exact date is not found, the endpoint will return the most recent
     available data with a warning message for monitoring purposes.
+
+    Entries are served from the in-memory WatchlistIndex; there is at most one
+    entry per day, so sort_by/sort_order do not change the result.
     """
     request_start = time.time()
 
@@ -338,62 +461,31 @@ async def list_player_watchlist(
             year = year or now.year
             day = day or now.timetuple().tm_yday
 
-        db = get_database()
-        db_client = db.client
-        players_db = db_client["fourthofficial_refactor"]
-        collection = players_db["players_watchlist_temp"]
-
-        # Build filters
-        filters: Dict[str, Any] = {"year": year, "day": day}
-        player_id_int = _parse_optional_int(player_id, "player_id")
-        if player_id_int is not None:
-            filters["player_ids"] = player_id_int
-
-        # Try to find exact match first
-        cursor = collection.find(filters)
-
-        sort_tuple = _resolve_sort(
-            sort_by,
-            sort_order,
-            {
-                "year": "year",
-                "day": "day",
-            },
-            default_field="year",
-        )
-        if sort_tuple:
-            cursor = cursor.sort(*sort_tuple)
-        cursor = cursor.limit(limit)
+        player_id_int = parse_optional_int(player_id, "player_id")
 
         entries: List[PlayerWatchlistEntry] = []
         warning: Optional[str] = None
 
-        async for document in cursor:
-            normalized = _normalize_id(document)
-            entries.append(PlayerWatchlistEntry(**normalized))
+        # Exact date (and fallback below) are resolved from the in-memory watchlist index
+        exact_entry = await WatchlistIndex.get_entry(year, day, player_id=player_id_int)
+        if exact_entry is not None:
+            entries.append(PlayerWatchlistEntry(**exact_entry))
 
-        # If no exact match found, try to find the most recent available data
+        # If no exact match found, use the most recent available data
         if not entries:
             logger.warning(
                 "No watchlist entry found for exact date, falling back to most recent",
                 extra={"year": year, "day": day}
             )
 
-            # Find the most recent entry before the requested date
-            fallback_filters: Dict[str, Any] = {
-                "$or": [
-                    {"year": year, "day": {"$lt": day}},
-                    {"year": {"$lt": year}}
-                ]
-            }
-            if player_id_int is not None:
-                fallback_filters["player_ids"] = player_id_int
-
-            fallback_cursor = collection.find(fallback_filters).sort([("year", -1), ("day", -1)]).limit(limit)
-
-            async for document in fallback_cursor:
-                normalized = _normalize_id(document)
-                entries.append(PlayerWatchlistEntry(**normalized))
+            fallback_entries = await WatchlistIndex.get_entries_before(
+                year,
+                day,
+                player_id=player_id_int,
+                limit=limit,
+            )
+            for document in fallback_entries:
+                entries.append(PlayerWatchlistEntry(**document))
 
             # Set warning message if we found fallback data
             if entries:
@@ -445,69 +537,8 @@ async def watchlist_tmp(
     request_start = time.time()
 
     try:
-        from datetime import datetime
-
-        # Get current year and day of year
-        now = datetime.now()
-        current_year = now.year
-        current_day = now.timetuple().tm_yday
-
-        db = get_database()
-
-        # Aggregation pipeline to join watchlist, players, and statistics
-        pipeline = [
-            # Match today's watchlist entries
-            {
-                "$match": {
-                    "year": 2024,
-                    "day": 16,
-                }
-            },
-            # Limit to 1 watchlist document (should only be one per day anyway)
-            {"$limit": 1},
-            # Unwind the player_ids array to get individual player IDs
-            {"$unwind": "$player_ids"},
-            # Limit to 20 players
-            {"$limit": 20},
-            # Lookup player details
-            {
-                "$lookup": {
-                    "from": "temp_players",
-                    "localField": "player_ids",
-                    "foreignField": "player_id",
-                    "as": "player_info"
-                }
-            },
-            # Lookup player career statistics
-            {
-                "$lookup": {
-                    "from": "temp_player_statistics",
-                    "localField": "player_ids",
-                    "foreignField": "player_id",
-                    "as": "player_stats"
-                }
-            },
-            # Unwind player info and stats (should be 1 each)
-            {"$unwind": {"path": "$player_info", "preserveNullAndEmptyArrays": True}},
-            {"$unwind": {"path": "$player_stats", "preserveNullAndEmptyArrays": True}},
-            # Project the fields we need
-            {
-                "$project": {
-                    "player_id": "$player_ids",
-                    "display_name": "$player_info.display_name",
-                    "position_id": "$player_info.position_id",
-                    "nationality_id": "$player_info.nationality_id",
-                    "image_path": "$player_info.head_shot_location",
-                    "minutes_played": "$player_stats.basic.minutes_played",
-                    "appearances": "$player_stats.basic.games",
-                    "goals": "$player_stats.basic.goals",
-                    "assists": "$player_stats.basic.assists",
-                }
-            }
-        ]
-        players: List[WatchlistPlayerDetail] = []
-        async for document in await db.temp_players_watchlist.aggregate(pipeline):
-            players.append(WatchlistPlayerDetail(**document))
+        # Cards are materialised by WatchlistCardsService in the background
+        players = await WatchlistCardsService.get_cards(*WatchlistCardsService.served_day())
 
         payload = WatchlistPlayerResponse(players=players)
         return StandardResponse[WatchlistPlayerResponse].success_response(
@@ -1,40 +1,70 @@
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Union
 
-from bson import ObjectId
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, Query, Request, Response
 
 from app.core.auth import get_current_user_optional
+from app.core.bson_codecs import string_id_database
+from app.core.columnar import build_prediction_columns
 from app.core.database import get_database
+from app.core.encoding import negotiate_response, resolve_prediction_format
+from app.core.instrumented_db import instrument_database
+from app.core.query_params import PREDICTION_SORT, SMART_COMBO_PREDICTION_FILTER
+from app.core.subscription import is_premium_user
 from app.schemas.predictions_schemas import (
+    ColumnarPredictionList,
+    CompactPredictionList,
+    PredictionCatalogueResponse,
     SmartComboPrediction,
     SmartComboPredictionList,
 )
 from app.schemas.responses_schemas import ErrorObject, StandardResponse
 from app.schemas.schemas import SubscriptionTier
+from app.services.prediction_catalogue import PredictionCatalogue
 
 router = APIRouter()
 
 
-def _normalize_id(document: Dict[str, Any]) -> Dict[str, Any]:
-    if "_id" in document and isinstance(document["_id"], ObjectId):
-        document["_id"] = str(document["_id"])
-    return document
+@router.get("/catalogue", response_model=StandardResponse[PredictionCatalogueResponse])
+async def get_prediction_catalogue(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    _current_user: Optional[Dict[str, Any]] = get_current_user_optional(),
+):
+    """
+    Prediction definitions and interned reasons referenced by format=compact responses.
+
+    The catalogue depends on the caller's tier and changes rarely: send the ETag back in
+    If-None-Match to get a 304, and refetch when a compact response carries a different
+    catalogue_version.
+    """
+    request_start = time.time()
 
+    try:
+        catalogue, etag = await PredictionCatalogue.get_catalogue(premium=is_premium_user(_current_user))
+        headers = {"ETag": etag, "Cache-Control": "private, max-age=300", "Vary": "Authorization"}
+        if if_none_match is not None and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
 
-def _resolve_sort(
-    sort_by: str,
-    sort_order: str,
-    allowed_fields: Dict[str, str],
-    default_field: str,
-) -> Tuple[str, int]:
-    field = allowed_fields.get(sort_by, default_field)
-    direction = 1 if sort_order.lower() == "asc" else -1
-    return field, direction
+        response.headers.update(headers)
+        return StandardResponse[PredictionCatalogueResponse].success_response(
+            data=catalogue,
+            request_start_time=request_start,
+        )
+    except Exception as exc:
+        error = ErrorObject(code="PREDICTION_CATALOGUE_ERROR", message=str(exc))
+        return StandardResponse.error_response(
+            errors=[error],
+            request_start_time=request_start,
+        )
 
 
-@router.get("/smart-combos", response_model=StandardResponse[SmartComboPredictionList])
+@router.get(
+    "/smart-combos",
+    response_model=StandardResponse[Union[SmartComboPredictionList, CompactPredictionList, ColumnarPredictionList]],
+)
 async def list_smart_combo_predictions(
+    request: Request,
     fixture_id: Optional[int] = Query(None, description="Filter by fixture ID."),
     combo_id: Optional[int] = Query(None, description="Filter by combo ID."),
     sort_by: str = Query(
@@ -43,41 +73,55 @@ async def list_smart_combo_predictions(
     ),
     sort_order: str = Query("desc", description="Sort direction asc or desc."),
     limit: int = Query(100, ge=1, le=500, description="Maximum number of records to return."),
+    response_format: str = Query(
+        "full",
+        alias="format",
+        description="Response format: full, compact (items reference GET /predictions/catalogue) or columnar (parallel arrays).",
+    ),
     _current_user: Optional[Dict[str, Any]] = get_current_user_optional(),
-) -> StandardResponse[SmartComboPredictionList]:
+) -> StandardResponse[Union[SmartComboPredictionList, CompactPredictionList, ColumnarPredictionList]]:
     request_start = time.time()
+    response_format = resolve_prediction_format(response_format)
 
     try:
-        filters: Dict[str, Any] = {}
-        if fixture_id is not None:
-            filters["fixture_id"] = fixture_id
-        if combo_id is not None:
-            filters["combo_id"] = combo_id
-
-        sort_field, sort_direction = _resolve_sort(
-            sort_by,
-            sort_order,
-            {
-                "pct_change": "pct_change_value",
-                "prediction_pre_game": "pre_game_prediction",
-                "prediction": "prediction",
-                "created_at": "created_at",
-            },
-            "pct_change_value",
-        )
+        filters = SMART_COMBO_PREDICTION_FILTER.build(fixture_id=fixture_id, combo_id=combo_id)
+        sort_field, sort_direction = PREDICTION_SORT.resolve(sort_by, sort_order)
 
-        db = get_database()
+        db = instrument_database(string_id_database(get_database()))
         cursor = (
             db.temp_smart_combo_predictions.find(filters)
             .sort(sort_field, sort_direction)
             .limit(limit)
         )
 
-        predictions: List[SmartComboPrediction] = []
-        async for document in cursor:
-            normalized = _normalize_id(document)
-            predictions.append(SmartComboPrediction(**normalized))
+        documents: List[Dict[str, Any]] = [document async for document in cursor]
+
+        if response_format == "compact":
+            compact = await PredictionCatalogue.compact(documents, premium=is_premium_user(_current_user))
+            return negotiate_response(
+                request,
+                StandardResponse[CompactPredictionList].success_response(
+                    data=compact,
+                    request_start_time=request_start,
+                ),
+                exclude_none=True,
+            )
+
+        if response_format == "columnar":
+            columns = build_prediction_columns(
+                documents,
+                catalogue_version=await PredictionCatalogue.get_version(premium=is_premium_user(_current_user)),
+            )
+            return negotiate_response(
+                request,
+                StandardResponse[ColumnarPredictionList].success_response(
+                    data=columns,
+                    request_start_time=request_start,
+                ),
+                exclude_none=True,
+            )
 
+        predictions = [SmartComboPrediction(**document) for document in documents]
         payload = SmartComboPredictionList(predictions=predictions)
         return StandardResponse[SmartComboPredictionList].success_response(
             data=payload,
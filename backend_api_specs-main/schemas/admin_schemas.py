@@ -0,0 +1,49 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class QueryShapeStats(BaseModel):
+    """Aggregated timings for one MongoDB query shape."""
+
+    fingerprint: str
+    shape: Dict[str, Any]
+    window_count: int
+    window_total_ms: float
+    window_p50_ms: float
+    window_p95_ms: float
+    window_max_ms: float
+    lifetime_count: int
+    lifetime_avg_ms: float
+    lifetime_max_ms: float
+    avg_documents: float
+    avg_bytes: int
+
+
+class SlowQuerySample(BaseModel):
+    """A single query slower than the slow-query threshold."""
+
+    fingerprint: str
+    collection: str
+    operation: str
+    duration_ms: float
+    documents: int
+    bytes: Optional[int] = None
+    route: Optional[str] = None
+    at: float
+
+
+class SlowQueryReport(BaseModel):
+    """Response for GET /admin/slow-queries."""
+
+    window_seconds: float
+    slow_threshold_ms: float
+    shapes_tracked: int
+    top_shapes: List[QueryShapeStats] = Field(default_factory=list)
+    slowest_queries: List[SlowQuerySample] = Field(default_factory=list)
+
+
+class CacheInvalidationResult(BaseModel):
+    """Response for POST /admin/cache/invalidate."""
+
+    tags: List[str] = Field(default_factory=list)
@@ -153,3 +153,10 @@ class WatchlistPlayerResponse(BaseModel):
     """Wrapper for watchlist player details results."""
 
     players: List[WatchlistPlayerDetail]
+
+
+class PlayerBundleResponse(BaseModel):
+    """Player page payload: core info, recent predictions and season statistics."""
+
+    player: PlayerResponse
+    statistics: Optional[PlayerStatisticsGetResponse] = None
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -30,6 +30,19 @@ class FixturePredictionList(BaseModel):
     predictions: List[FixturePrediction]
 
 
+class FixturePredictionsGroup(BaseModel):
+    """Top predictions for one fixture in a bulk response."""
+
+    fixture_id: int
+    predictions: List[FixturePrediction]
+
+
+class BulkFixturePredictionsResponse(BaseModel):
+    """Payload returned by /fixtures/predictions/bulk, in the order the IDs were requested."""
+
+    fixtures: List[FixturePredictionsGroup]
+
+
 class PlayerPrediction(BaseModel):
     """Prediction details tied to a player."""
 
@@ -146,3 +159,69 @@ class SmartComboCurrentResponse(BaseModel):
 
     combo: SmartComboSummary
     fixtures: List[SmartComboFixturePredictions]
+
+
+class PredictionDefinition(BaseModel):
+    """Catalogue entry shared by every prediction with the same prediction_id."""
+
+    prediction_id: int
+    prediction_display_name: str
+    prediction_type: str
+    source: str
+
+
+class PredictionCatalogueResponse(BaseModel):
+    """Payload returned by /predictions/catalogue. Reason IDs index into `reasons`."""
+
+    version: str
+    definitions: List[PredictionDefinition]
+    reasons: List[str] = Field(default_factory=list)
+
+
+class CompactPrediction(BaseModel):
+    """
+    Prediction item for format=compact.
+
+    prediction_display_name and prediction_type are omitted when they match the catalogue
+    entry for prediction_id; integer reasons are indexes into the catalogue reasons.
+    """
+
+    fixture_id: Optional[int] = None
+    player_id: Optional[int] = None
+    combo_id: Optional[int] = None
+    created_at: datetime
+    updated_at: datetime
+    prediction_id: int
+    prediction_display_name: Optional[str] = None
+    prediction_type: Optional[str] = None
+    pre_game_prediction: float
+    pre_game_prediction_reasons: List[Union[int, str]] = Field(default_factory=list)
+    prediction: Optional[float] = None
+    prediction_reasons: Optional[List[Union[int, str]]] = None
+    pct_change_value: Optional[float] = None
+    pct_change_interval: float
+
+
+class CompactPredictionList(BaseModel):
+    """Wrapper for format=compact prediction lists, tagged with the catalogue version used."""
+
+    catalogue_version: str
+    predictions: List[CompactPrediction]
+
+
+class ColumnarPredictionList(BaseModel):
+    """
+    Prediction list for format=columnar: parallel arrays, one entry per prediction.
+
+    Names are not repeated; resolve prediction_id through /predictions/catalogue.
+    """
+
+    catalogue_version: Optional[str] = None
+    count: int
+    prediction_id: List[int]
+    fixture_id: Optional[List[int]] = None
+    player_id: Optional[List[int]] = None
+    combo_id: Optional[List[int]] = None
+    pre_game_prediction: List[Optional[float]]
+    prediction: List[Optional[float]]
+    pct_change_value: List[Optional[float]]
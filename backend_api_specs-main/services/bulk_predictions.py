@@ -0,0 +1,157 @@
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.core.bson_codecs import string_id_database
+from app.core.database import get_database
+from app.core.instrumented_db import instrument_database
+from app.core.monitoring import get_logger
+from app.core.query_params import PREDICTION_SORT
+from app.core.subscription import is_premium_user
+from app.schemas.predictions_schemas import FixturePrediction, FixturePredictionsGroup
+from app.services.response_cache import get_fixture_predictions
+
+logger = get_logger(__name__)
+
+# Maximum fixture IDs per bulk request (one match listing page)
+BULK_PREDICTIONS_MAX_FIXTURES = 60
+# Maximum predictions returned per fixture
+BULK_PREDICTIONS_MAX_PER_FIXTURE = 20
+# $topN needs MongoDB 5.2+; set MONGO_SUPPORTS_TOPN=false to use $sort/$group/$slice
+BULK_PREDICTIONS_USE_TOPN = os.getenv("MONGO_SUPPORTS_TOPN", "true").lower() == "true"
+
+FIXTURE_PREDICTIONS_COLLECTION = "fixture_predictions"
+
+_PREDICTION_FIELDS = {
+    "_id": 1,
+    "fixture_id": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "prediction_type": 1,
+    "prediction_id": 1,
+    "prediction_display_name": 1,
+    "pre_game_prediction": 1,
+    "pre_game_prediction_reasons": 1,
+    "prediction": 1,
+    "prediction_reasons": 1,
+    "pct_change_value": 1,
+    "pct_change_interval": 1,
+}
+
+
+class BulkPredictionsService:
+    """
+    Top-K predictions per fixture for many fixtures in one aggregation.
+
+    Replaces one /fixtures/{fixture_id}/predictions call per match card. With an index on
+    {fixture_id: 1, <sort field>: -1} the $match + $sort stages walk the index and the
+    grouping stage keeps at most K documents per fixture.
+    """
+
+    @staticmethod
+    def build_pipeline(
+        fixture_ids: List[int],
+        sort_field: str,
+        sort_direction: int,
+        per_fixture: int,
+        use_top_n: bool = BULK_PREDICTIONS_USE_TOPN,
+    ) -> List[Dict[str, Any]]:
+        match = {"$match": {"fixture_id": {"$in": fixture_ids}}}
+        if use_top_n:
+            return [
+                match,
+                # Only the response fields reach the accumulator and the result batches
+                {"$project": _PREDICTION_FIELDS},
+                {
+                    "$group": {
+                        "_id": "$fixture_id",
+                        "predictions": {
+                            "$topN": {
+                                "n": per_fixture,
+                                "sortBy": {sort_field: sort_direction, "prediction_id": 1},
+                                "output": "$$ROOT",
+                            }
+                        },
+                    }
+                },
+            ]
+        return [
+            match,
+            {"$sort": {"fixture_id": 1, sort_field: sort_direction, "prediction_id": 1}},
+            {"$project": _PREDICTION_FIELDS},
+            {"$group": {"_id": "$fixture_id", "predictions": {"$push": "$$ROOT"}}},
+            {"$project": {"predictions": {"$slice": ["$predictions", per_fixture]}}},
+        ]
+
+    @staticmethod
+    def _apply_defaults(doc: Dict[str, Any]) -> Dict[str, Any]:
+        if "created_at" not in doc:
+            doc["created_at"] = datetime.utcnow()
+        if "updated_at" not in doc:
+            doc["updated_at"] = datetime.utcnow()
+        if "prediction_type" not in doc:
+            doc["prediction_type"] = "fixture"
+        if doc.get("pct_change_interval") is None:
+            doc["pct_change_interval"] = 5.0
+        return doc
+
+    @classmethod
+    async def get_top_predictions(
+        cls,
+        fixture_ids: List[int],
+        per_fixture: int,
+        sort_by: str,
+        sort_order: str,
+        current_user: Optional[Dict[str, Any]],
+    ) -> List[FixturePredictionsGroup]:
+        """
+        Top `per_fixture` predictions for each fixture, in the order of fixture_ids.
+
+        Premium users get one aggregation over every fixture. Masking for other users
+        lives in FixturesService only, so their groups are the per-fixture lists of
+        /fixtures/{fixture_id}/predictions (tier-cached), cut to per_fixture.
+        """
+        started = time.time()
+        if not is_premium_user(current_user):
+            lists = await asyncio.gather(
+                *(
+                    get_fixture_predictions(fixture_id, sort_by, sort_order, per_fixture, current_user)
+                    for fixture_id in fixture_ids
+                )
+            )
+            return [
+                FixturePredictionsGroup(
+                    fixture_id=fixture_id,
+                    predictions=[FixturePrediction(**doc) for doc in documents[:per_fixture]],
+                )
+                for fixture_id, documents in zip(fixture_ids, lists)
+            ]
+
+        sort_field, sort_direction = PREDICTION_SORT.resolve(sort_by, sort_order)
+
+        db = get_database()
+        fixtures_db = instrument_database(string_id_database(db.client["fourthofficial_refactor"]))
+        pipeline = cls.build_pipeline(fixture_ids, sort_field, sort_direction, per_fixture)
+
+        grouped: Dict[int, List[FixturePrediction]] = {}
+        async for group in await fixtures_db[FIXTURE_PREDICTIONS_COLLECTION].aggregate(pipeline):
+            predictions: List[FixturePrediction] = []
+            for doc in group.get("predictions", []):
+                predictions.append(FixturePrediction(**cls._apply_defaults(doc)))
+            grouped[group["_id"]] = predictions
+
+        logger.debug(
+            "Bulk fixture predictions fetched",
+            extra={
+                "fixture_count": len(fixture_ids),
+                "fixtures_with_predictions": len(grouped),
+                "per_fixture": per_fixture,
+                "duration_ms": int((time.time() - started) * 1000),
+            },
+        )
+        return [
+            FixturePredictionsGroup(fixture_id=fixture_id, predictions=grouped.get(fixture_id, []))
+            for fixture_id in fixture_ids
+        ]
@@ -0,0 +1,368 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.core.database import get_database
+from app.core.invalidation import (
+    InvalidationBus,
+    combo_tag,
+    fixture_tag,
+    league_season_tag,
+    player_tag,
+)
+from app.core.monitoring import get_logger
+from app.core.redis_pubsub import get_redis_pubsub
+
+logger = get_logger(__name__)
+
+# Database whose collections are watched (one change stream, one resume token)
+CHANGE_STREAM_DATABASE = "fourthofficial_refactor"
+# Collection holding the resume token, keyed by CHANGE_STREAM_NAME
+CHANGE_STREAM_TOKEN_COLLECTION = "change_stream_resume_tokens"
+CHANGE_STREAM_NAME = "refactor_ingestion"
+# Collections whose writes invalidate caches or feed the SSE channels
+FIXTURE_COLLECTION = "fixtures_refactor"
+PREDICTION_COLLECTIONS = ("fixture_predictions", "player_predictions")
+STANDINGS_COLLECTION = "standings_refactor"
+COMBO_COLLECTIONS = ("smart_combos", "smart_combo_predictions")
+# The resume token is saved at most this often (and on shutdown); a restart replays at
+# most this window, which is harmless since every event is idempotent
+CHANGE_STREAM_TOKEN_SAVE_SECONDS = 1.0
+# One worker consumes the stream: Redis lock lifetime, renewed every third of it
+CHANGE_STREAM_LOCK_KEY = "change_stream:refactor_ingestion"
+CHANGE_STREAM_LOCK_SECONDS = 30
+# Wait before reconnecting (or retrying the lock) after the stream stops
+CHANGE_STREAM_RETRY_SECONDS = 5
+# How long an idle stream waits for changes before checking the lock and token
+CHANGE_STREAM_MAX_AWAIT_MS = 1000
+# Deletes carry no fullDocument: request pre-images (MongoDB 6.0+) so a deleted
+# prediction, standings row or combo still names its entities. Set
+# MONGO_CHANGE_STREAM_PRE_IMAGES=false for older servers
+CHANGE_STREAM_PRE_IMAGES = os.getenv("MONGO_CHANGE_STREAM_PRE_IMAGES", "true").lower() == "true"
+# Server errors meaning the stored token cannot be resumed from (history lost, invalid)
+_UNRESUMABLE_CODES = {136, 260, 280, 286}
+
+# SSE channels of the change events: {channel}:{fixture_id}. They are separate from
+# fixture_updates / prediction_updates, whose documented match card payloads come from
+# other writers; CHANGE_EVENT_VERSION is bumped when the change payload changes shape
+FIXTURE_CHANGE_CHANNEL = "fixture_changes"
+PREDICTION_CHANGE_CHANNEL = "prediction_changes"
+CHANGE_EVENT_VERSION = 1
+
+# Fixture fields carried by fixture_change events (the match card's live fields)
+FIXTURE_EVENT_FIELDS = (
+    "league_id",
+    "season_id",
+    "starting_at",
+    "home_team_id",
+    "away_team_id",
+    "home_team_score",
+    "away_team_score",
+    "minutes_elapsed",
+    "is_live",
+    "is_finished",
+    "updated_at",
+)
+# Prediction fields carried by prediction_change events. Values are left out: the
+# channels are not tier-aware, so clients refetch /fixtures/{fixture_id}/predictions
+PREDICTION_EVENT_FIELDS = ("prediction_id", "prediction_type", "player_id", "updated_at")
+# Fields read from fullDocument (updateLookup) or fullDocumentBeforeChange to derive tags and events
+_PROJECTED_FIELDS = sorted(
+    set(FIXTURE_EVENT_FIELDS) | set(PREDICTION_EVENT_FIELDS) | {"fixture_id", "combo_id"}
+)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class ChangeStreamIngestor:
+    """
+    Turns writes in the refactor database into cache invalidations and SSE events.
+
+    One change stream watches fixtures_refactor, the prediction collections,
+    standings_refactor and the smart combo collections. For every change:
+
+    - the tags of the entities it touches go to InvalidationBus (fixture:{id},
+      league:{id}:season:{id}, combo:{id}, player:{id}), so cached entries are dropped
+      in every worker as soon as the write lands;
+    - fixture and prediction changes are published, normalised and versioned, on
+      fixture_changes:{fixture_id} and prediction_changes:{fixture_id}, which the SSE
+      routes relay as fixture_change / prediction_change events.
+
+    One worker consumes the stream at a time (Redis lock). The resume token is stored in
+    CHANGE_STREAM_TOKEN_COLLECTION, so a restarted or newly elected consumer continues
+    where the last one stopped. Change streams need a replica set; a single-node
+    replica set is enough locally (see benchmarks/change_stream_probe.py).
+
+    A delete has no fullDocument. Fixture deletes are tagged from documentKey; every
+    other collection needs the pre-image, which the server only records for collections
+    with changeStreamPreAndPostImages enabled (collMod). Without it such deletes
+    invalidate nothing and the cached entries expire on their TTL.
+    """
+
+    _task: Optional[asyncio.Task] = None
+    _owner = f"{os.getpid()}:{uuid.uuid4().hex}"
+
+    @staticmethod
+    def _database() -> Any:
+        # Raw handle: change events are not serialised to clients, and resume tokens
+        # must round-trip unchanged
+        return get_database().client[CHANGE_STREAM_DATABASE]
+
+    @staticmethod
+    def pipeline() -> List[Dict[str, Any]]:
+        collections = [FIXTURE_COLLECTION, STANDINGS_COLLECTION, *PREDICTION_COLLECTIONS, *COMBO_COLLECTIONS]
+        return [
+            {
+                "$match": {
+                    "ns.coll": {"$in": collections},
+                    "operationType": {"$in": ["insert", "update", "replace", "delete"]},
+                }
+            },
+            {
+                "$project": {
+                    "operationType": 1,
+                    "ns": 1,
+                    "documentKey": 1,
+                    "updateDescription.updatedFields": 1,
+                    **{f"fullDocument.{field}": 1 for field in _PROJECTED_FIELDS},
+                    **{f"fullDocumentBeforeChange.{field}": 1 for field in _PROJECTED_FIELDS},
+                }
+            },
+        ]
+
+    # ------------------------------------------------------------------ normalisation
+
+    @staticmethod
+    def _document(change: Dict[str, Any]) -> Dict[str, Any]:
+        # Deletes only have the pre-image (when the collection records them)
+        return change.get("fullDocument") or change.get("fullDocumentBeforeChange") or {}
+
+    @classmethod
+    def tags_for(cls, change: Dict[str, Any]) -> Set[str]:
+        """Invalidation tags of the entities a change touches."""
+        collection = change.get("ns", {}).get("coll")
+        document = cls._document(change)
+        document_id = change.get("documentKey", {}).get("_id")
+        tags: Set[str] = set()
+        if collection == FIXTURE_COLLECTION:
+            tags.add(fixture_tag(document_id))
+        elif collection in PREDICTION_COLLECTIONS:
+            if document.get("fixture_id") is not None:
+                tags.add(fixture_tag(document["fixture_id"]))
+            if document.get("player_id") is not None:
+                tags.add(player_tag(document["player_id"]))
+        elif collection == STANDINGS_COLLECTION:
+            if document.get("league_id") is not None and document.get("season_id") is not None:
+                tags.add(league_season_tag(document["league_id"], document["season_id"]))
+        elif collection in COMBO_COLLECTIONS:
+            if document.get("combo_id") is not None:
+                tags.add(combo_tag(document["combo_id"]))
+        return tags
+
+    @classmethod
+    def event_for(cls, change: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """(channel, payload) of the SSE event for a change, if it has one."""
+        collection = change.get("ns", {}).get("coll")
+        operation = change.get("operationType")
+        document = cls._document(change)
+        updated_fields = sorted((change.get("updateDescription") or {}).get("updatedFields") or {})
+
+        if collection == FIXTURE_COLLECTION:
+            fixture_id = change.get("documentKey", {}).get("_id")
+            return f"{FIXTURE_CHANGE_CHANNEL}:{fixture_id}", {
+                "version": CHANGE_EVENT_VERSION,
+                "type": "fixture",
+                "operation": operation,
+                "fixture_id": fixture_id,
+                "updated_fields": updated_fields,
+                "fixture": {field: document.get(field) for field in FIXTURE_EVENT_FIELDS if field in document},
+                "sent_at": time.time(),
+            }
+        if collection in PREDICTION_COLLECTIONS and document.get("fixture_id") is not None:
+            # Deleted predictions carry a fixture_id only through their pre-image
+            fixture_id = document["fixture_id"]
+            return f"{PREDICTION_CHANGE_CHANNEL}:{fixture_id}", {
+                "version": CHANGE_EVENT_VERSION,
+                "type": "prediction",
+                "operation": operation,
+                "fixture_id": fixture_id,
+                "updated_fields": updated_fields,
+                "prediction": {field: document.get(field) for field in PREDICTION_EVENT_FIELDS if field in document},
+                "sent_at": time.time(),
+            }
+        return None
+
+    @classmethod
+    async def handle(cls, change: Dict[str, Any]) -> None:
+        """Invalidate and publish for one change event."""
+        InvalidationBus.publish(cls.tags_for(change))
+
+        event = cls.event_for(change)
+        redis_client = get_redis_pubsub()
+        if event is None or redis_client is None:
+            return
+        channel, payload = event
+        try:
+            await redis_client.publish(channel, json.dumps(payload, default=_json_default))
+        except Exception as exc:
+            logger.warning(
+                "Change event publish failed",
+                extra={"channel": channel, "error": str(exc), "error_type": type(exc).__name__},
+            )
+
+    # ------------------------------------------------------------------ resume tokens
+
+    @classmethod
+    async def load_resume_token(cls) -> Optional[Dict[str, Any]]:
+        document = await cls._database()[CHANGE_STREAM_TOKEN_COLLECTION].find_one({"_id": CHANGE_STREAM_NAME})
+        return document.get("token") if document else None
+
+    @classmethod
+    async def save_resume_token(cls, token: Optional[Dict[str, Any]]) -> None:
+        if token is None:
+            return
+        await cls._database()[CHANGE_STREAM_TOKEN_COLLECTION].update_one(
+            {"_id": CHANGE_STREAM_NAME},
+            {"$set": {"token": token, "updated_at": datetime.utcnow()}},
+            upsert=True,
+        )
+
+    @classmethod
+    async def clear_resume_token(cls) -> None:
+        await cls._database()[CHANGE_STREAM_TOKEN_COLLECTION].delete_one({"_id": CHANGE_STREAM_NAME})
+
+    # ------------------------------------------------------------------ leadership
+
+    @classmethod
+    async def _hold_lock(cls) -> bool:
+        """Take or renew the consumer lock. True while this worker is the consumer."""
+        redis_client = get_redis_pubsub()
+        if redis_client is None:
+            return True
+        try:
+            if await redis_client.set(CHANGE_STREAM_LOCK_KEY, cls._owner, nx=True, ex=CHANGE_STREAM_LOCK_SECONDS):
+                return True
+            owner = await redis_client.get(CHANGE_STREAM_LOCK_KEY)
+            if isinstance(owner, bytes):
+                owner = owner.decode()
+            if owner != cls._owner:
+                return False
+            await redis_client.expire(CHANGE_STREAM_LOCK_KEY, CHANGE_STREAM_LOCK_SECONDS)
+            return True
+        except Exception:
+            # Without the lock every worker consumes; events are idempotent
+            return True
+
+    @classmethod
+    async def _release_lock(cls) -> None:
+        redis_client = get_redis_pubsub()
+        if redis_client is None:
+            return
+        try:
+            owner = await redis_client.get(CHANGE_STREAM_LOCK_KEY)
+            if isinstance(owner, bytes):
+                owner = owner.decode()
+            if owner == cls._owner:
+                await redis_client.delete(CHANGE_STREAM_LOCK_KEY)
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------ consumer
+
+    @classmethod
+    async def consume(cls) -> None:
+        """Follow the change stream until the lock is lost or the stream fails."""
+        token = await cls.load_resume_token()
+        saved_token, saved_at = token, time.monotonic()
+        renewed_at = time.monotonic()
+        options: Dict[str, Any] = {}
+        if CHANGE_STREAM_PRE_IMAGES:
+            options["full_document_before_change"] = "whenAvailable"
+        async with cls._database().watch(
+            cls.pipeline(),
+            full_document="updateLookup",
+            resume_after=token,
+            max_await_time_ms=CHANGE_STREAM_MAX_AWAIT_MS,
+            **options,
+        ) as stream:
+            logger.info("Change stream opened", extra={"resumed": token is not None})
+            try:
+                while stream.alive:
+                    change = await stream.try_next()
+                    if change is not None:
+                        await cls.handle(change)
+
+                    now = time.monotonic()
+                    token = stream.resume_token
+                    if token != saved_token and now - saved_at >= CHANGE_STREAM_TOKEN_SAVE_SECONDS:
+                        await cls.save_resume_token(token)
+                        saved_token, saved_at = token, now
+                    if now - renewed_at >= CHANGE_STREAM_LOCK_SECONDS / 3:
+                        if not await cls._hold_lock():
+                            logger.warning("Change stream lock lost; handing over")
+                            return
+                        renewed_at = now
+            finally:
+                if stream.resume_token != saved_token:
+                    await cls.save_resume_token(stream.resume_token)
+
+    @classmethod
+    async def _run(cls) -> None:
+        while True:
+            try:
+                if await cls._hold_lock():
+                    await cls.consume()
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as exc:
+                if exc.code in _UNRESUMABLE_CODES:
+                    # Changes since the stored token are gone: start from now and let
+                    # entries written meanwhile expire on their TTL
+                    logger.error(
+                        "Change stream resume token rejected; restarting from now",
+                        extra={"code": exc.code, "error": str(exc)},
+                    )
+                    await cls.clear_resume_token()
+                    continue
+                logger.error(
+                    "Change stream failed",
+                    extra={"code": exc.code, "error": str(exc), "error_type": type(exc).__name__},
+                )
+            except PyMongoError as exc:
+                logger.warning(
+                    "Change stream interrupted",
+                    extra={"error": str(exc), "error_type": type(exc).__name__},
+                )
+            except Exception as exc:
+                logger.error(
+                    "Change stream ingestion failed",
+                    extra={"error": str(exc), "error_type": type(exc).__name__},
+                )
+            await asyncio.sleep(CHANGE_STREAM_RETRY_SECONDS)
+
+    @classmethod
+    async def start(cls) -> None:
+        """Start following the change stream (in one worker at a time). Call from app startup."""
+        if cls._task is None or cls._task.done():
+            cls._task = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+        await cls._release_lock()
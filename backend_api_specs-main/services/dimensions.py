@@ -0,0 +1,121 @@
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.core.monitoring import get_logger
+from app.services.reference_tables import ReferenceTables
+
+logger = get_logger(__name__)
+
+# Decoded rows kept per worker, across all dimensions
+DIMENSION_CACHE_MAX_ENTRIES = 20000
+
+# Display fields filled on fixture documents: (document field, dimension, id field, column)
+FIXTURE_DIMENSION_FIELDS: Tuple[Tuple[str, str, str, str], ...] = (
+    ("home_team_name", "teams", "home_team_id", "name"),
+    ("home_team_short_code", "teams", "home_team_id", "short_code"),
+    ("home_team_image_path", "teams", "home_team_id", "image_path"),
+    ("away_team_name", "teams", "away_team_id", "name"),
+    ("away_team_short_code", "teams", "away_team_id", "short_code"),
+    ("away_team_image_path", "teams", "away_team_id", "image_path"),
+    ("league_name", "leagues", "league_id", "league_name"),
+)
+# Display fields filled on standings_refactor rows
+STANDING_DIMENSION_FIELDS: Tuple[Tuple[str, str, str, str], ...] = (
+    ("team_name", "teams", "team_id", "name"),
+    ("team_logo", "teams", "team_id", "image_path"),
+)
+
+
+class DimensionCache:
+    """
+    Per-worker cache resolving team, league, country and position IDs to display fields.
+
+    Rows come from the shared ReferenceTables and are kept decoded in a bounded LRU
+    (including misses, so unknown IDs are not searched again). The cache is dropped
+    whenever a new generation of the tables is attached.
+    """
+
+    _rows: "OrderedDict[Tuple[str, Any], Optional[Dict[str, Any]]]" = OrderedDict()
+    _generation = 0
+
+    @classmethod
+    async def resolve(cls, dimension: str, ids: Iterable[Any]) -> Dict[Any, Dict[str, Any]]:
+        """Rows for the IDs found in a dimension (teams, leagues, countries, positions)."""
+        await ReferenceTables.ensure_loaded()
+        generation = ReferenceTables.generation()
+        if generation != cls._generation:
+            cls._rows.clear()
+            cls._generation = generation
+
+        found: Dict[Any, Dict[str, Any]] = {}
+        missing = []
+        for entity_id in dict.fromkeys(ids):
+            if entity_id is None:
+                continue
+            key = (dimension, entity_id)
+            if key in cls._rows:
+                cls._rows.move_to_end(key)
+                row = cls._rows[key]
+                if row is not None:
+                    found[entity_id] = row
+            else:
+                missing.append(entity_id)
+
+        if missing:
+            loaded = await ReferenceTables.get_many(dimension, missing)
+            for entity_id in missing:
+                row = loaded.get(entity_id)
+                cls._rows[(dimension, entity_id)] = row
+                if row is not None:
+                    found[entity_id] = row
+            while len(cls._rows) > DIMENSION_CACHE_MAX_ENTRIES:
+                cls._rows.popitem(last=False)
+        return found
+
+    @classmethod
+    async def enrich(
+        cls,
+        documents: Iterable[Dict[str, Any]],
+        fields: Tuple[Tuple[str, str, str, str], ...],
+    ) -> None:
+        """
+        Fill display fields that are missing, null or empty on the documents, in place.
+
+        IDs are resolved with one lookup per dimension for the whole batch; values already
+        on a document are kept.
+        """
+        documents = list(documents)
+        wanted: Dict[str, set] = {}
+        for doc in documents:
+            for field, dimension, id_field, _ in fields:
+                if not doc.get(field) and doc.get(id_field) is not None:
+                    wanted.setdefault(dimension, set()).add(doc[id_field])
+        if not wanted:
+            return
+
+        try:
+            resolved = {dimension: await cls.resolve(dimension, ids) for dimension, ids in wanted.items()}
+        except Exception as exc:
+            # Serve the documents as stored rather than failing the request
+            logger.warning(
+                "Dimension lookup failed",
+                extra={"error": str(exc), "error_type": type(exc).__name__},
+            )
+            return
+        for doc in documents:
+            for field, dimension, id_field, column in fields:
+                if doc.get(field):
+                    continue
+                row = resolved.get(dimension, {}).get(doc.get(id_field))
+                if row is not None and row.get(column) is not None:
+                    doc[field] = row[column]
+
+
+async def enrich_fixture_documents(documents: Iterable[Dict[str, Any]]) -> None:
+    """Fill team names, short codes, logos and league names on fixture documents."""
+    await DimensionCache.enrich(documents, FIXTURE_DIMENSION_FIELDS)
+
+
+async def enrich_standings_documents(documents: Iterable[Dict[str, Any]]) -> None:
+    """Fill team names and logos on standings rows."""
+    await DimensionCache.enrich(documents, STANDING_DIMENSION_FIELDS)
@@ -0,0 +1,164 @@
+import asyncio
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from app.core.bson_codecs import string_id_database
+from app.core.database import get_database
+from app.core.instrumented_db import instrument_database
+from app.core.invalidation import fixture_tag, league_season_tag, player_tag
+from app.core.two_tier_cache import TwoTierCache
+from app.services.players_service import PlayersService
+
+
+def _updated_at(document: Dict[str, Any]) -> Any:
+    return document.get("updated_at")
+
+
+def _fixture_tags(fixture_id: Hashable, _document: Any) -> Iterable[str]:
+    return (fixture_tag(fixture_id),)
+
+
+def _league_season_tags(key: Hashable, _value: Any) -> Iterable[str]:
+    # key: "{league_id}:{season_id}"
+    return (league_season_tag(*str(key).split(":", 1)),)
+
+
+def _player_tags(key: Hashable, _value: Any) -> Iterable[str]:
+    # key: "{player_id}:{season_id}"
+    return (player_tag(str(key).split(":", 1)[0]),)
+
+
+# Fixture documents by fixture ID, versioned by updated_at. Live fixtures change every
+# few seconds, so both tiers stay short-lived
+FIXTURE_DOCUMENT_CACHE = TwoTierCache(
+    "fixture",
+    l1_max_entries=5000,
+    l1_ttl_seconds=5,
+    l2_ttl_seconds=15,
+    version=_updated_at,
+    tags=_fixture_tags,
+)
+# Standings rows per league/season, rewritten after each match
+STANDINGS_CACHE = TwoTierCache(
+    "standings",
+    l1_max_entries=500,
+    l1_ttl_seconds=60,
+    l2_ttl_seconds=5 * 60,
+    tags=_league_season_tags,
+)
+# fixture_weather documents; forecasts are refreshed a few times a day
+FIXTURE_WEATHER_CACHE = TwoTierCache(
+    "fixture_weather",
+    l1_max_entries=2000,
+    l1_ttl_seconds=10 * 60,
+    l2_ttl_seconds=30 * 60,
+)
+# Raw season statistics documents per player/season
+PLAYER_SEASON_STATISTICS_CACHE = TwoTierCache(
+    "player_season_statistics",
+    l1_max_entries=5000,
+    l1_ttl_seconds=5 * 60,
+    l2_ttl_seconds=30 * 60,
+    tags=_player_tags,
+)
+# Concurrent PlayersService reads for statistics missing from the cache
+PLAYER_STATISTICS_MISS_CONCURRENCY = 8
+
+
+def _fixtures_database():
+    return instrument_database(string_id_database(get_database().client["fourthofficial_refactor"]))
+
+
+async def get_fixture_documents(fixture_ids: List[int]) -> List[Dict[str, Any]]:
+    """
+    fixtures_refactor documents for the given IDs (in request order, missing IDs skipped).
+
+    Only IDs missing from both cache tiers are read, with a single $in, so a list whose
+    fixtures are all hot costs no fixture reads. Returned documents are shallow copies,
+    since the FixturesService builders annotate them.
+    """
+
+    async def _load(missing: List[Hashable]) -> Dict[Hashable, Any]:
+        cursor = _fixtures_database()["fixtures_refactor"].find({"_id": {"$in": missing}})
+        return {doc["_id"]: doc async for doc in cursor}
+
+    found = await FIXTURE_DOCUMENT_CACHE.get_or_load_many(fixture_ids, _load)
+    return [dict(found[fixture_id]) for fixture_id in fixture_ids if fixture_id in found]
+
+
+async def put_fixture_documents(documents: List[Dict[str, Any]]) -> None:
+    """Store fixture documents read elsewhere; older versions than the cached ones are ignored."""
+    # Copies: callers go on to hand their documents to builders that annotate them
+    await FIXTURE_DOCUMENT_CACHE.set_many({doc["_id"]: dict(doc) for doc in documents if "_id" in doc})
+
+
+async def warm_fixture_documents(fixture_ids: List[int], l2_ttl_seconds: Optional[int] = None) -> int:
+    """
+    Re-read fixture documents and store them, with l2_ttl_seconds instead of the cache's
+    L2 TTL when given. Returns the number found.
+    """
+    cursor = _fixtures_database()["fixtures_refactor"].find({"_id": {"$in": fixture_ids}})
+    documents = {doc["_id"]: doc async for doc in cursor}
+    await FIXTURE_DOCUMENT_CACHE.set_many(documents, l2_ttl_seconds=l2_ttl_seconds)
+    return len(documents)
+
+
+async def get_fixture_weather_document(fixture_id: int, warm: bool = False) -> Optional[Dict[str, Any]]:
+    """fixture_weather document for a fixture; warm=True re-reads it from MongoDB."""
+
+    async def _load() -> Optional[Dict[str, Any]]:
+        return await _fixtures_database()["fixture_weather"].find_one({"fixture_id": fixture_id})
+
+    if warm:
+        document = await _load()
+        await FIXTURE_WEATHER_CACHE.set(fixture_id, document)
+        return document
+    return await FIXTURE_WEATHER_CACHE.get_or_load(fixture_id, _load)
+
+
+async def get_standings_documents(
+    leagues_db: Any,
+    league_id: int,
+    season_id: int,
+    query: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """standings_refactor rows for a league season ordered by position (shallow copies)."""
+
+    async def _load() -> Optional[List[Dict[str, Any]]]:
+        cursor = leagues_db["standings_refactor"].find(query).sort([("position", 1)])
+        # Empty standings are not cached: the season may be about to start
+        return [doc async for doc in cursor] or None
+
+    documents = await STANDINGS_CACHE.get_or_load(f"{league_id}:{season_id}", _load)
+    return [dict(doc) for doc in documents or []]
+
+
+async def fetch_player_season_statistics(player_id: int, season_id: int) -> Optional[Dict[str, Any]]:
+    """PlayersService.fetch_player_season_statistics through the two-tier cache."""
+    return await PLAYER_SEASON_STATISTICS_CACHE.get_or_load(
+        f"{player_id}:{season_id}",
+        lambda: PlayersService.fetch_player_season_statistics(player_id, season_id),
+    )
+
+
+async def fetch_player_season_statistics_many(
+    player_seasons: List[Tuple[int, int]],
+) -> Dict[Tuple[int, int], Dict[str, Any]]:
+    """
+    Season statistics documents for many (player_id, season_id) pairs.
+
+    Cached pairs are read with one MGET; misses go through PlayersService (at most
+    PLAYER_STATISTICS_MISS_CONCURRENCY at a time) and are written back in one pipeline.
+    """
+    keys = {f"{player_id}:{season_id}": (player_id, season_id) for player_id, season_id in player_seasons}
+    semaphore = asyncio.Semaphore(PLAYER_STATISTICS_MISS_CONCURRENCY)
+
+    async def _fetch(key: Hashable) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            return await PlayersService.fetch_player_season_statistics(*keys[key])
+
+    async def _load(missing: List[Hashable]) -> Dict[Hashable, Any]:
+        documents = await asyncio.gather(*(_fetch(key) for key in missing))
+        return dict(zip(missing, documents))
+
+    found = await PLAYER_SEASON_STATISTICS_CACHE.get_or_load_many(keys, _load)
+    return {keys[key]: document for key, document in found.items()}
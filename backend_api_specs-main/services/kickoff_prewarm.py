@@ -0,0 +1,256 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.bson_codecs import string_id_database
+from app.core.database import get_database
+from app.core.instrumented_db import instrument_database
+from app.core.monitoring import get_logger
+from app.core.redis_pubsub import get_redis_pubsub
+from app.schemas.schemas import SubscriptionTier
+from app.services.document_cache import get_fixture_weather_document, warm_fixture_documents
+from app.services.response_cache import get_fixture_predictions, get_standings_response
+
+logger = get_logger(__name__)
+
+# How often upcoming kickoffs are polled
+KICKOFF_PREWARM_POLL_SECONDS = 60
+# Fixtures are kept warm from this long before kickoff...
+KICKOFF_PREWARM_LEAD_SECONDS = 15 * 60
+# ...until this long after it (the first wave of match page traffic)
+KICKOFF_PREWARM_TRAIL_SECONDS = 5 * 60
+# L2 TTL for prewarmed fixture documents that have not kicked off: outlives the next poll.
+# Started fixtures are live and keep the fixture cache's own L2 TTL.
+KICKOFF_PREWARM_FIXTURE_TTL_SECONDS = 3 * KICKOFF_PREWARM_POLL_SECONDS
+# Fixtures warmed concurrently
+KICKOFF_PREWARM_CONCURRENCY = 4
+# Cross-worker lock so one worker warms per poll
+KICKOFF_PREWARM_LOCK_KEY = "prewarm:kickoff"
+# Weather is warmed once per fixture: its marker lasts the whole kickoff window
+KICKOFF_PREWARM_WEATHER_MARKER_SECONDS = KICKOFF_PREWARM_LEAD_SECONDS + KICKOFF_PREWARM_TRAIL_SECONDS
+# Standings of a league season are warmed again once their marker expires
+KICKOFF_PREWARM_STANDINGS_MARKER_SECONDS = KICKOFF_PREWARM_LEAD_SECONDS
+
+# Default query of the match page's prediction list: (sort_by, sort_order, limit)
+_DEFAULT_PREDICTION_QUERY = ("pct_change", "desc", 100)
+# One representative user per tier (free users are anonymous or non-premium)
+_TIER_USERS: Tuple[Optional[Dict[str, Any]], ...] = (
+    None,
+    {"subscription_tier": SubscriptionTier.PREMIUM.value},
+)
+_FIXTURE_PROJECTION = {"_id": 1, "league_id": 1, "season_id": 1, "starting_at": 1}
+
+
+class KickoffPrewarmScheduler:
+    """
+    Keeps the caches behind the match-day routes warm around kickoff.
+
+    Every KICKOFF_PREWARM_POLL_SECONDS one worker (Redis lock) reads fixtures_refactor
+    for fixtures kicking off within KICKOFF_PREWARM_LEAD_SECONDS (or started less than
+    KICKOFF_PREWARM_TRAIL_SECONDS ago) and refreshes:
+
+    - the fixture documents (/fixtures?fixture_ids=..., one $in)
+    - the default prediction list for both tiers (/fixtures/{fixture_id}/predictions)
+    - weather, once per fixture
+    - standings of the fixtures' league seasons, once per window
+
+    The once-per markers are Redis keys (SET NX with a TTL next to the lock), since the
+    lock can go to a different worker on every poll; without Redis they are kept in
+    process. Everything is written to the shared L2, so every worker's first request is
+    an L2 hit.
+    """
+
+    _weather_warmed: Dict[int, datetime] = {}
+    _standings_warmed: Dict[Tuple[int, int], float] = {}
+    _task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    async def _acquire_lock() -> bool:
+        redis_client = get_redis_pubsub()
+        if redis_client is None:
+            return True
+        try:
+            return bool(
+                await redis_client.set(
+                    KICKOFF_PREWARM_LOCK_KEY, "1", nx=True, ex=max(1, KICKOFF_PREWARM_POLL_SECONDS - 5)
+                )
+            )
+        except Exception:
+            return True
+
+    @staticmethod
+    async def _claim_marker(key: str, ttl_seconds: int) -> Optional[bool]:
+        """SET NX the marker: True if claimed, False if already set, None without Redis."""
+        redis_client = get_redis_pubsub()
+        if redis_client is None:
+            return None
+        try:
+            return bool(await redis_client.set(key, "1", nx=True, ex=ttl_seconds))
+        except Exception:
+            return None
+
+    @staticmethod
+    async def _release_marker(key: str) -> None:
+        """Drop a marker whose warm-up failed, so the next poll retries it."""
+        redis_client = get_redis_pubsub()
+        if redis_client is None:
+            return
+        try:
+            await redis_client.delete(key)
+        except Exception:
+            pass
+
+    @staticmethod
+    async def upcoming_fixtures(now: datetime) -> List[Dict[str, Any]]:
+        db = instrument_database(string_id_database(get_database().client["fourthofficial_refactor"]))
+        cursor = db["fixtures_refactor"].find(
+            {
+                "starting_at": {
+                    "$gte": now - timedelta(seconds=KICKOFF_PREWARM_TRAIL_SECONDS),
+                    "$lte": now + timedelta(seconds=KICKOFF_PREWARM_LEAD_SECONDS),
+                }
+            },
+            _FIXTURE_PROJECTION,
+        )
+        return [doc async for doc in cursor]
+
+    @staticmethod
+    def _before_kickoff(fixture: Dict[str, Any], now: datetime) -> bool:
+        kickoff = fixture.get("starting_at")
+        return isinstance(kickoff, datetime) and kickoff > now
+
+    @classmethod
+    async def _warm_fixture(cls, fixture: Dict[str, Any], semaphore: asyncio.Semaphore) -> int:
+        fixture_id = fixture["_id"]
+        sort_by, sort_order, limit = _DEFAULT_PREDICTION_QUERY
+        warmed = 0
+        async with semaphore:
+            for user in _TIER_USERS:
+                await get_fixture_predictions(fixture_id, sort_by, sort_order, limit, user, warm=True)
+                warmed += 1
+            kickoff = fixture.get("starting_at")
+            marker = f"{KICKOFF_PREWARM_LOCK_KEY}:weather:{fixture_id}:{kickoff}"
+            claimed = await cls._claim_marker(marker, KICKOFF_PREWARM_WEATHER_MARKER_SECONDS)
+            if claimed is None:
+                claimed = cls._weather_warmed.get(fixture_id) != kickoff
+            if claimed:
+                try:
+                    await get_fixture_weather_document(fixture_id, warm=True)
+                except Exception:
+                    await cls._release_marker(marker)
+                    raise
+                cls._weather_warmed[fixture_id] = kickoff
+                warmed += 1
+        return warmed
+
+    @classmethod
+    async def _warm_standings(cls, league_season: Tuple[int, int], semaphore: asyncio.Semaphore) -> int:
+        marker = f"{KICKOFF_PREWARM_LOCK_KEY}:standings:{league_season[0]}:{league_season[1]}"
+        claimed = await cls._claim_marker(marker, KICKOFF_PREWARM_STANDINGS_MARKER_SECONDS)
+        if claimed is None:
+            claimed = league_season not in cls._standings_warmed
+        if not claimed:
+            return 0
+        try:
+            async with semaphore:
+                await get_standings_response(league_season[0], league_season[1], warm=True)
+        except Exception:
+            await cls._release_marker(marker)
+            raise
+        cls._standings_warmed[league_season] = time.monotonic()
+        return 1
+
+    @classmethod
+    def _prune(cls, now: datetime) -> None:
+        cutoff = now - timedelta(seconds=KICKOFF_PREWARM_TRAIL_SECONDS)
+        cls._weather_warmed = {
+            fixture_id: kickoff
+            for fixture_id, kickoff in cls._weather_warmed.items()
+            if kickoff is None or kickoff >= cutoff
+        }
+        expiry = time.monotonic() - KICKOFF_PREWARM_LEAD_SECONDS
+        cls._standings_warmed = {
+            key: warmed_at for key, warmed_at in cls._standings_warmed.items() if warmed_at >= expiry
+        }
+
+    @classmethod
+    async def warm_once(cls) -> Dict[str, int]:
+        """Warm everything for fixtures in the kickoff window. Returns counts per kind."""
+        started = time.time()
+        now = datetime.utcnow()
+        cls._prune(now)
+        idle = {"fixtures": 0, "entries": 0, "standings": 0, "failures": 0}
+        if not await cls._acquire_lock():
+            return idle
+
+        fixtures = await cls.upcoming_fixtures(now)
+        if not fixtures:
+            return idle
+
+        upcoming = [fixture["_id"] for fixture in fixtures if cls._before_kickoff(fixture, now)]
+        started = [fixture["_id"] for fixture in fixtures if not cls._before_kickoff(fixture, now)]
+        if upcoming:
+            await warm_fixture_documents(upcoming, l2_ttl_seconds=KICKOFF_PREWARM_FIXTURE_TTL_SECONDS)
+        if started:
+            await warm_fixture_documents(started)
+
+        league_seasons = {
+            (fixture["league_id"], fixture["season_id"])
+            for fixture in fixtures
+            if fixture.get("league_id") is not None and fixture.get("season_id") is not None
+        }
+        semaphore = asyncio.Semaphore(KICKOFF_PREWARM_CONCURRENCY)
+        results = await asyncio.gather(
+            *(cls._warm_fixture(fixture, semaphore) for fixture in fixtures),
+            *(cls._warm_standings(league_season, semaphore) for league_season in league_seasons),
+            return_exceptions=True,
+        )
+        failures = [result for result in results if isinstance(result, Exception)]
+        for failure in failures[:5]:
+            logger.warning(
+                "Kickoff prewarm step failed",
+                extra={"error": str(failure), "error_type": type(failure).__name__},
+            )
+
+        counts = {
+            "fixtures": len(fixtures),
+            "entries": sum(result for result in results if isinstance(result, int)),
+            "standings": len(league_seasons),
+            "failures": len(failures),
+        }
+        logger.info(
+            "Kickoff prewarm completed",
+            extra={**counts, "duration_ms": int((time.time() - started) * 1000)},
+        )
+        return counts
+
+    @classmethod
+    async def _loop(cls, interval_seconds: float) -> None:
+        while True:
+            try:
+                await cls.warm_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.error(
+                    "Kickoff prewarm failed",
+                    extra={"error": str(exc), "error_type": type(exc).__name__},
+                )
+            await asyncio.sleep(interval_seconds)
+
+    @classmethod
+    async def start(cls, interval_seconds: float = KICKOFF_PREWARM_POLL_SECONDS) -> None:
+        """Schedule kickoff prewarming. Call from app startup."""
+        if cls._task is None or cls._task.done():
+            cls._task = asyncio.create_task(cls._loop(interval_seconds))
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
@@ -0,0 +1,32 @@
+from typing import Any, Dict, Hashable, List
+
+from app.core.dataloader import DataLoader, get_loader
+from app.services.dimensions import DimensionCache
+from app.services.document_cache import fetch_player_season_statistics_many, get_fixture_documents
+
+
+async def _load_fixtures(fixture_ids: List[Hashable]) -> Dict[Hashable, Any]:
+    return {doc["_id"]: doc for doc in await get_fixture_documents(fixture_ids)}
+
+
+async def _load_teams(team_ids: List[Hashable]) -> Dict[Hashable, Any]:
+    return await DimensionCache.resolve("teams", team_ids)
+
+
+async def _load_player_season_statistics(player_seasons: List[Hashable]) -> Dict[Hashable, Any]:
+    return await fetch_player_season_statistics_many(player_seasons)
+
+
+def fixture_loader() -> DataLoader:
+    """fixtures_refactor documents by fixture ID (one cached $in per batch)."""
+    return get_loader("fixtures", _load_fixtures)
+
+
+def team_loader() -> DataLoader:
+    """Team dimension rows (name, short_code, image_path) by team ID."""
+    return get_loader("teams", _load_teams)
+
+
+def player_season_statistics_loader() -> DataLoader:
+    """Season statistics documents by (player_id, season_id) (one MGET per batch)."""
+    return get_loader("player_season_statistics", _load_player_season_statistics)
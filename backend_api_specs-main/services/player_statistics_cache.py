@@ -0,0 +1,210 @@
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from app.core.dataloader import loader_scope
+from app.core.invalidation import InvalidationBus, player_tag, tag_kind
+from app.core.monitoring import get_logger
+from app.services.loaders import player_season_statistics_loader
+from app.services.players_service import PlayersService
+from app.services.season_index import SeasonIndex
+from app.services.watchlist_index import WatchlistIndex
+
+logger = get_logger(__name__)
+
+# Upper bound on cached grouped statistics (one entry per player/season)
+PLAYER_STATISTICS_CACHE_MAX_ENTRIES = 5000
+# How often watchlist players are re-checked and precomputed
+WATCHLIST_PRECOMPUTE_INTERVAL_SECONDS = 60 * 60
+# Concurrent statistics reads while precomputing
+WATCHLIST_PRECOMPUTE_CONCURRENCY = 8
+
+CacheKey = Tuple[int, int, Hashable]
+
+
+class PlayerStatisticsCache:
+    """
+    LRU cache of PlayersService.transform_to_grouped_statistics results.
+
+    Entries are keyed by (player_id, season_id, updated_at) of the raw season
+    statistics document, so a document rewritten after a match produces a new key and
+    the stale grouping is dropped. Documents without updated_at are transformed on every
+    call (nothing cheap tells their versions apart). Only one version per player/season
+    is kept, and the cache holds at most PLAYER_STATISTICS_CACHE_MAX_ENTRIES.
+    """
+
+    _entries: "OrderedDict[CacheKey, Any]" = OrderedDict()
+    _versions: Dict[Tuple[int, int], Hashable] = {}
+    _max_entries: int = PLAYER_STATISTICS_CACHE_MAX_ENTRIES
+    _hits: int = 0
+    _misses: int = 0
+    _precompute_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _version_of(document: Dict[str, Any]) -> Optional[Hashable]:
+        return document.get("updated_at")
+
+    @classmethod
+    def _store(cls, key: CacheKey, grouped: Any) -> None:
+        player_season = (key[0], key[1])
+        previous_version = cls._versions.get(player_season)
+        if previous_version is not None and previous_version != key[2]:
+            cls._entries.pop((key[0], key[1], previous_version), None)
+
+        cls._entries[key] = grouped
+        cls._entries.move_to_end(key)
+        cls._versions[player_season] = key[2]
+
+        while len(cls._entries) > cls._max_entries:
+            evicted_key, _ = cls._entries.popitem(last=False)
+            evicted_player_season = (evicted_key[0], evicted_key[1])
+            if cls._versions.get(evicted_player_season) == evicted_key[2]:
+                del cls._versions[evicted_player_season]
+
+    @classmethod
+    def get_grouped_statistics(
+        cls,
+        player_id: int,
+        season_id: int,
+        document: Dict[str, Any],
+    ) -> Any:
+        """Return grouped statistics for the document, transforming only on a cache miss."""
+        version = cls._version_of(document)
+        if version is None:
+            # Unversioned: a stale grouping could never be told apart, so do not memoise
+            cls._misses += 1
+            return PlayersService.transform_to_grouped_statistics(document)
+        key: CacheKey = (player_id, season_id, version)
+
+        grouped = cls._entries.get(key)
+        if grouped is not None:
+            cls._entries.move_to_end(key)
+            cls._hits += 1
+            return grouped
+
+        cls._misses += 1
+        grouped = PlayersService.transform_to_grouped_statistics(document)
+        cls._store(key, grouped)
+        return grouped
+
+    @classmethod
+    async def invalidate_tags(cls, tags: Set[str], local_only: bool = False) -> None:
+        """Drop the groupings of players named by player:{id} tags (InvalidationBus handler)."""
+        if not any(tag_kind(tag) == "player" for tag in tags):
+            return
+        stale = [key for key in cls._entries if player_tag(key[0]) in tags]
+        for key in stale:
+            del cls._entries[key]
+            if cls._versions.get((key[0], key[1])) == key[2]:
+                del cls._versions[(key[0], key[1])]
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._entries.clear()
+        cls._versions.clear()
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        return {
+            "entries": len(cls._entries),
+            "max_entries": cls._max_entries,
+            "hits": cls._hits,
+            "misses": cls._misses,
+        }
+
+    @classmethod
+    async def precompute_for_players(cls, player_ids: Iterable[int]) -> int:
+        """Fetch and group current-season statistics for the given players. Returns the number cached."""
+        semaphore = asyncio.Semaphore(WATCHLIST_PRECOMPUTE_CONCURRENCY)
+
+        async def _season(player_id: int) -> Optional[int]:
+            async with semaphore:
+                return await SeasonIndex.get_current_season_id_for_player(player_id)
+
+        async def _precompute(player_id: int, season_id: Optional[int]) -> bool:
+            if season_id is None:
+                return False
+            document = await player_season_statistics_loader().load((player_id, season_id))
+            if document is None:
+                return False
+            cls.get_grouped_statistics(player_id, season_id, document)
+            return True
+
+        player_ids = list(set(player_ids))
+        seasons = await asyncio.gather(*(_season(player_id) for player_id in player_ids), return_exceptions=True)
+        # Seasons first, so every statistics lookup joins a single batch
+        with loader_scope():
+            results = await asyncio.gather(
+                *(
+                    _precompute(player_id, season_id)
+                    for player_id, season_id in zip(player_ids, seasons)
+                    if not isinstance(season_id, Exception)
+                ),
+                return_exceptions=True,
+            )
+        results = [season for season in seasons if isinstance(season, Exception)] + list(results)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(
+                    "Player statistics precompute failed",
+                    extra={"error": str(result), "error_type": type(result).__name__},
+                )
+        return sum(1 for result in results if result is True)
+
+    @classmethod
+    async def precompute_watchlist(cls) -> int:
+        """Precompute grouped statistics for players on the latest watchlist up to today."""
+        started = time.time()
+        now = datetime.now()
+        year, day = now.year, now.timetuple().tm_yday
+
+        entry = await WatchlistIndex.get_latest_on_or_before(year, day)
+        if entry is None:
+            return 0
+
+        count = await cls.precompute_for_players(entry.get("player_ids", []))
+        logger.info(
+            "Precomputed watchlist player statistics",
+            extra={
+                "year": entry.get("year"),
+                "day": entry.get("day"),
+                "player_count": count,
+                "duration_ms": int((time.time() - started) * 1000),
+            },
+        )
+        return count
+
+    @classmethod
+    async def _precompute_loop(cls, interval_seconds: float) -> None:
+        while True:
+            try:
+                await cls.precompute_watchlist()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.error(
+                    "Watchlist statistics precompute failed",
+                    extra={"error": str(exc), "error_type": type(exc).__name__},
+                )
+            await asyncio.sleep(interval_seconds)
+
+    @classmethod
+    async def start(cls, interval_seconds: float = WATCHLIST_PRECOMPUTE_INTERVAL_SECONDS) -> None:
+        """Schedule watchlist precomputation. Call from app startup."""
+        if cls._precompute_task is None or cls._precompute_task.done():
+            cls._precompute_task = asyncio.create_task(cls._precompute_loop(interval_seconds))
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._precompute_task is not None:
+            cls._precompute_task.cancel()
+            try:
+                await cls._precompute_task
+            except asyncio.CancelledError:
+                pass
+            cls._precompute_task = None
+
+
+InvalidationBus.subscribe(PlayerStatisticsCache.invalidate_tags)
@@ -0,0 +1,279 @@
+import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.database import get_database
+from app.core.instrumented_db import instrument_database
+from app.core.monitoring import get_logger
+from app.schemas.predictions_schemas import (
+    CompactPrediction,
+    CompactPredictionList,
+    PredictionCatalogueResponse,
+    PredictionDefinition,
+)
+
+logger = get_logger(__name__)
+
+# How often the catalogue is rebuilt from the prediction collections
+PREDICTION_CATALOGUE_REFRESH_SECONDS = 30 * 60
+# Only predictions updated within this window feed the catalogue
+PREDICTION_CATALOGUE_LOOKBACK_DAYS = 30
+# Reasons must repeat at least this often to be interned
+PREDICTION_CATALOGUE_MIN_REASON_COUNT = 2
+# Upper bound on interned reason strings per source
+PREDICTION_CATALOGUE_MAX_REASONS = 5000
+
+# (source, database, collection). Player prediction names are obfuscated for free users,
+# so the "player" source is only included in the premium catalogue.
+PREDICTION_CATALOGUE_SOURCES: Tuple[Tuple[str, str, str], ...] = (
+    ("fixture", "fourthofficial_refactor", "fixture_predictions"),
+    ("player", "fourthofficial_refactor", "player_predictions"),
+    ("smart_combo", "primary", "temp_smart_combo_predictions"),
+)
+_PUBLIC_SOURCES = frozenset({"fixture", "smart_combo"})
+
+
+class _CatalogueView:
+    """One tier's catalogue: the response payload plus lookup maps used for compaction."""
+
+    __slots__ = ("response", "etag", "definitions", "reason_ids")
+
+    def __init__(self, definitions: List[PredictionDefinition], reasons: List[str]):
+        encoded = json.dumps(
+            {"definitions": [d.model_dump() for d in definitions], "reasons": reasons},
+            sort_keys=True,
+        )
+        version = hashlib.sha1(encoded.encode()).hexdigest()[:16]
+        self.response = PredictionCatalogueResponse(version=version, definitions=definitions, reasons=reasons)
+        self.etag = f'"{version}"'
+        self.definitions: Dict[int, PredictionDefinition] = {d.prediction_id: d for d in definitions}
+        self.reason_ids: Dict[str, int] = {reason: index for index, reason in enumerate(reasons)}
+
+
+_EMPTY_VIEW = _CatalogueView([], [])
+
+
+class PredictionCatalogue:
+    """
+    In-process catalogue of prediction definitions keyed by prediction_id.
+
+    Every fixture, player and smart combo prediction with the same prediction_id carries the
+    same prediction_display_name, and most reason strings repeat across fixtures. The
+    catalogue collects both from the prediction collections so compact responses
+    (format=compact) can reference them by ID instead of repeating them per item. Clients
+    fetch the catalogue once from /predictions/catalogue (ETagged) and refetch when the
+    catalogue_version in a compact response changes.
+
+    Two views are kept: premium (all sources plus interned reasons) and free (fixture and
+    smart combo definitions only), so the catalogue never reveals text that is obfuscated
+    for free users. Items only drop a string when it exactly matches the caller's view.
+    """
+
+    _views: Dict[bool, _CatalogueView] = {}
+    _loaded_at: Optional[float] = None
+    _load_lock: Optional[asyncio.Lock] = None
+    _refresh_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _collection(source_db: str, collection: str):
+        db = get_database()
+        if source_db == "primary":
+            return instrument_database(db)[collection]
+        return instrument_database(db.client[source_db])[collection]
+
+    @staticmethod
+    def _definitions_pipeline(since: datetime) -> List[Dict[str, Any]]:
+        return [
+            {"$match": {"updated_at": {"$gte": since}}},
+            {
+                "$group": {
+                    "_id": "$prediction_id",
+                    "prediction_display_name": {"$first": "$prediction_display_name"},
+                    "prediction_type": {"$first": "$prediction_type"},
+                }
+            },
+        ]
+
+    @staticmethod
+    def _reasons_pipeline(since: datetime) -> List[Dict[str, Any]]:
+        return [
+            {"$match": {"updated_at": {"$gte": since}}},
+            {
+                "$project": {
+                    "reasons": {
+                        "$concatArrays": [
+                            {"$ifNull": ["$pre_game_prediction_reasons", []]},
+                            {"$ifNull": ["$prediction_reasons", []]},
+                        ]
+                    }
+                }
+            },
+            {"$unwind": "$reasons"},
+            {"$group": {"_id": "$reasons", "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gte": PREDICTION_CATALOGUE_MIN_REASON_COUNT}}},
+            {"$sort": {"count": -1}},
+            {"$limit": PREDICTION_CATALOGUE_MAX_REASONS},
+        ]
+
+    @classmethod
+    async def load(cls) -> None:
+        """Rebuild both catalogue views from the prediction collections and swap them in."""
+        started = time.time()
+        since = datetime.utcnow() - timedelta(days=PREDICTION_CATALOGUE_LOOKBACK_DAYS)
+
+        definitions: Dict[int, PredictionDefinition] = {}
+        reasons: set = set()
+        for source, source_db, collection_name in PREDICTION_CATALOGUE_SOURCES:
+            collection = cls._collection(source_db, collection_name)
+            async for doc in await collection.aggregate(cls._definitions_pipeline(since)):
+                prediction_id = doc.get("_id")
+                name = doc.get("prediction_display_name")
+                if prediction_id is None or not name or prediction_id in definitions:
+                    continue
+                definitions[prediction_id] = PredictionDefinition(
+                    prediction_id=prediction_id,
+                    prediction_display_name=name,
+                    prediction_type=doc.get("prediction_type") or source,
+                    source=source,
+                )
+            async for doc in await collection.aggregate(cls._reasons_pipeline(since)):
+                if isinstance(doc.get("_id"), str):
+                    reasons.add(doc["_id"])
+
+        ordered = [definitions[prediction_id] for prediction_id in sorted(definitions)]
+        cls.install(ordered, sorted(reasons))
+
+        logger.info(
+            "Prediction catalogue loaded",
+            extra={
+                "definition_count": len(ordered),
+                "reason_count": len(reasons),
+                "version": cls._views[True].response.version,
+                "duration_ms": int((time.time() - started) * 1000),
+            },
+        )
+
+    @classmethod
+    def install(cls, definitions: List[PredictionDefinition], reasons: List[str]) -> None:
+        """Build both views from the premium definitions and reasons and swap them in."""
+        premium_view = _CatalogueView(definitions, reasons)
+        free_view = _CatalogueView([d for d in definitions if d.source in _PUBLIC_SOURCES], [])
+        cls._views = {True: premium_view, False: free_view}
+        cls._loaded_at = time.time()
+
+    @classmethod
+    def export(cls) -> Optional[Tuple[List[PredictionDefinition], List[str]]]:
+        """Premium definitions and reasons, as accepted by install() (None before the first load)."""
+        if cls._loaded_at is None:
+            return None
+        response = cls._views[True].response
+        return list(response.definitions), list(response.reasons)
+
+    @classmethod
+    async def ensure_loaded(cls) -> None:
+        """Load the catalogue once if startup did not already do so."""
+        if cls._loaded_at is not None:
+            return
+        if cls._load_lock is None:
+            cls._load_lock = asyncio.Lock()
+        async with cls._load_lock:
+            if cls._loaded_at is None:
+                await cls.load()
+
+    @classmethod
+    async def get_view(cls, premium: bool) -> _CatalogueView:
+        await cls.ensure_loaded()
+        return cls._views.get(premium, _EMPTY_VIEW)
+
+    @classmethod
+    async def get_version(cls, premium: bool) -> str:
+        """Catalogue version for the given tier, echoed in compact and columnar responses."""
+        return (await cls.get_view(premium)).response.version
+
+    @classmethod
+    async def get_catalogue(cls, premium: bool) -> Tuple[PredictionCatalogueResponse, str]:
+        """Catalogue payload and its ETag for the given tier."""
+        view = await cls.get_view(premium)
+        return view.response, view.etag
+
+    @staticmethod
+    def _intern_reasons(reasons: Optional[Iterable[str]], reason_ids: Dict[str, int]) -> Optional[List[Any]]:
+        if reasons is None:
+            return None
+        return [reason_ids.get(reason, reason) for reason in reasons]
+
+    @classmethod
+    async def compact(cls, documents: Iterable[Dict[str, Any]], premium: bool) -> CompactPredictionList:
+        """
+        Convert prediction documents (fixture, player or smart combo) to compact items.
+
+        Documents must already have their defaults applied (created_at, prediction_type, ...),
+        as done by the routers before building the full models.
+        """
+        view = await cls.get_view(premium)
+        items: List[CompactPrediction] = []
+        for doc in documents:
+            definition = view.definitions.get(doc["prediction_id"])
+            name = doc.get("prediction_display_name")
+            prediction_type = doc.get("prediction_type")
+            if definition is not None:
+                if name == definition.prediction_display_name:
+                    name = None
+                if prediction_type == definition.prediction_type:
+                    prediction_type = None
+            items.append(
+                CompactPrediction(
+                    fixture_id=doc.get("fixture_id"),
+                    player_id=doc.get("player_id"),
+                    combo_id=doc.get("combo_id"),
+                    created_at=doc["created_at"],
+                    updated_at=doc["updated_at"],
+                    prediction_id=doc["prediction_id"],
+                    prediction_display_name=name,
+                    prediction_type=prediction_type,
+                    pre_game_prediction=doc["pre_game_prediction"],
+                    pre_game_prediction_reasons=cls._intern_reasons(
+                        doc.get("pre_game_prediction_reasons") or [], view.reason_ids
+                    ),
+                    prediction=doc.get("prediction"),
+                    prediction_reasons=cls._intern_reasons(doc.get("prediction_reasons"), view.reason_ids),
+                    pct_change_value=doc.get("pct_change_value"),
+                    pct_change_interval=doc["pct_change_interval"],
+                )
+            )
+        return CompactPredictionList(catalogue_version=view.response.version, predictions=items)
+
+    @classmethod
+    async def _refresh_loop(cls, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await cls.load()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                # Keep serving the previous catalogue; try again on the next tick
+                logger.error(
+                    "Prediction catalogue refresh failed",
+                    extra={"error": str(exc), "error_type": type(exc).__name__},
+                )
+
+    @classmethod
+    async def start(cls, interval_seconds: float = PREDICTION_CATALOGUE_REFRESH_SECONDS) -> None:
+        """Load the catalogue and schedule periodic rebuilds. Call from app startup."""
+        await cls.ensure_loaded()
+        if cls._refresh_task is None or cls._refresh_task.done():
+            cls._refresh_task = asyncio.create_task(cls._refresh_loop(interval_seconds))
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._refresh_task is not None:
+            cls._refresh_task.cancel()
+            try:
+                await cls._refresh_task
+            except asyncio.CancelledError:
+                pass
+            cls._refresh_task = None
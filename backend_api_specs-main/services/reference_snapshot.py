@@ -0,0 +1,193 @@
+import asyncio
+import os
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+from app.core.instrumented_db import instrument_database
+from app.core.monitoring import get_logger
+from app.core.snapshot_file import read_snapshot, write_snapshot
+from app.schemas.leagues_schemas import LeaguesListResponse
+from app.schemas.predictions_schemas import PredictionDefinition
+from app.schemas.responses_schemas import StandardResponse
+from app.services.leagues_service import LeaguesService
+from app.services.prediction_catalogue import PredictionCatalogue
+from app.services.season_index import SeasonIndex
+
+logger = get_logger(__name__)
+
+# Snapshot file. Point REFERENCE_SNAPSHOT_PATH at a volume shared by the pods (and kept
+# across restarts): the tempdir default is private to the pod, so every new pod boots cold
+REFERENCE_SNAPSHOT_PATH = os.getenv(
+    "REFERENCE_SNAPSHOT_PATH",
+    os.path.join(tempfile.gettempdir(), "fourthofficial_reference.snapshot"),
+)
+# Bump when the shape of a section changes; files with another version are ignored
+REFERENCE_SNAPSHOT_SCHEMA_VERSION = 1
+# How often production leagues are re-read and the snapshot rewritten (if changed)
+REFERENCE_SNAPSHOT_REFRESH_SECONDS = 10 * 60
+# Older snapshots are not used at boot
+REFERENCE_SNAPSHOT_MAX_AGE_SECONDS = 24 * 60 * 60
+
+
+class ReferenceSnapshot:
+    """
+    On-disk snapshot of the reference data every worker needs before it is useful.
+
+    Sections:
+    - prod_leagues: LeaguesService.get_prod_leagues (GET /leagues), held here in memory
+    - league_season_lookup: the SeasonIndex league seasons
+    - prediction_catalogue: PredictionCatalogue definitions and reasons
+
+    start() maps the snapshot file and installs its sections into the components before
+    they load, so a new worker serves from reference data within milliseconds instead of
+    waiting on MongoDB. A background task then reconciles: it reloads every section from
+    MongoDB, and every REFERENCE_SNAPSHOT_REFRESH_SECONDS re-reads production leagues and
+    rewrites the file when its content changed. Call start() before SeasonIndex.start()
+    and PredictionCatalogue.start().
+    """
+
+    _prod_leagues: Optional[LeaguesListResponse] = None
+    _digest: Optional[str] = None
+    _task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------ production leagues
+
+    @classmethod
+    async def _load_prod_leagues(cls) -> StandardResponse[LeaguesListResponse]:
+        db, leagues_db = LeaguesService.get_leagues_database()
+        response = await LeaguesService.get_prod_leagues(instrument_database(leagues_db))
+        if response.success and response.data is not None:
+            cls._prod_leagues = response.data
+        return response
+
+    @classmethod
+    async def get_prod_leagues(cls) -> StandardResponse[LeaguesListResponse]:
+        """Production leagues from memory, loading them from MongoDB on first use."""
+        if cls._prod_leagues is None:
+            return await cls._load_prod_leagues()
+        return StandardResponse[LeaguesListResponse].success_response(data=cls._prod_leagues)
+
+    # ------------------------------------------------------------------ snapshot file
+
+    @classmethod
+    def _sections(cls) -> Dict[str, Any]:
+        sections: Dict[str, Any] = {}
+        if cls._prod_leagues is not None:
+            sections["prod_leagues"] = cls._prod_leagues.model_dump(mode="json")
+        seasons = SeasonIndex.export_documents()
+        if seasons is not None:
+            sections["league_season_lookup"] = seasons
+        catalogue = PredictionCatalogue.export()
+        if catalogue is not None:
+            definitions, reasons = catalogue
+            sections["prediction_catalogue"] = {
+                "definitions": [definition.model_dump() for definition in definitions],
+                "reasons": reasons,
+            }
+        return sections
+
+    @classmethod
+    def load_from_disk(cls, path: str = REFERENCE_SNAPSHOT_PATH) -> bool:
+        """Install the sections of the snapshot file. Returns False if there is no usable file."""
+        started = time.time()
+        snapshot = read_snapshot(path, REFERENCE_SNAPSHOT_SCHEMA_VERSION, REFERENCE_SNAPSHOT_MAX_AGE_SECONDS)
+        if snapshot is None:
+            return False
+
+        with snapshot:
+            sections = {name: snapshot.section(name) for name in snapshot.names()}
+            digest, written_at = snapshot.digest, snapshot.written_at
+        leagues = sections.get("prod_leagues")
+        seasons = sections.get("league_season_lookup")
+        catalogue = sections.get("prediction_catalogue")
+
+        if leagues is not None:
+            cls._prod_leagues = LeaguesListResponse.model_validate(leagues)
+        if seasons is not None:
+            SeasonIndex.install(seasons)
+        if catalogue is not None:
+            PredictionCatalogue.install(
+                [PredictionDefinition.model_validate(definition) for definition in catalogue["definitions"]],
+                catalogue["reasons"],
+            )
+        # A corrupt section was skipped: keep no digest, so the next write replaces the file
+        cls._digest = digest if all(value is not None for value in sections.values()) else None
+
+        logger.info(
+            "Reference snapshot loaded",
+            extra={
+                "path": path,
+                "age_seconds": int(time.time() - written_at),
+                "duration_ms": int((time.time() - started) * 1000),
+            },
+        )
+        return True
+
+    @classmethod
+    async def write(cls, path: str = REFERENCE_SNAPSHOT_PATH) -> bool:
+        """Write the current reference data to the snapshot file. Returns False if unchanged."""
+        sections = cls._sections()
+        if not sections:
+            return False
+        loop = asyncio.get_running_loop()
+        digest, written = await loop.run_in_executor(
+            None, write_snapshot, path, sections, REFERENCE_SNAPSHOT_SCHEMA_VERSION, cls._digest
+        )
+        cls._digest = digest
+        if written:
+            logger.info("Reference snapshot written", extra={"path": path, "sections": sorted(sections)})
+        return written
+
+    # ------------------------------------------------------------------ lifecycle
+
+    @classmethod
+    async def reconcile(cls, reload_components: bool = False) -> None:
+        """Re-read reference data from MongoDB and rewrite the snapshot if it changed."""
+        if reload_components:
+            await SeasonIndex.load()
+            await PredictionCatalogue.load()
+        else:
+            await SeasonIndex.ensure_loaded()
+            await PredictionCatalogue.ensure_loaded()
+        await cls._load_prod_leagues()
+        await cls.write()
+
+    @classmethod
+    async def _loop(cls, interval_seconds: float, reload_components: bool) -> None:
+        # When booted from disk, the first pass replaces the snapshot data with MongoDB's state
+        while True:
+            try:
+                await cls.reconcile(reload_components=reload_components)
+                reload_components = False
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                # Keep serving the data already installed; try again on the next tick
+                logger.error(
+                    "Reference snapshot reconciliation failed",
+                    extra={"error": str(exc), "error_type": type(exc).__name__},
+                )
+            await asyncio.sleep(interval_seconds)
+
+    @classmethod
+    async def start(cls, interval_seconds: float = REFERENCE_SNAPSHOT_REFRESH_SECONDS) -> None:
+        """Install the snapshot file and schedule reconciliation. Call first in app startup."""
+        if "REFERENCE_SNAPSHOT_PATH" not in os.environ:
+            logger.warning(
+                "REFERENCE_SNAPSHOT_PATH is not set; the reference snapshot is local to this pod",
+                extra={"path": REFERENCE_SNAPSHOT_PATH},
+            )
+        from_disk = cls.load_from_disk()
+        if cls._task is None or cls._task.done():
+            cls._task = asyncio.create_task(cls._loop(interval_seconds, reload_components=from_disk))
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
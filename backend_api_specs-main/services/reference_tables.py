@@ -0,0 +1,255 @@
+import asyncio
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core.database import get_database
+from app.core.instrumented_db import instrument_database
+from app.core.monitoring import get_logger
+from app.core.redis_pubsub import get_redis_pubsub
+from app.core.shared_table import SharedTableStore, TableData
+from app.services.leagues_service import LeaguesService
+from app.services.reference_snapshot import ReferenceSnapshot
+
+logger = get_logger(__name__)
+
+# How often the tables are rebuilt from MongoDB (by one worker) and republished
+REFERENCE_TABLES_REFRESH_SECONDS = 15 * 60
+# Teams are collected from fixtures starting within this window
+REFERENCE_TABLES_TEAM_LOOKBACK_DAYS = 365
+# Shared memory namespace; each server instance (master process) gets its own segments,
+# and a restarted server drops whatever its exited predecessor left behind
+REFERENCE_TABLES_SEGMENT_NAMESPACE = "fo_ref"
+# Cross-worker lock so one worker of this server instance rebuilds per refresh. The tables
+# are host-local, so the key is scoped like the segments: {key}:{hostname}:{instance}
+REFERENCE_TABLES_LOCK_KEY = "reference_tables:publish"
+
+# Table name -> (string columns, int columns)
+REFERENCE_TABLE_COLUMNS: Dict[str, tuple] = {
+    "leagues": (("league_name", "short_code", "league_type", "league_sub_type", "image_path"), ("country_id",)),
+    "teams": (("name", "short_code", "image_path"), ()),
+    "countries": (("name", "iso2", "image_path"), ()),
+    "positions": (("name", "code"), ()),
+}
+# Player position type IDs (position_id on players and watchlist documents)
+PLAYER_POSITIONS: Dict[int, Dict[str, str]] = {
+    24: {"name": "Goalkeeper", "code": "GK"},
+    25: {"name": "Defender", "code": "DEF"},
+    26: {"name": "Midfielder", "code": "MID"},
+    27: {"name": "Attacker", "code": "ATT"},
+}
+
+_TEAM_FIELDS = ("name", "short_code", "image_path")
+
+
+def _team_pipeline(since: datetime) -> List[Dict[str, Any]]:
+    def _side(side: str) -> Dict[str, Any]:
+        return {
+            "team_id": f"${side}_team_id",
+            "name": f"${side}_team_name",
+            "short_code": f"${side}_team_short_code",
+            "image_path": f"${side}_team_image_path",
+        }
+
+    return [
+        {"$match": {"starting_at": {"$gte": since}}},
+        {"$sort": {"starting_at": 1}},
+        {"$project": {"_id": 0, "teams": [_side("home"), _side("away")]}},
+        {"$unwind": "$teams"},
+        # Some fixtures carry null names: only named entries count
+        {"$match": {"teams.team_id": {"$ne": None}, "teams.name": {"$nin": [None, ""]}}},
+        {
+            "$group": {
+                "_id": "$teams.team_id",
+                **{field: {"$last": f"$teams.{field}"} for field in _TEAM_FIELDS},
+            }
+        },
+    ]
+
+
+class ReferenceTables:
+    """
+    Immutable reference tables shared by every worker on the host through shared memory.
+
+    - leagues: league_id -> production league fields (from ReferenceSnapshot)
+    - teams: team_id -> name, short code and logo, from recent fixtures, with standings
+      rows filling in teams that have no named fixture
+    - countries: country_id -> name, ISO code and flag (countries collection, when present)
+    - positions: position_id -> name and code (PLAYER_POSITIONS)
+
+    One worker of the server instance rebuilds the tables every
+    REFERENCE_TABLES_REFRESH_SECONDS (a Redis lock scoped to the host and instance, held for
+    the refresh period unless the rebuild fails) and publishes them as a new shared memory
+    generation; the others attach to it on their next lookup. Memory use is one copy per host, whatever the number of workers.
+    """
+
+    _store = SharedTableStore(REFERENCE_TABLES_SEGMENT_NAMESPACE, os.getppid())
+    _load_lock: Optional[asyncio.Lock] = None
+    _refresh_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _refactor_database():
+        return instrument_database(get_database().client["fourthofficial_refactor"])
+
+    @classmethod
+    async def _fetch_teams(cls) -> Dict[int, Dict[str, Any]]:
+        since = datetime.utcnow() - timedelta(days=REFERENCE_TABLES_TEAM_LOOKBACK_DAYS)
+        teams: Dict[int, Dict[str, Any]] = {}
+
+        db, leagues_db = LeaguesService.get_leagues_database()
+        cursor = instrument_database(leagues_db)["standings_refactor"].find(
+            {"team_id": {"$ne": None}},
+            {"_id": 0, "team_id": 1, "team_name": 1, "team_logo": 1},
+        )
+        async for doc in cursor:
+            teams[doc["team_id"]] = {"name": doc.get("team_name"), "image_path": doc.get("team_logo")}
+
+        fixtures = cls._refactor_database()["fixtures_refactor"]
+        async for doc in await fixtures.aggregate(_team_pipeline(since)):
+            teams[doc["_id"]] = {field: doc.get(field) for field in _TEAM_FIELDS}
+        return teams
+
+    @classmethod
+    async def _fetch_countries(cls) -> Dict[int, Dict[str, Any]]:
+        countries: Dict[int, Dict[str, Any]] = {}
+        cursor = cls._refactor_database()["countries"].find(
+            {}, {"_id": 1, "country_id": 1, "name": 1, "iso2": 1, "image_path": 1}
+        )
+        async for doc in cursor:
+            country_id = doc.get("country_id", doc.get("_id"))
+            if isinstance(country_id, int):
+                countries[country_id] = doc
+        return countries
+
+    @classmethod
+    async def _fetch_tables(cls) -> Dict[str, TableData]:
+        leagues: Dict[int, Dict[str, Any]] = {}
+        response = await ReferenceSnapshot.get_prod_leagues()
+        if response.success and response.data is not None:
+            leagues = {league.league_id: league.model_dump() for league in response.data.leagues}
+        rows = {
+            "leagues": leagues,
+            "teams": await cls._fetch_teams(),
+            "countries": await cls._fetch_countries(),
+            "positions": PLAYER_POSITIONS,
+        }
+        return {name: (*REFERENCE_TABLE_COLUMNS[name], table_rows) for name, table_rows in rows.items()}
+
+    @staticmethod
+    def _lock_key() -> str:
+        return f"{REFERENCE_TABLES_LOCK_KEY}:{socket.gethostname()}:{os.getppid()}"
+
+    @classmethod
+    async def _acquire_lock(cls) -> Optional[str]:
+        """Take this refresh's rebuild lock. Returns its token, or None if another worker holds it."""
+        token = uuid.uuid4().hex
+        redis_client = get_redis_pubsub()
+        if redis_client is None:
+            return token
+        try:
+            acquired = await redis_client.set(
+                cls._lock_key(), token, nx=True, ex=max(1, REFERENCE_TABLES_REFRESH_SECONDS - 60)
+            )
+            return token if acquired else None
+        except Exception:
+            return token
+
+    @classmethod
+    async def _release_lock(cls, token: str) -> None:
+        redis_client = get_redis_pubsub()
+        if redis_client is None:
+            return
+        try:
+            holder = await redis_client.get(cls._lock_key())
+            if isinstance(holder, bytes):
+                holder = holder.decode()
+            if holder == token:
+                await redis_client.delete(cls._lock_key())
+        except Exception:
+            pass
+
+    @classmethod
+    async def load(cls) -> None:
+        """Rebuild every table from MongoDB and publish them as a new generation."""
+        started = time.time()
+        tables = await cls._fetch_tables()
+        generation = cls._store.publish(tables)
+        logger.info(
+            "Reference tables published",
+            extra={
+                "generation": generation,
+                **{f"{name}_count": len(data[2]) for name, data in tables.items()},
+                "duration_ms": int((time.time() - started) * 1000),
+            },
+        )
+
+    @classmethod
+    async def ensure_loaded(cls) -> None:
+        """Attach to the published tables, building them if no worker has yet."""
+        if cls._store.tables():
+            return
+        if cls._load_lock is None:
+            cls._load_lock = asyncio.Lock()
+        async with cls._load_lock:
+            if not cls._store.tables():
+                await cls.load()
+
+    @classmethod
+    async def get_many(cls, table: str, keys: Iterable[Any]) -> Dict[Any, Dict[str, Any]]:
+        """Rows of a reference table for the keys it has (None keys are skipped)."""
+        await cls.ensure_loaded()
+        shared = cls._store.tables().get(table)
+        if shared is None:
+            return {}
+        return shared.get_many(key for key in keys if key is not None)
+
+    @classmethod
+    def generation(cls) -> int:
+        """Generation of the attached tables; changes whenever a refresh is picked up."""
+        cls._store.tables()
+        return cls._store.generation
+
+    @classmethod
+    async def get(cls, table: str, key: Any) -> Optional[Dict[str, Any]]:
+        return (await cls.get_many(table, [key])).get(key)
+
+    @classmethod
+    async def _refresh_loop(cls, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            token = await cls._acquire_lock()
+            if token is None:
+                continue
+            try:
+                await cls.load()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                # Keep serving the current generation; free the lock so the next tick of
+                # any worker retries
+                await cls._release_lock(token)
+                logger.error(
+                    "Reference tables refresh failed",
+                    extra={"error": str(exc), "error_type": type(exc).__name__},
+                )
+
+    @classmethod
+    async def start(cls, interval_seconds: float = REFERENCE_TABLES_REFRESH_SECONDS) -> None:
+        """Attach to (or build) the tables and schedule refreshes. Call from app startup."""
+        await cls.ensure_loaded()
+        if cls._refresh_task is None or cls._refresh_task.done():
+            cls._refresh_task = asyncio.create_task(cls._refresh_loop(interval_seconds))
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._refresh_task is not None:
+            cls._refresh_task.cancel()
+            try:
+                await cls._refresh_task
+            except asyncio.CancelledError:
+                pass
+            cls._refresh_task = None
+        cls._store.close()
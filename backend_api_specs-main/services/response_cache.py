@@ -0,0 +1,252 @@
+import asyncio
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Type
+
+from pydantic import BaseModel
+
+from app.core.bson_codecs import string_id_database
+from app.core.dataloader import loader_scope
+from app.core.instrumented_db import instrument_database
+from app.core.invalidation import combo_tag, fixture_tag, league_season_tag
+from app.core.monitoring import get_logger
+from app.core.refreshing_cache import RefreshingCache
+from app.core.subscription import tier_label, tier_user
+from app.schemas.fixtures_schemas import FixturesResponse
+from app.schemas.leagues_schemas import LeagueStandingsResponse, StandingItem
+from app.schemas.predictions_schemas import SmartComboCurrentResponse
+from app.schemas.responses_schemas import StandardResponse
+from app.services.dimensions import enrich_standings_documents
+from app.services.document_cache import get_standings_documents
+from app.services.fixtures_service import FixturesService
+from app.services.leagues_service import LeaguesService
+from app.services.loaders import fixture_loader, team_loader
+
+logger = get_logger(__name__)
+
+
+def standard_response_cache(
+    namespace: str,
+    data_model: Type[BaseModel],
+    ttl_seconds: float,
+    stale_seconds: float,
+    l1_max_entries: int = 1000,
+    tags: Optional[Callable[[Hashable, Any], Iterable[str]]] = None,
+) -> RefreshingCache:
+    """
+    RefreshingCache for builders returning StandardResponse[data_model].
+
+    Only successful responses are stored (as the JSON dump of their data); error
+    responses are passed through uncached. tags(key, data) receives that JSON dump.
+    """
+
+    def _encode(response: Any) -> Any:
+        data = response.data
+        if isinstance(data, BaseModel):
+            return data.model_dump(mode="json", by_alias=True)
+        return data
+
+    def _decode(data: Any) -> Any:
+        return StandardResponse[data_model].success_response(data=data_model.model_validate(data))
+
+    def _cacheable(response: Any) -> bool:
+        return isinstance(response, StandardResponse) and response.success and response.data is not None
+
+    return RefreshingCache(
+        namespace,
+        ttl_seconds=ttl_seconds,
+        stale_seconds=stale_seconds,
+        l1_max_entries=l1_max_entries,
+        encode=_encode,
+        decode=_decode,
+        cacheable=_cacheable,
+        tags=tags,
+    )
+
+
+def _standings_response_tags(key: Hashable, _data: Any) -> Iterable[str]:
+    # key: "{league_id}:{season_id}"
+    return (league_season_tag(*str(key).split(":", 1)),)
+
+
+def _fixture_list_response_tags(_key: Hashable, data: Dict[str, Any]) -> Iterable[str]:
+    return (fixture_tag(item["fixture"]["fixture_id"]) for item in data.get("fixtures", []))
+
+
+def _smart_combo_response_tags(_key: Hashable, data: Dict[str, Any]) -> Iterable[str]:
+    return (combo_tag(data["combo"]["combo_id"]),)
+
+
+def _fixture_predictions_tags(key: Hashable, _predictions: Any) -> Iterable[str]:
+    # key: "{tier}:{fixture_id}:{sort_by}:{sort_order}:{limit}"
+    return (fixture_tag(str(key).split(":")[1]),)
+
+
+# LeaguesService.build_standings_response per league/season
+STANDINGS_RESPONSE_CACHE = standard_response_cache(
+    "standings_response",
+    LeagueStandingsResponse,
+    ttl_seconds=60,
+    stale_seconds=5 * 60,
+    tags=_standings_response_tags,
+)
+# FixturesService.process_fixtures_with_filters per tier and filter set; short-lived
+# because list cards carry live scores
+FIXTURE_LIST_RESPONSE_CACHE = standard_response_cache(
+    "fixture_list_response",
+    FixturesResponse,
+    ttl_seconds=15,
+    stale_seconds=30,
+    tags=_fixture_list_response_tags,
+)
+# Current smart combo (same payload for every tier)
+SMART_COMBO_RESPONSE_CACHE = standard_response_cache(
+    "smart_combo_response",
+    SmartComboCurrentResponse,
+    ttl_seconds=60,
+    stale_seconds=5 * 60,
+    tags=_smart_combo_response_tags,
+)
+# Defaulted FixturesService.get_fixture_predictions_detailed results per tier, fixture and
+# sort; kept warm around kickoff by KickoffPrewarmScheduler
+FIXTURE_PREDICTIONS_CACHE = RefreshingCache(
+    "fixture_predictions",
+    ttl_seconds=30,
+    stale_seconds=60,
+    l1_max_entries=2000,
+    tags=_fixture_predictions_tags,
+)
+
+
+async def _build_standings_response(league_id: int, season_id: int) -> StandardResponse[LeagueStandingsResponse]:
+    """Read standings for a league season and build the response with form and next fixtures."""
+    # Build query
+    query = LeaguesService.build_standings_query(league_id, season_id)
+
+    # Get database
+    db, leagues_db = LeaguesService.get_leagues_database()
+    leagues_db = instrument_database(string_id_database(leagues_db))
+
+    # Fetch standings from standings_refactor collection (through the shared cache)
+    standings_documents = await get_standings_documents(leagues_db, league_id, season_id, query)
+    await enrich_standings_documents(standings_documents)
+
+    if not standings_documents:
+        logger.info(
+            "No standings found",
+            extra={
+                "league_id": league_id,
+                "season_id": season_id,
+            },
+        )
+        # Return empty standings response instead of 404
+        data = LeagueStandingsResponse(
+            league_id=league_id,
+            season_id=season_id,
+            standings=[],
+        )
+        return StandardResponse[LeagueStandingsResponse].success_response(data=data)
+
+    with loader_scope():
+        # Build response with standings, form, and next fixtures
+        response = await LeaguesService.build_standings_response(
+            standings_documents=standings_documents,
+            league_id=league_id,
+            season_id=season_id,
+            leagues_db=leagues_db,
+        )
+        if response.success and response.data is not None:
+            await _fill_next_fixture_logos(response.data.standings)
+    return response
+
+
+async def _fill_next_fixture_logos(standings: List[StandingItem]) -> None:
+    """Fill missing next-fixture opponent logos with one fixture batch and one team batch."""
+
+    async def _fill(item: StandingItem) -> None:
+        fixture = await fixture_loader().load(item.next_fixture.fixture_id)
+        if fixture is None:
+            return
+        side = "away" if fixture.get("home_team_id") == item.team.team_id else "home"
+        logo = fixture.get(f"{side}_team_image_path")
+        if not logo:
+            team = await team_loader().load(fixture.get(f"{side}_team_id"))
+            logo = team.get("image_path") if team else None
+        item.next_fixture.opponent_logo = logo
+
+    pending = [
+        item for item in standings
+        if item.next_fixture is not None and not item.next_fixture.opponent_logo
+    ]
+    try:
+        await asyncio.gather(*(_fill(item) for item in pending))
+    except Exception as exc:
+        # Logos are cosmetic: serve the standings without them
+        logger.warning(
+            "Next fixture logo lookup failed",
+            extra={"error": str(exc), "error_type": type(exc).__name__},
+        )
+
+
+async def get_standings_response(
+    league_id: int,
+    season_id: int,
+    warm: bool = False,
+) -> StandardResponse[LeagueStandingsResponse]:
+    """Standings response for a league season; warm=True rebuilds it regardless of age."""
+    key = f"{league_id}:{season_id}"
+    build = partial(_build_standings_response, league_id, season_id)
+    if warm:
+        return await STANDINGS_RESPONSE_CACHE.warm(key, build)
+    return await STANDINGS_RESPONSE_CACHE.get(key, build)
+
+
+async def _load_fixture_predictions(
+    fixture_id: int,
+    sort_by: str,
+    sort_order: str,
+    limit: int,
+    current_user: Optional[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    raw_predictions = await FixturesService.get_fixture_predictions_detailed(
+        fixture_id=fixture_id,
+        fixture_ids=None,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        limit=limit,
+        current_user=current_user,
+    )
+
+    # Apply defaults for optional fields before building full or compact items
+    predictions = []
+    for doc in raw_predictions:
+        if "created_at" not in doc:
+            doc["created_at"] = datetime.utcnow()
+        if "updated_at" not in doc:
+            doc["updated_at"] = datetime.utcnow()
+        if "prediction_type" not in doc:
+            doc["prediction_type"] = "fixture"
+        if doc.get("pct_change_interval") is None:
+            doc["pct_change_interval"] = 5.0
+        predictions.append(doc)
+    return predictions
+
+
+async def get_fixture_predictions(
+    fixture_id: int,
+    sort_by: str,
+    sort_order: str,
+    limit: int,
+    current_user: Optional[Dict[str, Any]],
+    warm: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Prediction documents for one fixture as /fixtures/{fixture_id}/predictions serves them
+    (obfuscated for free users, defaults applied). Shared between requests: do not mutate.
+    """
+    key = f"{tier_label(current_user)}:{fixture_id}:{sort_by}:{sort_order.lower()}:{limit}"
+    # The key only carries the tier, so the service sees the canonical user for that tier
+    load = partial(_load_fixture_predictions, fixture_id, sort_by, sort_order, limit, tier_user(current_user))
+    if warm:
+        return await FIXTURE_PREDICTIONS_CACHE.warm(key, load)
+    return await FIXTURE_PREDICTIONS_CACHE.get(key, load)
@@ -0,0 +1,240 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.instrumented_db import instrument_database
+from app.core.monitoring import get_logger
+from app.core.two_tier_cache import TwoTierCache
+from app.services.leagues_service import LeaguesService
+from app.services.players_service import PlayersService
+
+logger = get_logger(__name__)
+
+# How often the league season lookup is reloaded from MongoDB
+SEASON_INDEX_REFRESH_SECONDS = 15 * 60
+# How long a player's resolved latest season is trusted before it is looked up again
+PLAYER_SEASON_TTL_SECONDS = 6 * 60 * 60
+
+# Season lookup documents shared between workers (L2), refreshed by every periodic reload
+SEASON_LOOKUP_CACHE = TwoTierCache(
+    "league_season_lookup",
+    l1_max_entries=1,
+    l1_ttl_seconds=SEASON_INDEX_REFRESH_SECONDS,
+    l2_ttl_seconds=2 * SEASON_INDEX_REFRESH_SECONDS,
+)
+_SEASON_LOOKUP_KEY = "all"
+
+_SEASON_PROJECTION = {
+    "_id": 0,
+    "league_id": 1,
+    "season_id": 1,
+    "season_is_current": 1,
+    "season_starting_at": 1,
+    "season_ending_at": 1,
+}
+
+
+class SeasonIndex:
+    """
+    Process-wide, in-memory season resolver shared by the leagues and players routers.
+
+    Holds three maps:
+    - league_id -> current season_id
+    - (league_id, season_id) -> season flags and date range (from league_season_lookup)
+    - player_id -> latest season_id (resolved on first use, expires after PLAYER_SEASON_TTL_SECONDS)
+
+    The league maps are loaded at startup (or lazily on first use) and reloaded
+    every SEASON_INDEX_REFRESH_SECONDS. Each reload builds new dicts and swaps them in,
+    so readers never see a half-built index.
+    """
+
+    _league_current: Dict[int, int] = {}
+    _seasons: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    _player_latest: Dict[int, Tuple[int, float]] = {}
+    _loaded_at: Optional[float] = None
+    _load_lock: Optional[asyncio.Lock] = None
+    _refresh_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _season_entry(doc: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "is_current": bool(doc.get("season_is_current", False)),
+            "starting_at": doc.get("season_starting_at") or "",
+            "ending_at": doc.get("season_ending_at") or "",
+        }
+
+    @staticmethod
+    def _is_current(entry: Dict[str, Any]) -> bool:
+        """A season is current if flagged as such, or if today falls within its date range."""
+        if entry["is_current"]:
+            return True
+        start, end = entry["starting_at"], entry["ending_at"]
+        if not start or not end:
+            return False
+        today = datetime.utcnow().strftime("%Y-%m-%d")
+        return start <= today <= end
+
+    @staticmethod
+    async def _fetch_season_documents() -> List[Dict[str, Any]]:
+        db, leagues_db = LeaguesService.get_leagues_database()
+        leagues_db = instrument_database(leagues_db)
+        return [doc async for doc in leagues_db["league_season_lookup"].find({}, _SEASON_PROJECTION)]
+
+    @classmethod
+    async def load(cls, use_shared: bool = False) -> None:
+        """
+        Reload league seasons and swap them in.
+
+        Periodic reloads read league_season_lookup and publish the documents to the shared
+        cache; with use_shared=True (first load of a worker) a copy another worker already
+        published is used instead, so a restarted worker is warm without touching MongoDB.
+        """
+        started = time.time()
+        documents = await SEASON_LOOKUP_CACHE.get(_SEASON_LOOKUP_KEY) if use_shared else None
+        if documents is None:
+            documents = await cls._fetch_season_documents()
+            await SEASON_LOOKUP_CACHE.set(_SEASON_LOOKUP_KEY, documents)
+        cls.install(documents)
+
+        logger.info(
+            "Season index loaded",
+            extra={
+                "season_count": len(cls._seasons),
+                "league_count": len(cls._league_current),
+                "player_count": len(cls._player_latest),
+                "duration_ms": int((time.time() - started) * 1000),
+            },
+        )
+
+    @classmethod
+    def install(cls, documents: List[Dict[str, Any]]) -> None:
+        """Build the league maps from league_season_lookup documents and swap them in."""
+        seasons: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        for doc in documents:
+            if doc.get("league_id") is None or doc.get("season_id") is None:
+                continue
+            seasons[(doc["league_id"], doc["season_id"])] = cls._season_entry(doc)
+
+        league_current: Dict[int, int] = {}
+        for (league_id, season_id), entry in seasons.items():
+            if cls._is_current(entry):
+                # Prefer the explicitly flagged season over a date-range match
+                if entry["is_current"] or league_id not in league_current:
+                    league_current[league_id] = season_id
+
+        # Drop expired player entries; live ones survive the reload
+        now = time.time()
+        player_latest = {
+            player_id: value
+            for player_id, value in cls._player_latest.items()
+            if value[1] > now
+        }
+
+        cls._seasons = seasons
+        cls._league_current = league_current
+        cls._player_latest = player_latest
+        cls._loaded_at = now
+
+    @classmethod
+    def export_documents(cls) -> Optional[List[Dict[str, Any]]]:
+        """The loaded league seasons as league_season_lookup documents (None before the first load)."""
+        if cls._loaded_at is None:
+            return None
+        return [
+            {
+                "league_id": league_id,
+                "season_id": season_id,
+                "season_is_current": entry["is_current"],
+                "season_starting_at": entry["starting_at"],
+                "season_ending_at": entry["ending_at"],
+            }
+            for (league_id, season_id), entry in sorted(cls._seasons.items())
+        ]
+
+    @classmethod
+    async def ensure_loaded(cls) -> None:
+        """Load the index once if startup did not already do so."""
+        if cls._loaded_at is not None:
+            return
+        if cls._load_lock is None:
+            cls._load_lock = asyncio.Lock()
+        async with cls._load_lock:
+            if cls._loaded_at is None:
+                await cls.load(use_shared=True)
+
+    @classmethod
+    async def _refresh_loop(cls, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await cls.load()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                # Keep serving the previous index; try again on the next tick
+                logger.error(
+                    "Season index refresh failed",
+                    extra={"error": str(exc), "error_type": type(exc).__name__},
+                )
+
+    @classmethod
+    async def start(cls, interval_seconds: float = SEASON_INDEX_REFRESH_SECONDS) -> None:
+        """Load the index and schedule periodic refreshes. Call from app startup."""
+        await cls.ensure_loaded()
+        if cls._refresh_task is None or cls._refresh_task.done():
+            cls._refresh_task = asyncio.create_task(cls._refresh_loop(interval_seconds))
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Cancel the refresh task. Call from app shutdown."""
+        if cls._refresh_task is not None:
+            cls._refresh_task.cancel()
+            try:
+                await cls._refresh_task
+            except asyncio.CancelledError:
+                pass
+            cls._refresh_task = None
+
+    @classmethod
+    async def get_current_season_id(cls, league_id: int) -> Optional[int]:
+        """Return the current season for a league, or None if the league has none."""
+        await cls.ensure_loaded()
+        return cls._league_current.get(league_id)
+
+    @classmethod
+    async def is_current_season(cls, league_id: int, season_id: int) -> Optional[bool]:
+        """
+        Return whether the season is current for the league.
+
+        Returns None if the season does not exist for the league. Seasons created
+        since the last reload are looked up directly and added to the index.
+        """
+        await cls.ensure_loaded()
+        entry = cls._seasons.get((league_id, season_id))
+
+        if entry is None:
+            db, leagues_db = LeaguesService.get_leagues_database()
+            leagues_db = instrument_database(leagues_db)
+            doc = await leagues_db["league_season_lookup"].find_one(
+                {"league_id": league_id, "season_id": season_id},
+                _SEASON_PROJECTION,
+            )
+            if doc is None:
+                return None
+            entry = cls._season_entry(doc)
+            cls._seasons[(league_id, season_id)] = entry
+
+        return cls._is_current(entry)
+
+    @classmethod
+    async def get_current_season_id_for_player(cls, player_id: int) -> Optional[int]:
+        """Return the player's current/latest season, resolving it from MongoDB on a miss."""
+        cached = cls._player_latest.get(player_id)
+        if cached is not None and cached[1] > time.time():
+            return cached[0]
+
+        season_id = await PlayersService.get_current_season_id_for_player(player_id)
+        if season_id is not None:
+            cls._player_latest[player_id] = (season_id, time.time() + PLAYER_SEASON_TTL_SECONDS)
+        return season_id
@@ -0,0 +1,307 @@
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.database import get_database
+from app.core.instrumented_db import instrument_database
+from app.core.monitoring import get_logger
+from app.core.redis_pubsub import get_redis_pubsub
+from app.schemas.players_schemas import WatchlistPlayerDetail
+
+logger = get_logger(__name__)
+
+# Watchlist day served by /players/watchlist_tmp (temp_players_watchlist snapshot). Set
+# WATCHLIST_TMP_FOLLOW_TODAY=true to serve (and refresh) the current day instead
+TEMP_WATCHLIST_YEAR = 2024
+TEMP_WATCHLIST_DAY = 16
+WATCHLIST_TMP_FOLLOW_TODAY = os.getenv("WATCHLIST_TMP_FOLLOW_TODAY", "false").lower() == "true"
+# Maximum number of players per materialised watchlist
+WATCHLIST_CARDS_LIMIT = 20
+# How often the background job rebuilds the materialised cards
+WATCHLIST_CARDS_REFRESH_SECONDS = 15 * 60
+# How long a worker serves cards from memory before re-reading the ready collection
+WATCHLIST_CARDS_MEMORY_TTL_SECONDS = 60
+# Cross-worker lock held while one worker materialises a day (released when done; the
+# expiry only matters if the holder dies)
+WATCHLIST_CARDS_LOCK_SECONDS = 5 * 60
+# How long a request waits for another worker's materialisation before building inline
+WATCHLIST_CARDS_WAIT_SECONDS = 10
+WATCHLIST_CARDS_POLL_SECONDS = 0.25
+
+WATCHLIST_CARDS_COLLECTION = "players_watchlist_cards"
+
+
+class WatchlistCardsService:
+    """
+    Materialised Players to Watch cards, one document per watchlist day.
+
+    The join of temp_players_watchlist with temp_players and temp_player_statistics
+    runs in a background job and the resulting WatchlistPlayerDetail list is stored
+    in players_watchlist_cards under _id "YYYY-DDD". Requests read that single
+    document by _id (and keep it in memory for WATCHLIST_CARDS_MEMORY_TTL_SECONDS).
+
+    Every tick the job rebuilds the served day (served_day()) when its document is
+    missing, empty, older than WATCHLIST_CARDS_REFRESH_SECONDS or older than the
+    watchlist entry it was built from; a Redis lock, released after the build, lets one
+    worker do it. A request that finds the day missing shares one in-process build, or
+    waits for the worker holding the lock and builds inline if that takes too long.
+    """
+
+    _memory: Dict[str, Tuple[float, List[WatchlistPlayerDetail]]] = {}
+    _pending: Dict[str, asyncio.Future] = {}
+    _refresh_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def cards_key(year: int, day: int) -> str:
+        return f"{year}-{day:03d}"
+
+    @staticmethod
+    def served_day() -> Tuple[int, int]:
+        """(year, day) served by /players/watchlist_tmp."""
+        if WATCHLIST_TMP_FOLLOW_TODAY:
+            now = datetime.now()
+            return now.year, now.timetuple().tm_yday
+        return TEMP_WATCHLIST_YEAR, TEMP_WATCHLIST_DAY
+
+    @staticmethod
+    def build_pipeline(year: int, day: int, limit: int = WATCHLIST_CARDS_LIMIT) -> List[Dict[str, Any]]:
+        """Aggregation joining a watchlist day with player details and career statistics."""
+        return [
+            # Match the watchlist entry for the day
+            {
+                "$match": {
+                    "year": year,
+                    "day": day,
+                }
+            },
+            # Limit to 1 watchlist document (should only be one per day anyway)
+            {"$limit": 1},
+            # Unwind the player_ids array to get individual player IDs
+            {"$unwind": "$player_ids"},
+            # Limit the number of players
+            {"$limit": limit},
+            # Lookup player details
+            {
+                "$lookup": {
+                    "from": "temp_players",
+                    "localField": "player_ids",
+                    "foreignField": "player_id",
+                    "as": "player_info"
+                }
+            },
+            # Lookup player career statistics
+            {
+                "$lookup": {
+                    "from": "temp_player_statistics",
+                    "localField": "player_ids",
+                    "foreignField": "player_id",
+                    "as": "player_stats"
+                }
+            },
+            # Unwind player info and stats (should be 1 each)
+            {"$unwind": {"path": "$player_info", "preserveNullAndEmptyArrays": True}},
+            {"$unwind": {"path": "$player_stats", "preserveNullAndEmptyArrays": True}},
+            # Project the fields we need
+            {
+                "$project": {
+                    "player_id": "$player_ids",
+                    "display_name": "$player_info.display_name",
+                    "position_id": "$player_info.position_id",
+                    "nationality_id": "$player_info.nationality_id",
+                    "image_path": "$player_info.head_shot_location",
+                    "minutes_played": "$player_stats.basic.minutes_played",
+                    "appearances": "$player_stats.basic.games",
+                    "goals": "$player_stats.basic.goals",
+                    "assists": "$player_stats.basic.assists",
+                }
+            }
+        ]
+
+    @staticmethod
+    async def _acquire_lock(key: str) -> Optional[str]:
+        """Take the day's build lock. Returns its token, or None if another worker holds it."""
+        token = uuid.uuid4().hex
+        redis_client = get_redis_pubsub()
+        if redis_client is None:
+            return token
+        try:
+            acquired = await redis_client.set(
+                f"watchlist_cards:{key}", token, nx=True, ex=WATCHLIST_CARDS_LOCK_SECONDS
+            )
+            return token if acquired else None
+        except Exception:
+            return token
+
+    @staticmethod
+    async def _release_lock(key: str, token: str) -> None:
+        redis_client = get_redis_pubsub()
+        if redis_client is None:
+            return
+        try:
+            holder = await redis_client.get(f"watchlist_cards:{key}")
+            if isinstance(holder, bytes):
+                holder = holder.decode()
+            if holder == token:
+                await redis_client.delete(f"watchlist_cards:{key}")
+        except Exception:
+            pass
+
+    @classmethod
+    async def _materialize_locked(cls, year: int, day: int, token: str) -> List[WatchlistPlayerDetail]:
+        try:
+            return await cls.materialize(year, day)
+        finally:
+            await cls._release_lock(cls.cards_key(year, day), token)
+
+    @staticmethod
+    async def _read(key: str) -> Optional[List[WatchlistPlayerDetail]]:
+        db = instrument_database(get_database())
+        document = await db[WATCHLIST_CARDS_COLLECTION].find_one({"_id": key}, {"players": 1})
+        if document is None:
+            return None
+        return [WatchlistPlayerDetail(**player) for player in document.get("players", [])]
+
+    @classmethod
+    async def is_stale(cls, year: int, day: int) -> bool:
+        """True if the day's cards are missing, empty, old, or older than their watchlist entry."""
+        db = instrument_database(get_database())
+        document = await db[WATCHLIST_CARDS_COLLECTION].find_one(
+            {"_id": cls.cards_key(year, day)}, {"players": 1, "updated_at": 1, "source_updated_at": 1}
+        )
+        if document is None or not document.get("players") or document.get("updated_at") is None:
+            return True
+        if (datetime.utcnow() - document["updated_at"]).total_seconds() >= WATCHLIST_CARDS_REFRESH_SECONDS:
+            return True
+        source = await db.temp_players_watchlist.find_one({"year": year, "day": day}, {"updated_at": 1})
+        source_updated_at = (source or {}).get("updated_at")
+        built_from = document.get("source_updated_at")
+        return source_updated_at is not None and (built_from is None or source_updated_at > built_from)
+
+    @classmethod
+    async def ensure_materialized(cls, year: int, day: int) -> bool:
+        """Rebuild a day if it is stale and no other worker is on it. Returns True if built here."""
+        if not await cls.is_stale(year, day):
+            return False
+        token = await cls._acquire_lock(cls.cards_key(year, day))
+        if token is None:
+            return False
+        await cls._materialize_locked(year, day, token)
+        return True
+
+    @classmethod
+    async def materialize(cls, year: int, day: int) -> List[WatchlistPlayerDetail]:
+        """Run the watchlist join for a day and store the result in the ready collection."""
+        started = time.time()
+        db = instrument_database(get_database())
+
+        source = await db.temp_players_watchlist.find_one({"year": year, "day": day}, {"updated_at": 1})
+        players: List[WatchlistPlayerDetail] = []
+        async for document in await db.temp_players_watchlist.aggregate(cls.build_pipeline(year, day)):
+            players.append(WatchlistPlayerDetail(**document))
+
+        key = cls.cards_key(year, day)
+        await db[WATCHLIST_CARDS_COLLECTION].replace_one(
+            {"_id": key},
+            {
+                "_id": key,
+                "year": year,
+                "day": day,
+                "players": [player.model_dump() for player in players],
+                "source_updated_at": (source or {}).get("updated_at"),
+                "updated_at": datetime.utcnow(),
+            },
+            upsert=True,
+        )
+        cls._memory[key] = (time.time(), players)
+
+        logger.info(
+            "Materialised watchlist cards",
+            extra={
+                "year": year,
+                "day": day,
+                "player_count": len(players),
+                "duration_ms": int((time.time() - started) * 1000),
+            },
+        )
+        return players
+
+    @classmethod
+    async def get_cards(cls, year: int, day: int) -> List[WatchlistPlayerDetail]:
+        """Return materialised cards for a day, materialising inline only if the job has not run yet."""
+        key = cls.cards_key(year, day)
+
+        cached = cls._memory.get(key)
+        if cached is not None and time.time() - cached[0] < WATCHLIST_CARDS_MEMORY_TTL_SECONDS:
+            return cached[1]
+
+        players = await cls._read(key)
+        if players is None:
+            # One build per worker for concurrent misses, one worker across the fleet
+            pending = cls._pending.get(key)
+            if pending is None:
+                pending = asyncio.ensure_future(cls._load_missing(year, day))
+                cls._pending[key] = pending
+                pending.add_done_callback(lambda _: cls._pending.pop(key, None))
+            return await asyncio.shield(pending)
+
+        cls._memory[key] = (time.time(), players)
+        return players
+
+    @classmethod
+    async def _load_missing(cls, year: int, day: int) -> List[WatchlistPlayerDetail]:
+        key = cls.cards_key(year, day)
+        token = await cls._acquire_lock(key)
+        if token is not None:
+            logger.warning(
+                "Watchlist cards not materialised yet, building inline",
+                extra={"year": year, "day": day},
+            )
+            return await cls._materialize_locked(year, day, token)
+
+        # Another worker is materialising the day: wait for its document
+        deadline = time.monotonic() + WATCHLIST_CARDS_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(WATCHLIST_CARDS_POLL_SECONDS)
+            players = await cls._read(key)
+            if players is not None:
+                cls._memory[key] = (time.time(), players)
+                return players
+        # The holder is slow or died with the lock held: build here rather than fail
+        logger.warning(
+            "Watchlist cards still locked by another worker, building inline",
+            extra={"year": year, "day": day},
+        )
+        return await cls.materialize(year, day)
+
+    @classmethod
+    async def _refresh_loop(cls, interval_seconds: float) -> None:
+        while True:
+            try:
+                await cls.ensure_materialized(*cls.served_day())
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.error(
+                    "Watchlist cards materialisation failed",
+                    extra={"error": str(exc), "error_type": type(exc).__name__},
+                )
+            await asyncio.sleep(interval_seconds)
+
+    @classmethod
+    async def start(cls, interval_seconds: float = WATCHLIST_CARDS_REFRESH_SECONDS) -> None:
+        """Schedule the materialisation job. Call from app startup."""
+        if cls._refresh_task is None or cls._refresh_task.done():
+            cls._refresh_task = asyncio.create_task(cls._refresh_loop(interval_seconds))
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._refresh_task is not None:
+            cls._refresh_task.cancel()
+            try:
+                await cls._refresh_task
+            except asyncio.CancelledError:
+                pass
+            cls._refresh_task = None
@@ -0,0 +1,216 @@
+import asyncio
+import bisect
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.bson_codecs import string_id_database
+from app.core.database import get_database
+from app.core.instrumented_db import instrument_database
+from app.core.monitoring import get_logger
+
+logger = get_logger(__name__)
+
+# Scheduled reload interval for the watchlist index
+WATCHLIST_INDEX_REFRESH_SECONDS = 10 * 60
+# Minimum gap between on-demand checks for days newer than the index
+WATCHLIST_INDEX_MIN_RELOAD_SECONDS = 60
+
+DayKey = Tuple[int, int]
+
+
+class WatchlistIndex:
+    """
+    In-memory copy of players_watchlist_temp keyed by (year, day).
+
+    Watchlist documents are tiny (one per day with ~20 player IDs), so the whole
+    collection is held in memory. Resolving a requested date, including the
+    "pipeline is late, use the newest earlier day" fallback, is a dict or
+    bisect lookup instead of two MongoDB round trips.
+
+    Unknown days are answered from memory (newest earlier day). Only a day after the
+    newest indexed one and not in the future triggers an on-demand check, at most once
+    every WATCHLIST_INDEX_MIN_RELOAD_SECONDS, that loads just the days from the newest
+    indexed one on; requests arriving while it runs do not wait for it. Full reloads
+    happen on the background timer only.
+    """
+
+    _entries: Dict[DayKey, Dict[str, Any]] = {}
+    _days: List[DayKey] = []
+    _loaded_at: Optional[float] = None
+    _checked_at: float = 0.0
+    _load_lock: Optional[asyncio.Lock] = None
+    _refresh_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def get_collection():
+        db = get_database()
+        return instrument_database(string_id_database(db.client["fourthofficial_refactor"]))["players_watchlist_temp"]
+
+    @staticmethod
+    def _is_newer(document: Dict[str, Any], existing: Dict[str, Any]) -> bool:
+        if document.get("updated_at") is None:
+            return False
+        if existing.get("updated_at") is None:
+            return True
+        return document["updated_at"] > existing["updated_at"]
+
+    @classmethod
+    async def load(cls) -> None:
+        """Reload all watchlist entries and swap them in."""
+        started = time.time()
+        entries: Dict[DayKey, Dict[str, Any]] = {}
+
+        async for document in cls.get_collection().find({}):
+            if document.get("year") is None or document.get("day") is None:
+                continue
+            key = (document["year"], document["day"])
+            # Keep the most recently updated document if a day was written twice
+            existing = entries.get(key)
+            if existing is None or cls._is_newer(document, existing):
+                entries[key] = document
+
+        cls._entries = entries
+        cls._days = sorted(entries)
+        cls._loaded_at = cls._checked_at = time.time()
+
+        logger.debug(
+            "Watchlist index loaded",
+            extra={
+                "day_count": len(entries),
+                "latest_day": cls._days[-1] if cls._days else None,
+                "duration_ms": int((time.time() - started) * 1000),
+            },
+        )
+
+    @classmethod
+    async def load_newer(cls) -> int:
+        """Merge in the days from the newest indexed one on. Returns the number of new days."""
+        if not cls._days:
+            await cls.load()
+            return len(cls._days)
+        latest_year, latest_day = cls._days[-1]
+        entries = dict(cls._entries)
+        cursor = cls.get_collection().find(
+            {"$or": [{"year": {"$gt": latest_year}}, {"year": latest_year, "day": {"$gte": latest_day}}]}
+        )
+        async for document in cursor:
+            if document.get("year") is None or document.get("day") is None:
+                continue
+            key = (document["year"], document["day"])
+            existing = entries.get(key)
+            if existing is None or cls._is_newer(document, existing):
+                entries[key] = document
+
+        added = len(entries) - len(cls._entries)
+        cls._entries = entries
+        cls._days = sorted(entries)
+        cls._checked_at = time.time()
+        return added
+
+    @classmethod
+    def _lock(cls) -> asyncio.Lock:
+        if cls._load_lock is None:
+            cls._load_lock = asyncio.Lock()
+        return cls._load_lock
+
+    @classmethod
+    async def _reload_if_stale(cls, force_min_age: Optional[float]) -> None:
+        async with cls._lock():
+            if cls._loaded_at is None:
+                await cls.load()
+            elif force_min_age is not None and time.time() - cls._loaded_at >= force_min_age:
+                await cls.load()
+
+    @classmethod
+    async def ensure_fresh(cls, year: int, day: int) -> None:
+        """Load the index if needed, and check (throttled) for a day newer than the index."""
+        if cls._loaded_at is None:
+            await cls._reload_if_stale(None)
+        if (year, day) in cls._entries:
+            return
+        now = datetime.now()
+        if (year, day) > (now.year, now.timetuple().tm_yday):
+            return
+        if cls._days and (year, day) < cls._days[-1]:
+            return
+        if time.time() - cls._checked_at < WATCHLIST_INDEX_MIN_RELOAD_SECONDS or cls._lock().locked():
+            return
+        async with cls._lock():
+            if time.time() - cls._checked_at >= WATCHLIST_INDEX_MIN_RELOAD_SECONDS:
+                await cls.load_newer()
+
+    @staticmethod
+    def _matches(entry: Dict[str, Any], player_id: Optional[int]) -> bool:
+        return player_id is None or player_id in entry.get("player_ids", [])
+
+    @classmethod
+    async def get_entry(cls, year: int, day: int, player_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Return the entry for exactly (year, day), optionally requiring a player."""
+        await cls.ensure_fresh(year, day)
+        entry = cls._entries.get((year, day))
+        if entry is None or not cls._matches(entry, player_id):
+            return None
+        return entry
+
+    @classmethod
+    async def get_entries_before(
+        cls,
+        year: int,
+        day: int,
+        player_id: Optional[int] = None,
+        limit: int = 1,
+    ) -> List[Dict[str, Any]]:
+        """Return up to `limit` entries strictly before (year, day), newest first."""
+        await cls.ensure_fresh(year, day)
+        days = cls._days
+        position = bisect.bisect_left(days, (year, day))
+
+        results: List[Dict[str, Any]] = []
+        for key in reversed(days[:position]):
+            entry = cls._entries[key]
+            if cls._matches(entry, player_id):
+                results.append(entry)
+                if len(results) >= limit:
+                    break
+        return results
+
+    @classmethod
+    async def get_latest_on_or_before(cls, year: int, day: int) -> Optional[Dict[str, Any]]:
+        """Return the entry for (year, day), or the newest earlier entry."""
+        entry = await cls.get_entry(year, day)
+        if entry is not None:
+            return entry
+        earlier = await cls.get_entries_before(year, day, limit=1)
+        return earlier[0] if earlier else None
+
+    @classmethod
+    async def _refresh_loop(cls, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await cls.load()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.error(
+                    "Watchlist index refresh failed",
+                    extra={"error": str(exc), "error_type": type(exc).__name__},
+                )
+
+    @classmethod
+    async def start(cls, interval_seconds: float = WATCHLIST_INDEX_REFRESH_SECONDS) -> None:
+        """Load the index and schedule periodic reloads. Call from app startup."""
+        await cls._reload_if_stale(None)
+        if cls._refresh_task is None or cls._refresh_task.done():
+            cls._refresh_task = asyncio.create_task(cls._refresh_loop(interval_seconds))
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._refresh_task is not None:
+            cls._refresh_task.cancel()
+            try:
+                await cls._refresh_task
+            except asyncio.CancelledError:
+                pass
+            cls._refresh_task = None
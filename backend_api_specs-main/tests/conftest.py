@@ -0,0 +1,93 @@
+import pytest
+
+from app.core import invalidation, refreshing_cache, two_tier_cache
+from app.core.invalidation import InvalidationBus
+
+
+class FakePipeline:
+    """Queues commands and runs them against the FakeRedis on execute()."""
+
+    def __init__(self, client):
+        self._client = client
+        self._commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        commands, self._commands = self._commands, []
+        return [await getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+
+class FakeRedis:
+    """The subset of redis.asyncio used by the cache layers, kept in dicts (TTLs are ignored)."""
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+        self.published = []
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    async def set(self, key, value, ex=None, nx=False, xx=False, keepttl=False):
+        if (nx and key in self.values) or (xx and key not in self.values):
+            return None
+        self.values[key] = value
+        return True
+
+    async def delete(self, *keys):
+        return sum((self.values.pop(key, None) is not None) + (self.sets.pop(key, None) is not None) for key in keys)
+
+    async def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+        return len(members)
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, ()))
+
+    async def expire(self, key, seconds):
+        return key in self.values or key in self.sets
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 1
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+@pytest.fixture(autouse=True)
+def invalidation_bus(monkeypatch):
+    """A bus with no handlers from other tests (every tagged cache subscribes one)."""
+    monkeypatch.setattr(InvalidationBus, "_handlers", [])
+    monkeypatch.setattr(InvalidationBus, "_pending", set())
+    monkeypatch.setattr(InvalidationBus, "_flush_task", None)
+    return InvalidationBus
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    client = FakeRedis()
+    for module in (invalidation, refreshing_cache, two_tier_cache):
+        monkeypatch.setattr(module, "get_redis_pubsub", lambda: client)
+    return client
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    for module in (invalidation, refreshing_cache, two_tier_cache):
+        monkeypatch.setattr(module, "get_redis_pubsub", lambda: None)
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from app.core.dataloader import DataLoader, get_loader, loader_scope
+
+
+class _Batch:
+    """Batch function recording its calls; odd keys are found."""
+
+    def __init__(self, fail_first=False):
+        self.calls = []
+        self.fail_first = fail_first
+
+    async def __call__(self, keys):
+        self.calls.append(list(keys))
+        if self.fail_first and len(self.calls) == 1:
+            raise RuntimeError("database unavailable")
+        return {key: {"id": key} for key in keys if key % 2}
+
+
+def test_loads_in_one_tick_share_a_deduplicated_batch():
+    batch = _Batch()
+
+    async def scenario():
+        loader = DataLoader(batch)
+        return await asyncio.gather(loader.load(1), loader.load(2), loader.load(1), loader.load(3))
+
+    assert asyncio.run(scenario()) == [{"id": 1}, None, {"id": 1}, {"id": 3}]
+    assert batch.calls == [[1, 2, 3]]
+
+
+def test_results_are_memoised_across_ticks():
+    batch = _Batch()
+
+    async def scenario():
+        loader = DataLoader(batch)
+        await loader.load(1)
+        await loader.load(3)
+        return await loader.load_many([1, 3, 5])
+
+    assert asyncio.run(scenario()) == {1: {"id": 1}, 3: {"id": 3}, 5: {"id": 5}}
+    assert batch.calls == [[1], [3], [5]]
+
+
+def test_batches_are_split_at_max_batch_size():
+    batch = _Batch()
+
+    async def scenario():
+        loader = DataLoader(batch, max_batch_size=2)
+        return await loader.load_many(range(5))
+
+    assert asyncio.run(scenario()) == {1: {"id": 1}, 3: {"id": 3}}
+    assert batch.calls == [[0, 1], [2, 3], [4]]
+
+
+def test_failed_batches_are_not_memoised():
+    batch = _Batch(fail_first=True)
+
+    async def scenario():
+        loader = DataLoader(batch)
+        with pytest.raises(RuntimeError):
+            await loader.load(1)
+        return await loader.load(1)
+
+    assert asyncio.run(scenario()) == {"id": 1}
+    assert batch.calls == [[1], [1]]
+
+
+def test_primed_values_are_not_fetched():
+    batch = _Batch()
+
+    async def scenario():
+        loader = DataLoader(batch)
+        loader.prime(1, {"id": 1, "primed": True})
+        return await loader.load_many([1, 3])
+
+    assert asyncio.run(scenario()) == {1: {"id": 1, "primed": True}, 3: {"id": 3}}
+    assert batch.calls == [[3]]
+
+
+def test_scope_shares_loaders_with_nested_scopes_and_tasks():
+    batch = _Batch()
+
+    async def nested():
+        with loader_scope():
+            return await get_loader("fixtures", batch).load(1)
+
+    async def scenario():
+        with loader_scope():
+            loader = get_loader("fixtures", batch)
+            assert get_loader("fixtures", batch) is loader
+            values = await asyncio.gather(nested(), asyncio.ensure_future(nested()), loader.load(1))
+        assert get_loader("fixtures", batch) is not loader
+        return values
+
+    assert asyncio.run(scenario()) == [{"id": 1}] * 3
+    assert batch.calls == [[1]]
@@ -0,0 +1,78 @@
+import asyncio
+import json
+
+from app.core import invalidation
+from app.core.invalidation import INVALIDATION_CHANNEL, InvalidationBus
+
+
+class _Handler:
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, tags, local_only):
+        self.calls.append((set(tags), local_only))
+
+
+def test_publishes_within_the_window_are_batched(redis, invalidation_bus):
+    handler = _Handler()
+    invalidation_bus.subscribe(handler)
+
+    async def scenario():
+        InvalidationBus.publish(["fixture:1"])
+        InvalidationBus.publish(["fixture:1", "fixture:2", "team:3", "fixture:"])
+        assert handler.calls == []
+        await InvalidationBus._flush_task
+
+    asyncio.run(scenario())
+    assert handler.calls == [({"fixture:1", "fixture:2"}, False)]
+    assert len(redis.published) == 1
+    channel, message = redis.published[0]
+    assert channel == INVALIDATION_CHANNEL
+    assert json.loads(message) == {"origin": InvalidationBus._origin, "tags": ["fixture:1", "fixture:2"]}
+
+
+def test_own_messages_are_ignored(redis, invalidation_bus):
+    handler = _Handler()
+    invalidation_bus.subscribe(handler)
+
+    async def scenario():
+        await InvalidationBus._handle_message(json.dumps({"origin": InvalidationBus._origin, "tags": ["fixture:1"]}))
+        await InvalidationBus._handle_message(json.dumps({"origin": "other", "tags": ["combo:4", "bogus", 7]}))
+        await InvalidationBus._handle_message("not json")
+        await InvalidationBus._handle_message(json.dumps({"origin": "other", "tags": ["bogus"]}))
+
+    asyncio.run(scenario())
+    assert handler.calls == [({"combo:4"}, True)]
+
+
+def test_failing_handler_does_not_stop_the_others(no_redis, invalidation_bus):
+    handler = _Handler()
+
+    async def failing(tags, local_only):
+        raise RuntimeError("boom")
+
+    invalidation_bus.subscribe(failing)
+    invalidation_bus.subscribe(handler)
+
+    async def scenario():
+        InvalidationBus.publish(["player:9"])
+        return await InvalidationBus.flush()
+
+    assert asyncio.run(scenario()) == {"player:9"}
+    assert handler.calls == [({"player:9"}, False)]
+
+
+def test_flush_batches_with_a_short_window(redis, invalidation_bus, monkeypatch):
+    monkeypatch.setattr(invalidation, "INVALIDATION_BATCH_SECONDS", 0)
+    handler = _Handler()
+    invalidation_bus.subscribe(handler)
+
+    async def scenario():
+        InvalidationBus.publish(["league:8:season:23614"])
+        await InvalidationBus._flush_task
+        InvalidationBus.publish(["fixture:1"])
+        await InvalidationBus._flush_task
+
+    asyncio.run(scenario())
+    assert handler.calls == [({"league:8:season:23614"}, False), ({"fixture:1"}, False)]
+    assert len(redis.published) == 2
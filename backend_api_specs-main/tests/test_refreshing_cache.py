@@ -0,0 +1,125 @@
+import asyncio
+
+from app.core import refreshing_cache
+from app.core.refreshing_cache import RefreshingCache
+
+
+class _Loader:
+    """Returns 1, 2, 3... on successive calls, taking delay seconds each."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.calls
+
+
+async def _refreshes_done(cache):
+    await asyncio.gather(*list(cache._refreshes.values()))
+
+
+def test_fresh_entry_is_served_without_refresh(redis):
+    loader = _Loader()
+
+    async def scenario():
+        cache = RefreshingCache("test_fresh", ttl_seconds=60, stale_seconds=60, beta=0)
+        values = [await cache.get("key", loader) for _ in range(3)]
+        await _refreshes_done(cache)
+        return values
+
+    assert asyncio.run(scenario()) == [1, 1, 1]
+    assert loader.calls == 1
+
+
+def test_early_refresh_serves_current_value(redis, monkeypatch):
+    # U close to 0 makes -ln(U) large: the entry is refreshed long before expiry
+    monkeypatch.setattr(refreshing_cache.random, "random", lambda: 1.0 - 1e-12)
+    loader = _Loader(delay=0.01)
+
+    async def scenario():
+        cache = RefreshingCache("test_early", ttl_seconds=60, stale_seconds=60, beta=1000)
+        first = await cache.get("key", loader)
+        served = await cache.get("key", loader)
+        await _refreshes_done(cache)
+        return first, served, await cache.get("key", loader)
+
+    first, served, refreshed = asyncio.run(scenario())
+    assert (first, served) == (1, 1)
+    assert refreshed == 2
+
+
+def test_stale_entry_is_served_while_one_refresh_runs(redis):
+    loader = _Loader(delay=0.01)
+
+    async def scenario():
+        cache = RefreshingCache("test_stale", ttl_seconds=0.05, stale_seconds=60, beta=0)
+        await cache.get("key", loader)
+        await asyncio.sleep(0.1)
+        served = await asyncio.gather(*(cache.get("key", loader) for _ in range(5)))
+        await _refreshes_done(cache)
+        assert not any(key.endswith(":refresh") for key in redis.values)
+        return served, await cache.get("key", loader)
+
+    served, refreshed = asyncio.run(scenario())
+    assert served == [1] * 5
+    assert refreshed == 2
+    assert loader.calls == 2
+
+
+def test_expired_entry_past_stale_window_loads_inline(redis):
+    loader = _Loader()
+
+    async def scenario():
+        cache = RefreshingCache("test_expired", ttl_seconds=0.02, stale_seconds=0.02, beta=0)
+        await cache.get("key", loader)
+        await asyncio.sleep(0.1)
+        return await cache.get("key", loader)
+
+    assert asyncio.run(scenario()) == 2
+
+
+def test_concurrent_misses_share_one_load(redis):
+    loader = _Loader(delay=0.01)
+
+    async def scenario():
+        cache = RefreshingCache("test_misses", ttl_seconds=60, stale_seconds=60, beta=0)
+        return await asyncio.gather(*(cache.get("key", loader) for _ in range(10)))
+
+    assert asyncio.run(scenario()) == [1] * 10
+    assert loader.calls == 1
+
+
+def test_refresh_is_skipped_while_another_worker_holds_the_lock(redis):
+    loader = _Loader()
+
+    async def scenario():
+        cache = RefreshingCache("test_locked", ttl_seconds=0.05, stale_seconds=60, beta=0)
+        await cache.get("key", loader)
+        redis.values[f"{cache._store.redis_key('key')}:refresh"] = "other-worker"
+        await asyncio.sleep(0.1)
+        served = await cache.get("key", loader)
+        await _refreshes_done(cache)
+        return served
+
+    assert asyncio.run(scenario()) == 1
+    assert loader.calls == 1
+
+
+def test_tag_invalidation_serves_stale_and_refreshes(redis):
+    loader = _Loader()
+
+    async def scenario():
+        cache = RefreshingCache(
+            "test_tagged", ttl_seconds=60, stale_seconds=60, beta=0, tags=lambda key, value: ("fixture:1",)
+        )
+        await cache.get("key", loader)
+        await cache._store.invalidate_tags({"fixture:1"})
+        served = await cache.get("key", loader)
+        await _refreshes_done(cache)
+        return served, await cache.get("key", loader)
+
+    assert asyncio.run(scenario()) == (1, 2)
+    assert loader.calls == 2
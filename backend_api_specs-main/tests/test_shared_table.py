@@ -0,0 +1,127 @@
+import os
+import subprocess
+import sys
+import uuid
+
+import pytest
+
+from app.core.shared_table import SharedTableStore, _write_attached, pack_tables, unpack_tables
+
+TEAMS = (
+    ("name", "short_code"),
+    ("country_id",),
+    {
+        53: {"name": "Celtic", "short_code": "CEL", "country_id": 1161},
+        62: {"name": "Rangers", "short_code": None, "country_id": 1161},
+        7: {"name": "Atlético Madrid", "short_code": "ATM", "country_id": None},
+    },
+)
+POSITIONS = (("name",), (), {24: {"name": "Goalkeeper"}})
+
+
+@pytest.fixture
+def namespace():
+    return f"fo_test_{uuid.uuid4().hex[:8]}"
+
+
+def _segments(prefix):
+    try:
+        return sorted(name for name in os.listdir("/dev/shm") if name.startswith(prefix))
+    except OSError:
+        return []
+
+
+def test_pack_unpack_round_trip():
+    tables = unpack_tables(memoryview(pack_tables({"teams": TEAMS, "positions": POSITIONS})))
+
+    teams = tables["teams"]
+    assert len(teams) == 3
+    assert teams.str_columns == ("name", "short_code")
+    assert teams.int_columns == ("country_id",)
+    assert teams.get(7) == {"name": "Atlético Madrid", "short_code": "ATM", "country_id": None}
+    assert teams.get("62") == {"name": "Rangers", "short_code": None, "country_id": 1161}
+    assert teams.get(99) is None
+    assert 53 in teams and "x" not in teams
+    assert teams.get_many([53, 99, 53]) == {53: {"name": "Celtic", "short_code": "CEL", "country_id": 1161}}
+    assert tables["positions"].get(24) == {"name": "Goalkeeper"}
+
+
+def test_empty_table_round_trip():
+    tables = unpack_tables(memoryview(pack_tables({"countries": (("name",), (), {})})))
+    assert len(tables["countries"]) == 0
+    assert tables["countries"].get(1) is None
+
+
+def test_unpack_rejects_foreign_buffer():
+    with pytest.raises(ValueError):
+        unpack_tables(memoryview(bytes(64)))
+
+
+def test_readers_swap_to_new_generation(namespace):
+    publisher = SharedTableStore(namespace, 1)
+    reader = SharedTableStore(namespace, 1)
+    try:
+        assert publisher.publish({"teams": TEAMS}) == 1
+        assert reader.tables()["teams"].get(53)["name"] == "Celtic"
+        assert reader.generation == 1
+
+        renamed = (TEAMS[0], TEAMS[1], {53: {"name": "Celtic FC", "short_code": "CEL", "country_id": 1161}})
+        assert publisher.publish({"teams": renamed}) == 2
+        assert reader.tables()["teams"].get(53)["name"] == "Celtic FC"
+        assert reader.tables()["teams"].get(62) is None
+        assert reader.generation == 2
+    finally:
+        reader.close()
+        publisher.close()
+
+
+def test_last_close_unlinks_segments(namespace):
+    store = SharedTableStore(namespace, 1)
+    store.publish({"teams": TEAMS})
+    store.publish({"teams": TEAMS})
+    store.close()
+
+    assert _segments(namespace) == []
+    # A restarted server with the same instance starts empty instead of reattaching
+    restarted = SharedTableStore(namespace, 1)
+    try:
+        assert restarted.tables() == {}
+    finally:
+        restarted.close()
+
+
+def _abandon(namespace, instance):
+    """Publish from a store and leave its segments behind as if its process had been killed."""
+    exited_pid = subprocess.run([sys.executable, "-c", "print(__import__('os').getpid())"], capture_output=True).stdout
+    store = SharedTableStore(namespace, instance)
+    store.publish({"teams": TEAMS})
+    _write_attached(store._control.buf, [int(exited_pid)])
+    store._install(0, None, {})
+    store._install(0, None, {})
+    store._control.close()
+    store._control = None
+
+
+def test_predecessor_tables_are_dropped(namespace):
+    _abandon(namespace, 1)
+
+    restarted = SharedTableStore(namespace, 1)
+    try:
+        assert restarted.tables() == {}
+        assert restarted.publish({"teams": TEAMS}) == 2
+    finally:
+        restarted.close()
+
+
+def test_sweep_unlinks_exited_instance(namespace):
+    if not os.path.isdir("/dev/shm"):
+        pytest.skip("segments are not listed on this platform")
+    _abandon(namespace, 1)
+    assert _segments(f"{namespace}_1")
+
+    current = SharedTableStore(namespace, 2)
+    try:
+        current.published_generation()
+        assert _segments(f"{namespace}_1") == []
+    finally:
+        current.close()
@@ -0,0 +1,113 @@
+import asyncio
+
+from app.core.two_tier_cache import TwoTierCache
+
+
+def _cache(**kwargs):
+    return TwoTierCache("test", l1_max_entries=100, l1_ttl_seconds=60, l2_ttl_seconds=60, **kwargs)
+
+
+def _fixture_tags(key, _value):
+    return (f"fixture:{key}",)
+
+
+def test_l2_hits_are_promoted_to_l1(redis):
+    async def scenario():
+        cache = _cache()
+        await cache.set(1, {"name": "Celtic"})
+        assert cache.decode(redis.values[cache.redis_key(1)]) == {"name": "Celtic"}
+
+        cache.clear_local()
+        assert await cache.get(1) == {"name": "Celtic"}
+        assert await cache.get(1) == {"name": "Celtic"}
+        assert await cache.get(2) is None
+        return cache.stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats["l1_count"], stats["l2_count"], stats["miss_count"]) == (1, 1, 1)
+
+
+def test_loader_is_called_once_for_keys_in_neither_tier(redis):
+    calls = []
+
+    async def loader(keys):
+        calls.append(keys)
+        return {key: {"id": key} for key in keys if key != 3}
+
+    async def scenario():
+        cache = _cache()
+        await cache.set(2, {"id": 2})
+        first = await cache.get_or_load_many([1, 2, 3, 1], loader)
+        second = await cache.get_or_load_many([1, 3], loader)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == {1: {"id": 1}, 2: {"id": 2}}
+    assert second == {1: {"id": 1}}
+    # Absent keys are not cached: 3 is asked for again
+    assert calls == [[1, 3], [3]]
+
+
+def test_older_version_does_not_replace_newer(redis):
+    async def scenario():
+        cache = _cache(version=lambda document: document["updated_at"])
+        await cache.set(1, {"updated_at": 2, "score": "1-0"})
+        await cache.set(1, {"updated_at": 1, "score": "0-0"})
+        await cache.set(2, {"updated_at": 1, "score": "0-0"})
+        await cache.set(2, {"updated_at": 3, "score": "2-0"})
+        return await cache.get(1), await cache.get(2)
+
+    one, two = asyncio.run(scenario())
+    assert one["score"] == "1-0"
+    assert two["score"] == "2-0"
+
+
+def test_tag_invalidation_drops_l1_and_l2(redis):
+    async def scenario():
+        cache = _cache(tags=_fixture_tags)
+        await cache.set_many({1: {"id": 1}, 2: {"id": 2}})
+        await cache.invalidate_tags({"fixture:1"})
+        assert cache.redis_key(1) not in redis.values
+        assert cache.tag_key("fixture:1") not in redis.sets
+        assert cache.redis_key(2) in redis.values
+        return await cache.get(1), await cache.get(2)
+
+    assert asyncio.run(scenario()) == (None, {"id": 2})
+
+
+def test_local_only_invalidation_keeps_l2(redis):
+    async def scenario():
+        cache = _cache(tags=_fixture_tags)
+        await cache.set(1, {"id": 1})
+        await cache.invalidate_tags({"fixture:1"}, local_only=True)
+        assert cache.stats()["l1_entries"] == 0
+        return await cache.get(1), cache.stats()
+
+    value, stats = asyncio.run(scenario())
+    assert value == {"id": 1}
+    assert stats["l2_count"] == 1
+
+
+def test_tag_invalidation_rewrites_entries_with_expire(redis):
+    async def scenario():
+        cache = _cache(tags=_fixture_tags, expire=lambda value: {**value, "expired": True})
+        await cache.set(1, {"id": 1})
+        await cache.invalidate_tags({"fixture:1"})
+        local = await cache.get(1)
+        cache.clear_local()
+        shared = await cache.get(1)
+        assert cache.tag_key("fixture:1") in redis.sets
+        return local, shared
+
+    assert asyncio.run(scenario()) == ({"id": 1, "expired": True}, {"id": 1, "expired": True})
+
+
+def test_l1_only_without_redis(no_redis):
+    async def scenario():
+        cache = _cache()
+        await cache.set(1, {"id": 1})
+        found = await cache.get(1)
+        cache.clear_local()
+        return found, await cache.get(1)
+
+    assert asyncio.run(scenario()) == ({"id": 1}, None)